@@ -0,0 +1,787 @@
+# Project: dental_watcher_v3.17.0.py  - Benchmarks
+# Author: zer0ltrnce (@zer0ltrnce, zerotlrnce@gmail.com)
+# GitHub: https://github.com/zer0ltrnce
+# Original Author: David Kamarauli (smiledesigner.us)
+# Version: 3.17.0+
+#
+# Reproducible scan/parse benchmarks on a synthetic Exocad-style CAD-DATA tree.
+#   python bench.py generate DIR [--projects 500 ...]   create a tree to keep around
+#   python bench.py run [--tree DIR] [--output r.json]  run the suite (temp tree if --tree is not given)
+#   python bench.py compare OLD.json NEW.json           ratios between two result files
+#   python bench.py run --latency-ms 20 --jitter-ms 5   same, on a simulated network share (LatencyShim)
+#   python bench.py memory [--projects 10000]           memory held by a scan result (slotted records vs dicts)
+#   python bench.py parity [--tree DIR]                 all .dentalProject parsers return the same dicts (exit 1 if not)
+# Only needs core.py (no PyQt6).
+
+import argparse
+import builtins
+import contextlib
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+with contextlib.redirect_stdout(sys.stderr): # core prints optional-dependency warnings on import
+    import core
+
+TOOTH_TYPES = ["anatomic_crown", "reduced_crown", "inlay", "veneer", "bridge_pontic", "abutment", "antagonist"]
+UPPER_TEETH = list(range(11, 19)) + list(range(21, 29))
+LOWER_TEETH = list(range(31, 39)) + list(range(41, 49))
+
+
+# synthetic tree generator
+def _project_xml(case_name, rng, teeth_count, xml_kb):
+    """A .dentalProject document in the layout parse_dental_project reads, padded to about xml_kb."""
+    teeth = rng.sample(UPPER_TEETH if rng.random() < 0.5 else LOWER_TEETH, min(teeth_count, 16))
+    tooth_xml = "".join(
+        f"<Tooth><Number>{number}</Number><ReconstructionType>{rng.choice(TOOTH_TYPES)}</ReconstructionType>"
+        f"<MaterialName>Zirconia</MaterialName><Parameters><Cement>0.03</Cement></Parameters></Tooth>"
+        for number in teeth)
+    filler_line = '<Setting Name="Param{0}" Value="{1:.6f}" Unit="mm"/>'
+    filler_count = max(0, int(xml_kb * 1024 / 50)) # ~50 bytes per setting
+    before = "".join(filler_line.format(i, rng.random()) for i in range(filler_count // 2))
+    after = "".join(filler_line.format(i, rng.random()) for i in range(filler_count // 2, filler_count))
+    return (f'<?xml version="1.0" encoding="utf-8"?>\n<DentalProject Version="3.1">'
+            f"<CadSettings>{before}</CadSettings>"
+            f"<Patient><PatientName>{case_name}, Patient</PatientName><PatientFirstName>{rng.randint(1000, 9999)}</PatientFirstName></Patient>"
+            f"<Practice><PracticeName>Practice {rng.randint(1, 40)}</PracticeName></Practice>"
+            f"<Teeth>{tooth_xml}</Teeth><History>{after}</History></DentalProject>")
+
+def _write_file(path, data, mtime):
+    with open(path, "w" if isinstance(data, str) else "wb") as f:
+        f.write(data)
+    os.utime(path, (mtime, mtime))
+
+def _write_project(folder, case_name, rng, mtime, teeth_count, xml_kb, stl_count, stl_kb, stats):
+    """One case folder: project, constructionInfo, CAD/model/other STLs and a Scans subfolder."""
+    os.makedirs(os.path.join(folder, "Scans"), exist_ok=True)
+    stl_data = b"\0" * int(stl_kb * 1024)
+    files = {f"{case_name}.dentalProject": _project_xml(case_name, rng, teeth_count, xml_kb),
+             f"{case_name}.constructionInfo": "<ConstructionInfo/>",
+             "model.stl": stl_data, "upper_model.stl": stl_data, "margin.stl": stl_data,
+             f"{case_name}.log": "log"}
+    for i in range(stl_count):
+        files[f"{case_name}_{i + 1}_cad.stl"] = stl_data
+    for name, data in files.items():
+        _write_file(os.path.join(folder, name), data, mtime)
+    _write_file(os.path.join(folder, "Scans", "raw_scan.stl"), stl_data, mtime)
+    stats["files"] += len(files) + 1
+    stats["bytes"] += sum(len(d) for d in files.values()) + len(stl_data)
+    stats["dirs"] += 2
+    os.utime(os.path.join(folder, "Scans"), (mtime, mtime))
+    os.utime(folder, (mtime, mtime)) # folder mtime = time its last file was created
+
+def generate_tree(root, projects=500, depth=1, teeth_per_project=4, xml_kb=8, stl_per_project=2, stl_kb=1,
+                  archive_days=20, today_fraction=0.2, seed=1, now=None):
+    """
+    Builds a CAD-DATA style tree under root and returns a summary dict.
+    depth = grouping folder levels above the case folders (0 = cases directly in root);
+    today_fraction of the projects get mtimes from today, the rest 2-60 days ago.
+    archive_days YYYY/MM/DD folders (one project each) are added; the scanner skips them.
+    """
+    rng = random.Random(seed)
+    now = time.time() if now is None else now
+    midnight = datetime.datetime.combine(datetime.date.fromtimestamp(now), datetime.time()).timestamp()
+    stats = {"projects": projects, "today_projects": 0, "archive_projects": archive_days,
+             "files": 0, "dirs": 0, "bytes": 0}
+    os.makedirs(root, exist_ok=True)
+
+    for i in range(projects):
+        group = [f"Group{(i // (8 ** (level + 1))) % 8:02d}" for level in range(depth)] # 8 cases per group level
+        case_name = f"{datetime.date.fromtimestamp(now).isoformat()}_{i:05d}-001"
+        if rng.random() < today_fraction:
+            mtime = rng.uniform(midnight, now)
+            stats["today_projects"] += 1
+        else:
+            mtime = now - rng.uniform(2, 60) * 86400
+        _write_project(os.path.join(root, *group, case_name), case_name, rng, mtime,
+                       teeth_per_project, xml_kb, stl_per_project, stl_kb, stats)
+
+    for day in range(archive_days):
+        day_date = datetime.date.fromtimestamp(now) - datetime.timedelta(days=day + 1)
+        archive_folder = os.path.join(root, f"{day_date:%Y}", f"{day_date:%m}", f"{day_date:%d}", f"archived_{day:03d}")
+        _write_project(archive_folder, f"archived_{day:03d}", rng, now, # today's mtime: must still be skipped
+                       teeth_per_project, xml_kb, stl_per_project, stl_kb, stats)
+    return stats
+
+
+# latency-injecting filesystem shim (simulated network share)
+class _ScandirProxy(object):
+    """os.scandir iterator that charges one round trip per entries_per_round_trip entries (SMB directory pages)."""
+    def __init__(self, iterator, shim):
+        self._iterator = iterator
+        self._shim = shim
+        self._count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        entry = next(self._iterator)
+        self._count += 1
+        if self._count % self._shim.entries_per_round_trip == 0:
+            self._shim.delay("scandir_page")
+        return _EntryProxy(entry, self._shim)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._iterator.close()
+
+class _EntryProxy(object):
+    """DirEntry wrapper; stat() costs a round trip unless the listing already carries it (Windows clients)."""
+    __slots__ = ("_entry", "_shim", "name", "path")
+
+    def __init__(self, entry, shim):
+        self._entry = entry
+        self._shim = shim
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_dir(self, *, follow_symlinks=True): return self._entry.is_dir(follow_symlinks=follow_symlinks)
+    def is_file(self, *, follow_symlinks=True): return self._entry.is_file(follow_symlinks=follow_symlinks)
+    def is_symlink(self): return self._entry.is_symlink()
+    def inode(self): return self._entry.inode()
+    def __fspath__(self): return self._entry.path
+
+    def stat(self, *, follow_symlinks=True):
+        if self._shim.entry_stat_round_trip: self._shim.delay("entry_stat")
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+class _WriteProxy(object):
+    """File opened for writing under the shim: charges bandwidth for the bytes written."""
+    def __init__(self, file, shim):
+        self._file = file
+        self._shim = shim
+
+    def write(self, data):
+        self._shim.transfer(len(data))
+        return self._file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._file.__exit__(*exc_info)
+
+class LatencyShim(object):
+    """
+    Context manager that makes the local disk behave like a network share: the os/shutil
+    calls used by the scanner, the project parser, copying and archiving sleep for
+    latency_ms +- jitter_ms per round trip, and copy2 additionally for size / bandwidth_mb_s
+    (chunked copies through open(): for the bytes written).
+    time.sleep releases the GIL, so parallel listings overlap like real network I/O.
+    Calls made inside a patched call (the stat inside shutil.copy2, ...) are not charged
+    again. stats counts round trips per operation plus the total injected time.
+    """
+    PATCHED_CALLS = [(os, "scandir"), (os, "listdir"), (os, "stat"), (os, "makedirs"),
+                     (os.path, "exists"), (os.path, "isfile"), (os.path, "isdir"), (os.path, "getmtime"),
+                     (shutil, "copy2"), (shutil, "move"), (os, "replace"), (builtins, "open")]
+
+    def __init__(self, latency_ms=20.0, jitter_ms=5.0, bandwidth_mb_s=0.0, entries_per_round_trip=100,
+                 entry_stat_round_trip=False, seed=1):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.bandwidth_mb_s = bandwidth_mb_s # 0 = unlimited
+        self.entries_per_round_trip = max(1, entries_per_round_trip)
+        self.entry_stat_round_trip = entry_stat_round_trip # False: listing carries stat data (Windows SMB client)
+        self.stats = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._originals = []
+
+    def profile(self):
+        return {"latency_ms": self.latency_ms, "jitter_ms": self.jitter_ms, "bandwidth_mb_s": self.bandwidth_mb_s,
+                "entries_per_round_trip": self.entries_per_round_trip,
+                "entry_stat_round_trip": self.entry_stat_round_trip}
+
+    def delay(self, operation, extra_secs=0.0):
+        with self._lock:
+            secs = self._rng.uniform(max(0.0, self.latency_ms - self.jitter_ms), self.latency_ms + self.jitter_ms) / 1000.0
+            secs += extra_secs
+            self.stats[operation] = self.stats.get(operation, 0) + 1
+            self.stats["injected_s"] = self.stats.get("injected_s", 0.0) + secs
+        time.sleep(secs)
+
+    def transfer(self, byte_count):
+        """Sleeps for the time byte_count bytes take at bandwidth_mb_s (no round trip)."""
+        if self.bandwidth_mb_s:
+            secs = byte_count / (self.bandwidth_mb_s * 1024 * 1024)
+            with self._lock:
+                self.stats["injected_s"] = self.stats.get("injected_s", 0.0) + secs
+            time.sleep(secs)
+
+    def _wrap(self, name, func):
+        shim = self
+        def _shimmed(*args, **kwargs):
+            if getattr(shim._local, "depth", 0):
+                return func(*args, **kwargs)
+            shim._local.depth = 1
+            try:
+                extra_secs = 0.0
+                if name == "copy2" and shim.bandwidth_mb_s:
+                    extra_secs = os.path.getsize(args[0]) / (shim.bandwidth_mb_s * 1024 * 1024)
+                shim.delay(name, extra_secs)
+                result = func(*args, **kwargs)
+                if name == "scandir":
+                    return _ScandirProxy(result, shim)
+                mode = args[1] if len(args) > 1 else kwargs.get("mode", "r")
+                if name == "open" and shim.bandwidth_mb_s and any(flag in mode for flag in "wax"):
+                    return _WriteProxy(result, shim)
+                return result
+            finally:
+                shim._local.depth = 0
+        return _shimmed
+
+    @contextlib.contextmanager
+    def suspended(self):
+        """Runs benchmark setup/cleanup at local disk speed (current thread only)."""
+        previous = getattr(self._local, "depth", 0)
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = previous
+
+    def __enter__(self):
+        for module, name in self.PATCHED_CALLS:
+            original = getattr(module, name)
+            self._originals.append((module, name, original))
+            setattr(module, name, self._wrap(name, original))
+        return self
+
+    def __exit__(self, *exc_info):
+        while self._originals:
+            module, name, original = self._originals.pop()
+            setattr(module, name, original)
+
+
+# timing harness
+def _measure(func, repeat=3, setup=None):
+    """
+    Runs func repeat times (setup, untimed, before each run); returns (last_result, timing dict
+    incl. peak traced memory of one extra run).
+    """
+    times = []
+    result = None
+    for _ in range(max(1, repeat)):
+        if setup: setup()
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    if setup: setup()
+    tracemalloc.start() # separate run, tracing slows the timed ones down too much
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, {"best_s": round(min(times), 6), "median_s": round(statistics.median(times), 6),
+                    "runs": len(times), "peak_mem_kb": round(peak / 1024, 1)}
+
+def bench_scan(tree, repeat=3, threads=1, depth=0, index_path=None, processes=0, parse_cache=None):
+    """Full Watch Folder scan; counters come from the scan_stats of the last timed run."""
+    scan_stats = {}
+    def _run():
+        scan_stats.clear()
+        return core.scan_directory(tree, network_scan_depth=depth, scan_stats=scan_stats,
+                                   index_path=index_path, max_workers=threads, max_processes=processes,
+                                   parse_cache=parse_cache)
+    if processes > 1: core.scan_directory(tree, max_processes=processes) # start the pool outside the timing
+    results, timing = _measure(_run, repeat)
+    name = f"scan_processes{processes}" if processes > 1 else f"scan_threads{threads}" + ("_indexed" if index_path else "")
+    if parse_cache is not None:
+        name += "_parse_cached"
+        scan_stats.update(parse_cache_hits=parse_cache.stats["hits"], parse_cache_misses=parse_cache.stats["misses"])
+    return dict(name=name, projects_found=len(results), **timing, **scan_stats)
+
+def _project_parsers():
+    """(name, function) of every .dentalProject parser available here, the ElementTree reference first."""
+    parsers = [("parse_tree", core._parse_dental_project_tree), ("parse_streaming", core._parse_dental_project_streaming)]
+    if core.LXML_AVAILABLE:
+        parsers.append(("parse_lxml", core._parse_dental_project_lxml))
+    return parsers
+
+def _project_files(tree):
+    return [os.path.join(folder, name) for folder, _, names in os.walk(tree)
+            for name in names if name.lower().endswith(".dentalproject")]
+
+def bench_parse(tree, repeat=3, parser=None, name="parse_dental_project"):
+    """parser (default: parse_dental_project) over every .dentalProject file in the tree."""
+    parser = parser or core.parse_dental_project
+    project_files = _project_files(tree)
+    def _run():
+        return [parser(path) for path in project_files]
+    parsed, timing = _measure(_run, repeat)
+    return dict(name=name, files=len(project_files),
+                parse_errors=sum(1 for p in parsed if not p),
+                per_file_us=round(timing["best_s"] / max(1, len(project_files)) * 1e6, 1), **timing)
+
+def bench_parse_large(work_dir, repeat=3, sizes_kb=(1024, 4096), teeth=16):
+    """
+    Every parser on large (multi-unit bridge sized) project files: time, peak memory and
+    whether it returns the same dict as the ElementTree one. peak_mem_kb only sees Python
+    allocations; lxml keeps its tree in libxml2 memory.
+    """
+    results = []
+    rng = random.Random(1)
+    for size_kb in sizes_kb:
+        path = os.path.join(work_dir, f"large_{size_kb}kb.dentalProject")
+        _write_file(path, _project_xml(f"large_{size_kb}kb", rng, teeth, size_kb), time.time())
+        expected = core._parse_dental_project_tree(path)
+        for name, parser in _project_parsers():
+            parsed, timing = _measure(lambda: parser(path), repeat)
+            results.append(dict(name=f"{name}_{size_kb}kb", bytes=os.path.getsize(path),
+                                same_result=parsed == expected, **timing))
+    return results
+
+def bench_copy(tree, work_dir, repeat=3, shim=None):
+    """
+    Copies the CAM/Print files of today's projects into a fresh target folder per run, with the
+    filesystem calls MainWindow._copy_file_to_target makes for a new file: exists(source),
+    exists(destination), shutil.copy2.
+    """
+    suspended = shim.suspended if shim else contextlib.nullcontext
+    with suspended():
+        projects = core.scan_directory(tree)
+    jobs = [(p["folder_path"], path) for p in projects
+            for path in [p["info_path"]] + p["cad_stl_paths"] + p["model_stl_paths"] if path]
+    total_bytes = sum(os.path.getsize(path) for _, path in jobs)
+    run_dirs = []
+
+    def _setup():
+        with suspended():
+            target = tempfile.mkdtemp(prefix="copy_", dir=work_dir)
+            for folder in {folder for folder, _ in jobs}: # one target subfolder per project, no duplicates
+                os.makedirs(os.path.join(target, os.path.basename(folder)))
+        run_dirs.append(target)
+
+    def _run():
+        target = run_dirs[-1]
+        for folder, source_path in jobs:
+            if not os.path.exists(source_path): continue
+            destination = os.path.join(target, os.path.basename(folder), os.path.basename(source_path))
+            if os.path.exists(destination): continue
+            shutil.copy2(source_path, destination)
+        return len(jobs)
+
+    copied, timing = _measure(_run, repeat, _setup)
+    return dict(name="copy_to_target", files=copied, bytes=total_bytes,
+                mb_per_s=round(total_bytes / (1024 * 1024) / max(timing["best_s"], 1e-9), 2), **timing)
+
+def bench_copy_engine(tree, work_dir, repeat=3, shim=None, workers=core.COPY_WORKERS):
+    """
+    The bench_copy files sent through core.CopyEngine: one CopyJob per project (chunked copies
+    with progress callbacks, .part file + rename), submitted at once and run by `workers`
+    threads. The time is from the first submit until the last job is done.
+    """
+    suspended = shim.suspended if shim else contextlib.nullcontext
+    with suspended():
+        projects = core.scan_directory(tree)
+    jobs = [(p["folder_path"], [path for path in [p["info_path"]] + p["cad_stl_paths"] + p["model_stl_paths"] if path])
+            for p in projects]
+    total_bytes = sum(os.path.getsize(path) for _, paths in jobs for path in paths)
+    run_dirs = []
+    progress_calls = []
+
+    def _setup():
+        with suspended():
+            target = tempfile.mkdtemp(prefix="engine_", dir=work_dir)
+            for folder, _ in jobs:
+                os.makedirs(os.path.join(target, os.path.basename(folder)))
+        run_dirs.append(target)
+
+    def _run():
+        engine = core.CopyEngine(workers, on_progress=lambda job: progress_calls.append(job.job_id))
+        submitted = [engine.submit(core.CopyJob(os.path.basename(folder), os.path.join(run_dirs[-1], os.path.basename(folder)),
+                                                [({"copied": 0, "skipped": 0, "errors": [], "cancelled": False}, paths)]))
+                     for folder, paths in jobs]
+        for job in submitted:
+            job.wait()
+        engine.shutdown()
+        return sum(stats["copied"] for job in submitted for stats in job.results)
+
+    copied, timing = _measure(_run, repeat, _setup)
+    return dict(name="copy_engine", workers=workers, files=copied, bytes=total_bytes,
+                progress_callbacks=len(progress_calls) // (timing["runs"] + 1), # + the memory run
+                mb_per_s=round(total_bytes / (1024 * 1024) / max(timing["best_s"], 1e-9), 2), **timing)
+
+def bench_archive(work_dir, repeat=3, files=200, shim=None):
+    """core.archive_old_files on a target folder holding `files` files from the previous 30 days."""
+    suspended = shim.suspended if shim else contextlib.nullcontext
+    run_dirs = []
+    now = time.time()
+
+    def _setup():
+        with suspended():
+            target = tempfile.mkdtemp(prefix="archive_", dir=work_dir)
+            for i in range(files):
+                mtime = now - (1 + i % 30) * 86400
+                _write_file(os.path.join(target, f"case_{i:05d}_cad.stl"), b"\0" * 512, mtime)
+        run_dirs.append(target)
+
+    stats, timing = _measure(lambda: core.archive_old_files(run_dirs[-1]), repeat, _setup)
+    return dict(name="archive_old_files", files=files, moved=stats["moved"], errors=stats["errors"], **timing)
+
+POLL_ROUNDS = core.POLL_COLD_EVERY # cold folders are spread over this many polls
+
+def bench_watch_poll(tree, repeat=3):
+    """
+    SnapshotPollingObserver on an unchanged tree: the initial snapshot, then one poll (only
+    folder mtimes, plus the watched files of recently active folders), against listing every
+    folder again as a full-snapshot poller does each time.
+    """
+    def _snapshot():
+        observer = core.SnapshotPollingObserver()
+        observer.schedule(None, tree)
+        observer._add_tree(observer._root, emit=False)
+        return observer
+
+    observer, relist_timing = _measure(_snapshot, repeat)
+    observer.stats.clear()
+    _, poll_timing = _measure(observer.poll, repeat * POLL_ROUNDS)
+    polls = max(1, observer.stats.get("polls", 1))
+    return dict(name="watch_poll", folders=len(observer),
+                dirs_checked_per_poll=round(observer.stats.get("dirs_checked", 0) / polls),
+                files_stated_per_poll=round(observer.stats.get("files_stated", 0) / polls),
+                full_relist_s=relist_timing["best_s"], **poll_timing)
+
+class _CountingObserver(object):
+    """Records Observer.schedule/unschedule calls instead of registering OS watches."""
+    def __init__(self):
+        self.watches = []
+
+    def schedule(self, event_handler, path, recursive=False):
+        watch = (path, recursive)
+        self.watches.append(watch)
+        return watch
+
+    def unschedule(self, watch):
+        self.watches.remove(watch)
+
+def _observer_start(schedule):
+    """Starts a real watchdog Observer set up by schedule(observer); returns (seconds, threads started)."""
+    threads_before = threading.active_count()
+    observer = core.Observer()
+    start = time.perf_counter()
+    schedule(observer)
+    observer.start()
+    elapsed = time.perf_counter() - start
+    threads = threading.active_count() - threads_before
+    observer.stop()
+    observer.join()
+    return round(elapsed, 6), threads
+
+def bench_watch_set(tree, repeat=3, active_days=core.DEFAULT_WATCHER_ACTIVE_DAYS):
+    """
+    Folders a native observer registers (one inotify watch each on Linux) for the whole tree
+    recursively, against an AdaptiveWatchSet of the folders active in the last active_days.
+    Timed: building the watch set, against the folder walk a recursive schedule does. With
+    watchdog installed, also the start of a real Observer both ways (seconds, threads).
+    """
+    def _build():
+        observer = _CountingObserver()
+        core.AdaptiveWatchSet(observer, None, tree, active_days).schedule_active()
+        return observer
+
+    all_folders, walk_timing = _measure(lambda: sum(1 for _ in os.walk(tree)), repeat)
+    observer, timing = _measure(_build, repeat)
+    watched_folders = sum(sum(1 for _ in os.walk(path)) if recursive else 1 for path, recursive in observer.watches)
+    result = dict(name="watch_set", active_days=active_days, all_folders=all_folders,
+                  watched_folders=watched_folders, schedules=len(observer.watches),
+                  full_walk_s=walk_timing["best_s"], **timing)
+    if core.WATCHDOG_AVAILABLE:
+        handler = core.FileSystemEventHandler()
+        result["observer_start_s"], result["observer_threads"] = _observer_start(
+            lambda obs: core.AdaptiveWatchSet(obs, handler, tree, active_days).schedule_active())
+        result["recursive_start_s"], result["recursive_threads"] = _observer_start(
+            lambda obs: obs.schedule(handler, tree, recursive=True))
+    return result
+
+def _retained(build):
+    """Returns (build(), KB of traced allocations still alive once build returns)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, round(current / 1024, 1)
+
+def bench_records(tree, depth=0):
+    """
+    Memory the table's scan result holds, as ProjectEntry/FileRecord objects versus the per-record
+    dicts the scanner used to build. Field values are shared, so the dict figures are the slotted
+    total plus the container difference.
+    """
+    projects, held_kb = _retained(lambda: core.scan_directory(tree, network_scan_depth=depth))
+    files = [f for _, relevant_files, _ in core._scandir_walk(tree, depth) for f in relevant_files]
+    entry_slotted = sum(sys.getsizeof(p) for p in projects)
+    entry_dict = sum(sys.getsizeof(p.to_dict()) for p in projects)
+    file_slotted = sum(sys.getsizeof(f) for f in files)
+    file_dict = sum(sys.getsizeof(f.to_dict()) + sys.getsizeof(f.base) for f in files) # 'base' was stored per dict
+    count = max(1, len(projects))
+    return dict(name="scan_result_memory", projects=len(projects), files=len(files),
+                result_kb=held_kb, result_kb_as_dicts=round(held_kb + (entry_dict - entry_slotted) / 1024, 1),
+                entry_bytes=round(entry_slotted / count), entry_bytes_as_dict=round(entry_dict / count),
+                file_record_bytes=round(file_slotted / max(1, len(files))),
+                file_record_bytes_as_dict=round(file_dict / max(1, len(files))))
+
+def bench_debounce(events=200000, distinct_paths=50000, ttl_secs=60, events_per_sec=50):
+    """
+    Watcher path debounce over weeks of tray uptime (simulated clock): a plain dict keeps every
+    path ever changed, the DebounceMap only those changed within ttl_secs (at most max_entries).
+    """
+    rng = random.Random(7)
+    paths = [f"/cad-data/2024/{i // 50:05d}/case_{i}/model_{i}.stl" for i in range(distinct_paths)]
+    stream = [(i / events_per_sec, paths[rng.randrange(distinct_paths)]) for i in range(events)]
+
+    def _plain():
+        last = {}
+        for now, path in stream:
+            if now - last.get(path, 0) > 1.0: last[path] = now
+        return last
+
+    def _bounded():
+        debounce = core.DebounceMap(ttl_secs)
+        for now, path in stream:
+            debounce.debounce(path, 1.0, now)
+        return debounce
+
+    start = time.perf_counter()
+    _bounded()
+    bounded_us = (time.perf_counter() - start) / events * 1e6
+    debounce, bounded_kb = _retained(_bounded) # paths are shared with the stream, so these are container sizes
+    plain, plain_kb = _retained(_plain)
+    return dict(name="watcher_debounce", events=events, simulated_hours=round(events / events_per_sec / 3600, 1),
+                entries=len(debounce), entries_plain_dict=len(plain), kb=bounded_kb, kb_plain_dict=plain_kb,
+                reported_kb=round(debounce.memory_bytes() / 1024, 1), us_per_event=round(bounded_us, 2))
+
+# documents the generator does not produce: layouts the parsers must agree on anyway
+PARITY_CASES = {
+    "no_patient_name": '<P><Practice><PracticeName> Lab </PracticeName></Practice></P>',
+    "empty_patient_name": '<P><Patient><PatientName/><PatientFirstName>  </PatientFirstName></Patient></P>',
+    "second_patient_block": '<P><Patient><PatientFirstName>1</PatientFirstName></Patient>'
+                            '<X><Patient><PatientName>B, c</PatientName></Patient></X></P>',
+    "nested_patient": '<P><Patient><X><Patient><PatientName>Inner</PatientName></Patient></X>'
+                      '<PatientName>Outer</PatientName></Patient></P>',
+    "root_is_patient": '<Patient><PatientName>Root</PatientName></Patient>',
+    "antagonist_only": '<P><Teeth><Tooth><Number>36</Number><ReconstructionType>Antagonist</ReconstructionType></Tooth></Teeth></P>',
+    "type_from_child_tag": '<P><Teeth><Tooth><Number>12</Number><Color/><inlay_onlay/></Tooth>'
+                           '<Tooth><Number>x</Number><veneer/></Tooth>'
+                           '<Tooth><Number>13</Number><ReconstructionType/><Material/></Tooth></Teeth></P>',
+    "full_arch_and_other": '<P><Teeth>' + ''.join(
+        f'<Tooth><Number>{n}</Number><ReconstructionType>bridge_pontic</ReconstructionType></Tooth>'
+        for n in list(range(11, 19)) + [31, 32, 55]) + '</Teeth></P>',
+    "nested_teeth": '<P><Teeth><Tooth><Number>21</Number><Extra><Teeth><Tooth><Number>22</Number>'
+                    '<ReconstructionType>crown</ReconstructionType></Tooth></Teeth></Extra></Tooth></Teeth></P>',
+    "tooth_outside_teeth": '<P><Tooth><Number>14</Number><ReconstructionType>crown</ReconstructionType></Tooth>'
+                           '<Teeth><Tooth><Number>15</Number><ReconstructionType>inlay</ReconstructionType></Tooth></Teeth></P>',
+    "comments_and_pis": '<P><Patient><PatientName>A<!--c-->B</PatientName></Patient>'
+                        '<Teeth><Tooth><!-- x --><?pi y?><Number>11</Number><crown_x/></Tooth></Teeth></P>',
+    "internal_entity": '<!DOCTYPE P [<!ENTITY e "Ent">]><P><Patient><PatientName>&e;, x</PatientName></Patient></P>',
+    "namespaced": '<P xmlns="urn:x"><Patient><PatientName>N</PatientName></Patient></P>',
+    "empty_file": '',
+    "unclosed": '<P><Teeth><Tooth></P>',
+    "trailing_junk": '<P><Patient><PatientName>A</PatientName></Patient></P><junk/>',
+}
+
+def check_parity(tree, work_dir):
+    """
+    Runs every parser over the tree's project files plus PARITY_CASES and compares each
+    result with the ElementTree parser's. Returns a summary dict with the mismatches.
+    """
+    case_dir = os.path.join(work_dir, "parity_cases")
+    os.makedirs(case_dir, exist_ok=True)
+    for case_name, xml_text in PARITY_CASES.items():
+        _write_file(os.path.join(case_dir, f"{case_name}.dentalProject"), xml_text, time.time())
+    files = _project_files(tree) + _project_files(case_dir)
+    parsers = _project_parsers()
+    mismatches = []
+    for path in files:
+        expected = parsers[0][1](path)
+        for name, parser in parsers[1:]:
+            parsed = parser(path)
+            if parsed != expected:
+                mismatches.append({"file": path, "parser": name, "expected": expected, "got": parsed})
+    return {"files": len(files), "parsers": [name for name, _ in parsers], "mismatches": mismatches}
+
+def run_suite(tree, repeat=3, thread_counts=(1, 4), shim=None, process_counts=()):
+    """Runs every benchmark; with a LatencyShim, all of them run against the simulated share."""
+    results = []
+    work_dir = tempfile.mkdtemp(prefix="dw_bench_work_")
+    try:
+        with (shim or contextlib.nullcontext()):
+            suspended = shim.suspended if shim else contextlib.nullcontext
+            results.extend(bench_scan(tree, repeat, threads) for threads in thread_counts)
+            # worker processes do not see the shim (it patches this process only)
+            results.extend(bench_scan(tree, repeat, processes=processes) for processes in process_counts if processes > 1)
+            index_path = os.path.join(work_dir, core.SCAN_INDEX_FILE)
+            with suspended():
+                core.scan_directory(tree, index_path=index_path) # warm the index, the timed runs are repeat scans
+            results.append(bench_scan(tree, repeat, 1, index_path=index_path))
+            parse_cache = core.ProjectParseCache()
+            with suspended():
+                core.scan_directory(tree, parse_cache=parse_cache) # warm, as after the first scan of the day
+            results.append(bench_scan(tree, repeat, 1, parse_cache=parse_cache))
+            results.append(bench_parse(tree, repeat))
+            results.extend(bench_parse(tree, repeat, parser, name) for name, parser in _project_parsers())
+            with suspended():
+                results.extend(bench_parse_large(work_dir, repeat))
+            results.append(bench_copy(tree, work_dir, repeat, shim))
+            results.append(bench_copy_engine(tree, work_dir, repeat, shim))
+            results.append(bench_archive(work_dir, repeat, shim=shim))
+            results.append(bench_watch_poll(tree, repeat))
+            results.append(bench_watch_set(tree, repeat))
+            with suspended():
+                results.append(bench_records(tree))
+                results.append(bench_debounce())
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+# machine-readable output
+def _environment():
+    return {"app_version": core.APP_VERSION, "python": platform.python_version(),
+            "platform": platform.platform(), "cpu_count": os.cpu_count(),
+            "lxml": core.lxml_etree.__version__ if core.LXML_AVAILABLE else None,
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds")}
+
+def compare_results(old_doc, new_doc):
+    """Prints new/old ratios of the timing metrics for benchmarks present in both result files."""
+    old_by_name = {r["name"]: r for r in old_doc.get("results", [])}
+    for result in new_doc.get("results", []):
+        old = old_by_name.get(result["name"])
+        if not old: continue
+        for metric in ("best_s", "median_s", "peak_mem_kb"):
+            if old.get(metric) and metric in result:
+                ratio = result[metric] / old[metric]
+                flag = "  <-- slower" if metric != "peak_mem_kb" and ratio > 1.10 else ""
+                print(f"{result['name']:<28} {metric:<12} {old[metric]:>12} -> {result[metric]:>12}  x{ratio:.2f}{flag}")
+
+def _add_tree_args(parser):
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--depth", type=int, default=1, help="grouping folder levels above the case folders")
+    parser.add_argument("--teeth", type=int, default=4, help="teeth per .dentalProject")
+    parser.add_argument("--xml-kb", type=float, default=8, help="approx. .dentalProject size")
+    parser.add_argument("--stls", type=int, default=2, help="*cad.stl files per project")
+    parser.add_argument("--stl-kb", type=float, default=1)
+    parser.add_argument("--archive-days", type=int, default=20)
+    parser.add_argument("--today-fraction", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=1)
+
+def _tree_kwargs(args):
+    return dict(projects=args.projects, depth=args.depth, teeth_per_project=args.teeth, xml_kb=args.xml_kb,
+                stl_per_project=args.stls, stl_kb=args.stl_kb, archive_days=args.archive_days,
+                today_fraction=args.today_fraction, seed=args.seed)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DentalWatcher X scan/parse benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="create a synthetic CAD-DATA tree")
+    generate.add_argument("tree")
+    _add_tree_args(generate)
+    run = commands.add_parser("run", help="run the benchmark suite")
+    run.add_argument("--tree", help="existing tree (default: generate a temporary one)")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    run.add_argument("--processes", type=int, nargs="*", default=[], help="also time the process pool scan mode")
+    run.add_argument("--output", help="write the JSON results here instead of stdout")
+    run.add_argument("--latency-ms", type=float, default=0, help="simulated share round trip (0 = local disk)")
+    run.add_argument("--jitter-ms", type=float, default=0)
+    run.add_argument("--bandwidth-mb-s", type=float, default=0, help="simulated copy bandwidth (0 = unlimited)")
+    run.add_argument("--entry-stat-round-trip", action="store_true",
+                     help="DirEntry.stat() costs a round trip (POSIX/Samba clients; free on Windows)")
+    _add_tree_args(run)
+    memory = commands.add_parser("memory", help="memory held by a scan result of every project in a tree")
+    memory.add_argument("--tree", help="existing tree (default: generate a temporary one)")
+    _add_tree_args(memory)
+    memory.set_defaults(projects=10000, today_fraction=1.0, xml_kb=1, stl_kb=0.1)
+    parity = commands.add_parser("parity", help="check that all project parsers return the same dicts")
+    parity.add_argument("--tree", help="existing tree (default: generate a temporary one)")
+    _add_tree_args(parity)
+    parity.set_defaults(projects=300, teeth=12)
+    compare = commands.add_parser("compare", help="compare two JSON result files")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        print(json.dumps(generate_tree(args.tree, **_tree_kwargs(args)), indent=2))
+        return 0
+    if args.command == "compare":
+        with open(args.old) as f_old, open(args.new) as f_new:
+            compare_results(json.load(f_old), json.load(f_new))
+        return 0
+    if args.command == "parity":
+        work_dir = tempfile.mkdtemp(prefix="dw_bench_parity_")
+        try:
+            with contextlib.redirect_stdout(sys.stderr): # parse error messages of the broken cases
+                tree = args.tree or os.path.join(work_dir, "tree")
+                if not args.tree: generate_tree(tree, **_tree_kwargs(args))
+                result = check_parity(tree, work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        print(json.dumps(result, indent=2))
+        return 1 if result["mismatches"] else 0
+    if args.command == "memory":
+        tree = args.tree or tempfile.mkdtemp(prefix="dw_bench_tree_")
+        try:
+            with contextlib.redirect_stdout(sys.stderr):
+                if not args.tree: generate_tree(tree, **_tree_kwargs(args))
+                result = bench_records(tree)
+        finally:
+            if not args.tree: shutil.rmtree(tree, ignore_errors=True)
+        print(json.dumps(result, indent=2))
+        return 0
+
+    temp_tree = None
+    tree_info = {"path": args.tree}
+    if not args.tree:
+        temp_tree = tempfile.mkdtemp(prefix="dw_bench_tree_")
+        tree_info = generate_tree(temp_tree, **_tree_kwargs(args))
+        tree_info["generator_args"] = _tree_kwargs(args)
+    shim = None
+    if args.latency_ms > 0 or args.bandwidth_mb_s > 0:
+        shim = LatencyShim(args.latency_ms, args.jitter_ms, args.bandwidth_mb_s,
+                           entry_stat_round_trip=args.entry_stat_round_trip, seed=args.seed)
+    try:
+        with contextlib.redirect_stdout(sys.stderr): # core's progress prints must not mix into the JSON
+            doc = {"environment": _environment(), "tree": tree_info,
+                   "results": run_suite(args.tree or temp_tree, args.repeat, args.threads, shim, args.processes)}
+        if shim:
+            doc["network_profile"] = shim.profile()
+            doc["network_calls"] = {k: round(v, 3) if isinstance(v, float) else v for k, v in shim.stats.items()}
+    finally:
+        if temp_tree: shutil.rmtree(temp_tree, ignore_errors=True)
+    output = json.dumps(doc, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"Results written to {args.output}")
+    else:
+        print(output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,20 @@ import xml.etree.ElementTree as ET
 import threading
 import time
 import json # config stuff
+import re
+import fnmatch # watcher temp file patterns
+import sqlite3 # scan index
+import itertools
+import stat
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+# scan records and folder listing live in scanwalk, which scan worker processes import on their own
+from scanwalk import (_SlotRecord, FileRecord, SCAN_RELEVANT_EXTENSIONS, _bump_stat, _list_dir_entries,
+                      _is_likely_archive_path, _classify_file_entry, _classify_file_entries, _list_folder,
+                      _scan_partitions)
 
 # vtk import and check if available
 try:
@@ -53,6 +67,18 @@ except Exception as e_wd_load:
     FileSystemEventHandler = object
     FileSystemEvent = object
 
+# lxml import for faster project parsing (optional, ElementTree is used without it)
+try:
+    from lxml import etree as lxml_etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+    lxml_etree = None
+except Exception as e_lxml_load:
+    print(f"Error loading lxml: {e_lxml_load}")
+    LXML_AVAILABLE = False
+    lxml_etree = None
+
 # define constants
 APP_NAME = "DentalWatcher X"
 ORG_NAME = "KamarauliTech" #
@@ -77,9 +103,69 @@ SETTINGS_AUTO_DUPLICATE_ACTION = "auto_duplicate_action" # For auto-send/trigger
 DEFAULT_AUTO_DUPLICATE_ACTION = "manual" # 'skip', 'overwrite', 'manual' (use manual setting)
 SETTINGS_NETWORK_SCAN_DEPTH = "network_scan_depth"
 DEFAULT_NETWORK_SCAN_DEPTH = 0 # 0 for unlimited, effectively relying on os.walk default.
+SETTINGS_SCAN_INDEX_ENABLED = "scan_index_enabled"
+DEFAULT_SCAN_INDEX_ENABLED = False
+SETTINGS_SCAN_THREADS = "scan_threads"
+DEFAULT_SCAN_THREADS = 4 # parallel folder listings for Watch Folder scans (1 = single-threaded)
+SETTINGS_SCAN_PROCESSES = "scan_processes"
+DEFAULT_SCAN_PROCESSES = 0 # worker processes for very large Watch Folders (0 = off, threads only)
+SCAN_WINDOW_TODAY = "today"
+SCAN_WINDOW_HOURS = "hours"               # value: number of hours back from now
+SCAN_WINDOW_WORKING_DAYS = "working_days" # value: number of working days (Mon-Fri), today included
+SCAN_WINDOW_SINCE = "since"               # value: 'YYYY-MM-DD HH:MM' or 'YYYY-MM-DD'
+SETTINGS_SCAN_WINDOW_MODE = "scan_window_mode"
+DEFAULT_SCAN_WINDOW_MODE = SCAN_WINDOW_TODAY
+SETTINGS_SCAN_WINDOW_VALUE = "scan_window_value"
+DEFAULT_SCAN_WINDOW_VALUE = ""
+SETTINGS_SCAN_PRUNE_OLD_DIRS = "scan_prune_old_dirs"
+DEFAULT_SCAN_PRUNE_OLD_DIRS = False
+SETTINGS_SCAN_CACHE_TTL_SECS = "scan_cache_ttl_secs"
+DEFAULT_SCAN_CACHE_TTL_SECS = 300 # how old cached scan results may be to be shown while rescanning (0 = off)
+SCAN_CACHE_MAX_ENTRIES = 8 # distinct (folder, depth, window) result sets kept in memory
+SETTINGS_PARSE_CACHE_PERSIST = "parse_cache_persist"
+DEFAULT_PARSE_CACHE_PERSIST = True # keep parsed .dentalProject data across restarts (PARSE_CACHE_FILE)
+PARSE_CACHE_MAX_ENTRIES = 5000 # parsed projects kept, least recently used are dropped first
+PARSE_STREAMING_MIN_BYTES = 1024 * 1024 # .dentalProject files this large are parsed with iterparse (less memory, ~1.4x the time)
+SETTINGS_WATCHER_QUIET_SECS = "watcher_quiet_secs"
+DEFAULT_WATCHER_QUIET_SECS = 2 # a changed project folder is rescanned once no watched file in it changed for this long
+WATCHER_MAX_COALESCE_SECS = 30 # folders that never go quiet are still rescanned at least this often
+SETTINGS_AUTO_SEND_STABLE_SECS = "auto_send_stable_secs"
+DEFAULT_AUTO_SEND_STABLE_SECS = 3 # files must keep their size and mtime this long before they are auto-sent (0 = off)
+STABILITY_POLL_MIN_SECS = 0.5 # first re-check of a file still being written...
+STABILITY_POLL_MAX_SECS = 8.0 # ...doubling up to this while nothing changes
+SELF_WRITE_SUPPRESS_SECS = 10 # watcher events for files we copied/moved are ignored this long after the write
+DEBOUNCE_MAX_ENTRIES = 10000 # paths/folders a DebounceMap remembers at most, oldest are dropped first
+WATCHER_DEBOUNCE_TTL_SECS = 60 # how long the watcher remembers a changed file for its per-path debounce
+# files written by editors/CAD software before being renamed to their final name (matched lowercase);
+# only names that still end in .stl/.constructionInfo get here, so suffixes like *.tmp need no pattern
+WATCHER_TEMP_FILE_PATTERNS = ("~*", ".~*", ".#*", "*.tmp.*")
+WATCHER_MODE_AUTO = "auto"       # polling on network shares (is_network_path: UNC, mapped drives, SMB/NFS mounts), native otherwise
+WATCHER_MODE_NATIVE = "native"   # watchdog Observer (inotify/ReadDirectoryChangesW/FSEvents)
+WATCHER_MODE_POLLING = "polling" # SnapshotPollingObserver, sees writes from other machines on SMB/NFS shares
+WATCHER_MODE_ACTIVE = "active"   # native events on an AdaptiveWatchSet: only folders active in the last N days
+SETTINGS_WATCHER_MODE = "watcher_mode"
+DEFAULT_WATCHER_MODE = WATCHER_MODE_AUTO
+SETTINGS_WATCHER_POLL_SECS = "watcher_poll_secs"
+DEFAULT_WATCHER_POLL_SECS = 5
+SETTINGS_WATCHER_ACTIVE_DAYS = "watcher_active_days"
+DEFAULT_WATCHER_ACTIVE_DAYS = 7
+WATCHER_ACTIVE_MAX_SCHEDULES = 32 # observer schedules of an AdaptiveWatchSet (one emitter thread + inotify instance each)
+POLL_ACTIVE_SECS = 24 * 3600 # folders with project files changed this recently are checked on every poll...
+POLL_COLD_EVERY = 6          # ...all other folders on every 6th poll (spread evenly over the polls)
+COPY_CHUNK_BYTES = 1024 * 1024 # copies are written in chunks of this size (progress/cancel points)
+COPY_TEMP_SUFFIX = ".part"     # a file being copied is written under this suffix, then renamed
+COPY_WORKERS = 2               # CopyEngine threads; jobs for the same target folder still run one at a time
+COPY_PROGRESS_INTERVAL_SECS = 0.1 # progress callbacks per job are throttled to this interval
 
 APP_VERSION = "3.17.0+"
 AUTO_SEND_STATUS_FILE = "autosend_status.json"
+SCAN_INDEX_FILE = "scan_index.db" # directory index for incremental scans
+PARSE_CACHE_FILE = "parse_cache.json" # saved ProjectParseCache
+
+# network share detection (is_network_path)
+NETWORK_FS_TYPES = ("cifs", "smb3", "smbfs", "nfs", "nfs4", "afs", "fuse.sshfs") # /proc/mounts fstypes of network shares
+PROC_MOUNTS_FILE = "/proc/mounts"
+DRIVE_REMOTE = 4 # GetDriveTypeW result for mapped network drives
 
 # constants for the vtk viewer
 VIEWER_BACKGROUND_COLOR = (0.15, 0.16, 0.18)
@@ -88,19 +174,45 @@ VIEWER_AXES_ENABLED = True
 
 # some helper functions
 
+def _mount_fstype(path_str):
+    """POSIX: filesystem type of the mount holding path_str, from /proc/mounts (None if unknown)."""
+    try:
+        with open(PROC_MOUNTS_FILE, "r", encoding="utf-8", errors="replace") as f:
+            mounts = [line.split() for line in f]
+    except OSError:
+        return None # no /proc (macOS, BSD)
+    real_path = os.path.realpath(path_str)
+    best_mount, best_type = "", None
+    for fields in mounts:
+        if len(fields) < 3: continue
+        # spaces etc. in mount points are written as octal escapes (\040)
+        mount_point = re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), fields[1])
+        inside = real_path == mount_point or real_path.startswith(mount_point.rstrip("/") + "/")
+        if inside and len(mount_point) >= len(best_mount): # the innermost mount wins, later entries shadow earlier ones
+            best_mount, best_type = mount_point, fields[2]
+    return best_type
+
 def is_network_path(path_str: str) -> bool:
     """
-    Basic check for network paths. Primarily for UNC paths on Windows.
-    For other OSes, this is less reliable and the depth limit is applied if set.
+    True if path_str is on a network share: UNC paths and mapped network drives
+    (GetDriveTypeW) on Windows, SMB/NFS mounts (/proc/mounts fstype, see NETWORK_FS_TYPES)
+    on Linux. Always False for local paths on systems without /proc/mounts.
     """
     if not path_str:
         return False
-    # Windows UNC paths
-    if os.name == 'nt' and path_str.startswith('\\\\'):
-        return True
-    # Add other checks if necessary, e.g., for specific mount points on POSIX
-    # For now, keep it simple as the depth limit is the main control.
-    return False
+    if os.name == 'nt':
+        if path_str.startswith('\\\\') or path_str.startswith('//'): # UNC paths
+            return True
+        drive = os.path.splitdrive(os.path.abspath(path_str))[0]
+        if not drive:
+            return False
+        try:
+            import ctypes
+            return ctypes.windll.kernel32.GetDriveTypeW(drive + '\\') == DRIVE_REMOTE
+        except (ImportError, AttributeError, OSError):
+            return False
+    fstype = _mount_fstype(path_str)
+    return fstype is not None and (fstype in NETWORK_FS_TYPES or fstype.startswith("nfs"))
 
 def shorten_path(p, length=2):
     if not p or p == "Not set" or os.sep not in p: return p
@@ -125,85 +237,150 @@ def get_relative_time(timestamp):
 
 
 # xml project parser
+# direct children of a Teeth/Tooth element that describe the tooth rather than the work type
+_TOOTH_DETAIL_TAGS = ['Number', 'Parameters', 'MaterialName', 'Material', 'ImplantType',
+                      'PreparationType', 'Color', 'MesialConnector', 'ScanAbutmentScan',
+                      'SeparateGingivaScan', 'SituScan']
+# (parent tag, tag) of the single-value fields read from a .dentalProject; the first match in document order wins
+_PROJECT_TEXT_FIELDS = {('Patient', 'PatientName'): 'patient_name', ('Patient', 'PatientFirstName'): 'case_id',
+                        ('Practice', 'PracticeName'): 'practice'}
+
+def _read_tooth(tooth_element):
+    """
+    Returns (number text, reconstruction type, is_antagonist) of a Teeth/Tooth element. Without a
+    ReconstructionType, the tag of the first child that is not a tooth detail is the work type.
+    """
+    num_text = tooth_element.findtext('Number')
+    r_type = tooth_element.findtext('ReconstructionType')
+
+    if not r_type:
+        relevant_child = next((el for el in tooth_element if el.tag not in _TOOTH_DETAIL_TAGS), None)
+        if relevant_child is not None:
+            r_type = relevant_child.tag
+    is_antagonist = tooth_element.findtext('ReconstructionType', '').lower() == 'antagonist'
+    return num_text, r_type, is_antagonist
+
+def _summarize_project(filepath, p_name_raw, case_id, practice, teeth):
+    """Builds the parsed project dict from the raw field texts and the _read_tooth tuples."""
+    p_parts = [p.strip() for p in p_name_raw.split(',') if p.strip()]
+    p_name = p_parts[0] if p_parts else "Patient N/A"
+
+    work_types = set()
+    teeth_numbers = []
+    for num_text, r_type, _ in teeth:
+        if r_type and r_type.lower() != 'antagonist':
+            if num_text:
+                try:
+                    teeth_numbers.append(int(num_text))
+                except ValueError:
+                    pass
+            if r_type:
+                display_rtype = r_type.replace('_', ' ').title()
+                work_types.add(display_rtype)
+
+    teeth_numbers = sorted(list(set(teeth_numbers)))
+
+    # full arch logic here
+    upper_teeth = [t for t in teeth_numbers if 11 <= t <= 28]
+    lower_teeth = [t for t in teeth_numbers if 31 <= t <= 48]
+    other_teeth = [t for t in teeth_numbers if not (11 <= t <= 28 or 31 <= t <= 48)]
+
+    teeth_parts = []
+    if len(upper_teeth) >= 8:
+        teeth_parts.append("Full Arch Upper")
+    elif upper_teeth:
+        teeth_parts.append(", ".join(map(str, upper_teeth)))
+
+    if len(lower_teeth) >= 8:
+        teeth_parts.append("Full Arch Lower")
+    elif lower_teeth:
+        teeth_parts.append(", ".join(map(str, lower_teeth)))
+
+    if other_teeth:
+        teeth_parts.append(", ".join(map(str, other_teeth)))
+
+    tooth_str = ", ".join(teeth_parts) if teeth_parts else "?"
+
+    if work_types:
+        work_str = ", ".join(sorted(list(work_types)))
+    elif not teeth_numbers and any(is_antagonist for _, _, is_antagonist in teeth):
+        work_str = "Antagonist?"
+    else:
+        work_str = "Type N/A"
+
+    disp_p = f"{p_name}" + (f" ({case_id})" if case_id else "")
+
+    return {
+        "patient": disp_p,
+        "practice": practice,
+        "work_type": work_str,
+        "teeth": tooth_str,
+        "filename": os.path.basename(filepath),
+        "case_id": case_id
+    }
+
 def parse_dental_project(filepath):
-    """Parses .dentalProject XML file, identifies full arches."""
-    if not filepath or not os.path.exists(filepath): return None
+    """
+    Parses .dentalProject XML file, identifies full arches.
+    Files of PARSE_STREAMING_MIN_BYTES or more are streamed instead of being loaded as a
+    whole tree; below that, building the tree is faster and the memory does not matter.
+    Trees are built with lxml when it is installed, with ElementTree otherwise (same result).
+    """
+    if not filepath: return None
     try:
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-
-        p_name_raw = root.findtext('.//Patient/PatientName', default='?').strip()
-        p_parts = [p.strip() for p in p_name_raw.split(',') if p.strip()]
-        p_name = p_parts[0] if p_parts else "Patient N/A"
-        case_id = root.findtext('.//Patient/PatientFirstName', default='').strip()
-        practice = root.findtext('.//Practice/PracticeName', default='').strip()
-
-        work_types = set()
-        teeth_numbers = []
-        for tooth_element in root.findall('.//Teeth/Tooth'):
-            num_text = tooth_element.findtext('Number')
-            r_type = tooth_element.findtext('ReconstructionType')
-
-            if not r_type:
-                child_elements = list(tooth_element)
-                relevant_child = next((el for el in child_elements if
-                                       el.tag not in ['Number', 'Parameters', 'MaterialName', 'Material', 'ImplantType',
-                                                      'PreparationType', 'Color', 'MesialConnector', 'ScanAbutmentScan',
-                                                      'SeparateGingivaScan', 'SituScan']), None)
-                if relevant_child is not None:
-                    r_type = relevant_child.tag
-
-            if r_type and r_type.lower() != 'antagonist':
-                if num_text:
-                    try:
-                        teeth_numbers.append(int(num_text))
-                    except ValueError:
-                        pass
-                if r_type:
-                    display_rtype = r_type.replace('_', ' ').title()
-                    work_types.add(display_rtype)
-
-        teeth_numbers = sorted(list(set(teeth_numbers)))
-
-        # full arch logic here
-        upper_teeth = [t for t in teeth_numbers if 11 <= t <= 28]
-        lower_teeth = [t for t in teeth_numbers if 31 <= t <= 48]
-        other_teeth = [t for t in teeth_numbers if not (11 <= t <= 28 or 31 <= t <= 48)]
-
-        teeth_parts = []
-        if len(upper_teeth) >= 8:
-            teeth_parts.append("Full Arch Upper")
-        elif upper_teeth:
-            teeth_parts.append(", ".join(map(str, upper_teeth)))
-
-        if len(lower_teeth) >= 8:
-            teeth_parts.append("Full Arch Lower")
-        elif lower_teeth:
-            teeth_parts.append(", ".join(map(str, lower_teeth)))
-
-        if other_teeth:
-            teeth_parts.append(", ".join(map(str, other_teeth)))
-
-        tooth_str = ", ".join(teeth_parts) if teeth_parts else "?"
-
-        if work_types:
-            work_str = ", ".join(sorted(list(work_types)))
-        elif not teeth_numbers and any(
-                t.findtext('ReconstructionType', '').lower() == 'antagonist' for t in root.findall('.//Teeth/Tooth')):
-            work_str = "Antagonist?"
-        else:
-            work_str = "Type N/A"
+        file_size = os.path.getsize(filepath)
+    except OSError:
+        return None
+    if file_size >= PARSE_STREAMING_MIN_BYTES:
+        return _parse_dental_project_streaming(filepath)
+    if LXML_AVAILABLE:
+        return _parse_dental_project_lxml(filepath)
+    return _parse_dental_project_tree(filepath)
 
-        disp_p = f"{p_name}" + (f" ({case_id})" if case_id else "")
+def _parse_dental_project_streaming(filepath):
+    """
+    parse_dental_project in one iterparse pass: elements are freed as soon as they have been
+    read (a Teeth/Tooth element once the whole tooth is read), so large multi-unit projects
+    never exist in memory as a complete tree. Same result as _parse_dental_project_tree.
+    """
+    try:
+        claimed = {} # field -> (start number of its parent, element it is read from)
+        values = {}
+        teeth = []
+        open_elements = [] # (element, start number)
+        started = 0
+        open_teeth = 0 # Teeth/Tooth elements currently open; their children are kept until the tooth ends
+        with open(filepath, 'rb') as f:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    started += 1
+                    if len(open_elements) > 1: # like './/Patient/...', the root itself is never the parent
+                        parent, parent_started = open_elements[-1]
+                        field = _PROJECT_TEXT_FIELDS.get((parent.tag, elem.tag))
+                        # findtext order: the first parent (in document order) that has the field, then its first one
+                        if field and (field not in claimed or parent_started < claimed[field][0]):
+                            claimed[field] = (parent_started, elem)
+                        if elem.tag == 'Tooth' and parent.tag == 'Teeth': open_teeth += 1
+                    open_elements.append((elem, started))
+                    continue
 
-        return {
-            "patient": disp_p,
-            "practice": practice,
-            "work_type": work_str,
-            "teeth": tooth_str,
-            "filename": os.path.basename(filepath),
-            "case_id": case_id
-        }
+                open_elements.pop()
+                parent = open_elements[-1][0] if open_elements else None
+                if parent is None:
+                    continue # root closed; iterparse still rejects trailing junk, like ET.parse
+                if len(open_elements) > 1:
+                    field = _PROJECT_TEXT_FIELDS.get((parent.tag, elem.tag))
+                    if field and claimed[field][1] is elem:
+                        values[field] = elem.text or ''
+                    if elem.tag == 'Tooth' and parent.tag == 'Teeth':
+                        teeth.append(_read_tooth(elem))
+                        open_teeth -= 1
+                if not open_teeth:
+                    elem.clear()
+                    parent.remove(elem) # always the first remaining child, earlier siblings are gone already
+
+        return _summarize_project(filepath, values.get('patient_name', '?').strip(),
+                                  values.get('case_id', '').strip(), values.get('practice', '').strip(), teeth)
 
     except ET.ParseError:
         print(f"XML parse error in: {filepath}")
@@ -212,229 +389,1852 @@ def parse_dental_project(filepath):
         print(f"Unexpected error parsing {filepath}: {e_parse}")
         return None
 
+def _parse_dental_project_tree(filepath):
+    """parse_dental_project on a fully built ElementTree (ET.parse plus findall searches)."""
+    try:
+        root = ET.parse(filepath).getroot()
+        return _summarize_project(filepath, root.findtext('.//Patient/PatientName', default='?').strip(),
+                                  root.findtext('.//Patient/PatientFirstName', default='').strip(),
+                                  root.findtext('.//Practice/PracticeName', default='').strip(),
+                                  [_read_tooth(t) for t in root.findall('.//Teeth/Tooth')])
+    except ET.ParseError:
+        print(f"XML parse error in: {filepath}")
+        return None
+    except Exception as e_parse:
+        print(f"Unexpected error parsing {filepath}: {e_parse}")
+        return None
+
+_lxml_local = threading.local() # lxml parsers and XPath objects are per thread, scans parse on several
+
+def _lxml_helpers():
+    """This thread's lxml parser and XPath expressions, compiled on first use."""
+    helpers = getattr(_lxml_local, "helpers", None)
+    if helpers is None:
+        # comments/PIs are dropped like ElementTree does, so Tooth children are the same elements
+        parser = lxml_etree.XMLParser(remove_comments=True, remove_pis=True, no_network=True, huge_tree=True)
+        # first Patient (Practice) in document order that has the field as a child, like ElementTree's findtext
+        helpers = _lxml_local.helpers = {
+            "parser": parser,
+            "patient_name": lxml_etree.XPath("(.//Patient[PatientName])[1]/PatientName[1]"),
+            "case_id": lxml_etree.XPath("(.//Patient[PatientFirstName])[1]/PatientFirstName[1]"),
+            "practice": lxml_etree.XPath("(.//Practice[PracticeName])[1]/PracticeName[1]"),
+            "teeth": lxml_etree.XPath(".//Teeth/Tooth"),
+        }
+    return helpers
+
+def _parse_dental_project_lxml(filepath):
+    """parse_dental_project with lxml and precompiled XPath; same result as _parse_dental_project_tree."""
+    try:
+        helpers = _lxml_helpers()
+        with open(filepath, 'rb') as f:
+            root = lxml_etree.parse(f, helpers["parser"]).getroot()
+
+        def _first_text(name, default):
+            found = helpers[name](root)
+            return (found[0].text or '') if found else default
+
+        return _summarize_project(filepath, _first_text("patient_name", '?').strip(),
+                                  _first_text("case_id", '').strip(), _first_text("practice", '').strip(),
+                                  [_read_tooth(t) for t in helpers["teeth"](root)])
+    except lxml_etree.ParseError:
+        print(f"XML parse error in: {filepath}")
+        return None
+    except Exception as e_parse:
+        print(f"Unexpected error parsing {filepath}: {e_parse}")
+        return None
+
+
+# parsed project cache
+class ProjectParseCache(object):
+    """
+    LRU cache of parse_dental_project results, valid for one (path, mtime, size) version of
+    a .dentalProject file. Shared by Watch Folder scans and watcher triggers, so a project is
+    only parsed again after it changes. Thread-safe. save()/load() keep it across restarts.
+    Failed parses are not cached (the file may still be being written).
+    """
+    FILE_VERSION = 1
+
+    def __init__(self, max_entries=PARSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._entries = OrderedDict() # path -> (mtime, size, parsed_data), least recently used first
+        self._lock = threading.Lock()
+        self._dirty = False # changed since load()/save()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, path, mtime, size):
+        """Returns the cached parse of this file version, or None."""
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == mtime and cached[1] == size:
+                self._entries.move_to_end(path)
+                self.stats["hits"] += 1
+                return cached[2]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, path, mtime, size, parsed_data):
+        with self._lock:
+            self._entries[path] = (mtime, size, parsed_data) # replaces older versions of the file
+            self._entries.move_to_end(path)
+            self._dirty = True
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def parse(self, path, mtime, size):
+        """parse_dental_project(path) through the cache; mtime/size are the file's current stat values."""
+        parsed_data = self.get(path, mtime, size)
+        if parsed_data is None:
+            parsed_data = parse_dental_project(path)
+            if parsed_data:
+                self.put(path, mtime, size, parsed_data)
+        return parsed_data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def load(self, file_path):
+        """Adds the entries saved by save(). A missing or unreadable file leaves the cache as it is."""
+        if not os.path.exists(file_path):
+            return 0
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                doc = json.load(f)
+            if doc.get("version") != self.FILE_VERSION:
+                print(f"[Parse Cache] Ignoring '{file_path}' (format version {doc.get('version')}).")
+                return 0
+            entries = [(path, mtime, size, parsed_data) for path, mtime, size, parsed_data in doc["entries"]]
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+            print(f"[Parse Cache] Error loading '{file_path}': {e}. Starting empty.")
+            return 0
+        with self._lock:
+            for path, mtime, size, parsed_data in entries:
+                self._entries[path] = (mtime, size, parsed_data)
+            self._evict()
+        print(f"[Parse Cache] Loaded {len(entries)} parsed project(s) from '{file_path}'.")
+        return len(entries)
+
+    def save(self, file_path):
+        """Writes the cache to file_path (via a temp file) if it changed since the last load/save."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            entries = [[path, mtime, size, parsed_data] for path, (mtime, size, parsed_data) in self._entries.items()]
+            self._dirty = False
+        temp_path = file_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": self.FILE_VERSION, "entries": entries}, f)
+            os.replace(temp_path, file_path)
+            return True
+        except OSError as e:
+            print(f"[Parse Cache] Error saving '{file_path}': {e}")
+            self._dirty = True
+            return False
+
+
+# scan time window ("modified since")
+def _parse_since_value(value):
+    """Parses a 'since' window value ('YYYY-MM-DD HH:MM', 'YYYY-MM-DD' or epoch seconds) to epoch seconds."""
+    value = str(value).strip()
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            pass
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Invalid date/time '{value}' (expected YYYY-MM-DD HH:MM)")
+
+def scan_window_bounds(mode=SCAN_WINDOW_TODAY, value=None, now=None):
+    """
+    Returns the (start, end) epoch seconds of a scan window; a file is in the window
+    if start <= mtime < end. Computed once per scan so the per-file check is two float
+    compares. Raises ValueError for an unknown mode or a bad value.
+    """
+    now_dt = datetime.datetime.fromtimestamp(now) if now is not None else datetime.datetime.now()
+    midnight = datetime.datetime.combine(now_dt.date(), datetime.time())
+    end_of_today = (midnight + datetime.timedelta(days=1)).timestamp()
+
+    if mode == SCAN_WINDOW_TODAY:
+        return midnight.timestamp(), end_of_today
+    if mode == SCAN_WINDOW_HOURS:
+        hours = float(value)
+        if hours <= 0: raise ValueError("Hours must be greater than 0")
+        return (now_dt - datetime.timedelta(hours=hours)).timestamp(), float("inf")
+    if mode == SCAN_WINDOW_WORKING_DAYS:
+        days = int(value)
+        if days < 1: raise ValueError("Working days must be at least 1")
+        start_day = now_dt.date()
+        if start_day.weekday() < 5: days -= 1 # today counts if it is a working day
+        while days > 0 or start_day.weekday() >= 5:
+            start_day -= datetime.timedelta(days=1)
+            if start_day.weekday() < 5: days -= 1
+        return datetime.datetime.combine(start_day, datetime.time()).timestamp(), end_of_today
+    if mode == SCAN_WINDOW_SINCE:
+        return _parse_since_value(value), float("inf")
+    raise ValueError(f"Unknown scan window mode '{mode}'")
+
+def describe_scan_window(mode=SCAN_WINDOW_TODAY, value=None):
+    """Short text for the UI: 'today', 'in the last 3 hours', ..."""
+    if mode == SCAN_WINDOW_HOURS: return f"in the last {value} hour{'s' if str(value) != '1' else ''}"
+    if mode == SCAN_WINDOW_WORKING_DAYS: return f"in the last {value} working day{'s' if str(value) != '1' else ''}"
+    if mode == SCAN_WINDOW_SINCE: return f"since {value}"
+    return "today"
+
+
+# scan result records
+class ProjectEntry(_SlotRecord):
+    """One project row of a scan result (formerly a 17-key dict); see _build_project_entry."""
+    __slots__ = ("last_modified_timestamp", "patient", "work_type", "teeth", "file_status", "base_name",
+                 "project_path", "info_path", "cad_stl_paths", "other_stl_paths", "model_stl_paths",
+                 "parsed_data", "folder_path", "has_cad", "has_info", "has_models", "status_icons")
+    _FIELDS = __slots__
+
+    def __init__(self, **fields):
+        for key in self.__slots__:
+            setattr(self, key, fields.pop(key, None))
+        if fields: raise TypeError(f"Unknown ProjectEntry fields: {', '.join(fields)}")
+
+
+# scandir based directory walker
+def _restat_files(relevant_files, stats=None):
+    """
+    Re-reads mtime and size of a folder's indexed FileRecords (a file rewritten in place does
+    not change its folder's mtime). Returns the same list if nothing changed, an updated one
+    otherwise, or None if a file is gone (the folder has to be listed again).
+    """
+    updated = None
+    for i, file_info in enumerate(relevant_files):
+        try:
+            file_stat = os.stat(file_info.path)
+        except OSError:
+            return None
+        _bump_stat(stats, "index_file_stats")
+        if file_stat.st_mtime != file_info.mtime or file_stat.st_size != file_info.size:
+            if updated is None: updated = list(relevant_files)
+            updated[i] = FileRecord(file_info.path, file_info.name, file_stat.st_mtime, file_info.kind, file_stat.st_size)
+    return relevant_files if updated is None else updated
+
+def _scandir_walk(top, max_depth=0, stats=None, index=None, max_workers=1, cancel_event=None, prune_before=None,
+                  start_depth=0):
+    """
+    Top-down walk of the watch folder built on os.scandir.
+    Yields (folder, relevant_files, index_row) for every folder that is not an archive
+    folder, where relevant_files are FileRecords and index_row is the folder's
+    ScanIndex row (or None). Does not descend below max_depth (0 = unlimited) and does
+    not follow symlinked directories (os.walk default).
+
+    With max_workers > 1 folder listings run on a thread pool: every discovered subfolder
+    goes onto the pool's shared queue, so an idle thread picks up the next pending folder
+    wherever it is in the tree and listings overlap their network round trips. Results are
+    yielded (and the index is used) on the calling thread only.
+
+    With an index, a folder whose mtime is unchanged and that had no subfolders is
+    served from the index instead of being listed again; only its indexed files are
+    stat'ed, so files rewritten in place are still seen with their new mtime.
+    The walk stops before the next folder once cancel_event (threading.Event) is set;
+    listings already running on pool threads finish in the background.
+    With prune_before (epoch seconds) and an index, such index-served leaf folders whose
+    files are all older are skipped instead of yielded. Grouping folders are never pruned:
+    their mtime only moves when a child is added or removed, not when a project inside
+    changes. start_depth is the depth of top below the watch folder (for walks of a
+    single partition).
+    """
+    want_mtimes = index is not None
+    try:
+        top_mtime = os.stat(top).st_mtime if want_mtimes else None
+    except OSError:
+        top_mtime = None
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ScanWalker") if max_workers > 1 else None
+    stack = [(top, start_depth, top_mtime)]
+    in_flight = {} # future -> (folder, depth, folder_mtime, index_row)
+
+    def _finish(folder, depth, folder_mtime, index_row, result):
+        relevant_files, children, has_subdirs, local_stats = result
+        if stats is not None:
+            for key, value in local_stats.items(): _bump_stat(stats, key, value)
+        if relevant_files is None:
+            return None
+        if index is not None and folder_mtime is not None:
+            index.update(folder, folder_mtime, has_subdirs, relevant_files)
+        # push in reverse so folders are visited in listing order
+        for child_path, child_mtime in reversed(children):
+            stack.append((child_path, depth + 1, child_mtime))
+        return folder, relevant_files, index_row
+
+    try:
+        while stack or in_flight:
+            if cancel_event is not None and cancel_event.is_set():
+                print(f"[Scan] Walk of '{top}' cancelled.")
+                return
+            while stack:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                folder, depth, folder_mtime = stack.pop()
+
+                if _is_likely_archive_path(folder):
+                    print(f"[Scan Depth] Skipping likely archive path: {folder}")
+                    continue
+
+                index_row = None
+                if index is not None:
+                    index.mark_seen(folder)
+                    index_row = index.get(folder)
+                    if (index_row and folder_mtime is not None and index_row["mtime"] == folder_mtime
+                            and not index_row["has_subdirs"]):
+                        files = _restat_files(index_row["files"], stats)
+                        if files is not None:
+                            _bump_stat(stats, "index_hits")
+                            if files is not index_row["files"]:
+                                index.update(folder, folder_mtime, False, files)
+                                index_row = index.get(folder)
+                            if prune_before is not None and depth > 0 and all(f.mtime < prune_before for f in files):
+                                _bump_stat(stats, "dirs_pruned")
+                                continue
+                            yield folder, files, index_row
+                            continue
+
+                if executor is not None:
+                    future = executor.submit(_list_folder, folder, depth, max_depth, want_mtimes)
+                    in_flight[future] = (folder, depth, folder_mtime, index_row)
+                else:
+                    finished = _finish(folder, depth, folder_mtime, index_row,
+                                       _list_folder(folder, depth, max_depth, want_mtimes))
+                    if finished: yield finished
+
+            if in_flight:
+                # short timeout so a cancel is noticed even while every thread waits on the share
+                done, _ = wait(in_flight, timeout=0.05, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder, depth, folder_mtime, index_row = in_flight.pop(future)
+                    finished = _finish(folder, depth, folder_mtime, index_row, future.result())
+                    if finished: yield finished
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# process pool walk (CPU-bound classification of very large trees)
+_scan_process_pool = None # shared between scans, worker start-up is expensive on Windows (spawn)
+_scan_process_pool_size = 0
+_scan_process_pool_lock = threading.Lock() # a retired scan and a new one may both reach the pool
+
+def _get_scan_process_pool(max_processes):
+    """Call with _scan_process_pool_lock held. A replaced pool finishes the partitions already submitted to it."""
+    global _scan_process_pool, _scan_process_pool_size
+    if _scan_process_pool is None or _scan_process_pool_size != max_processes:
+        if _scan_process_pool is not None:
+            _scan_process_pool.shutdown(wait=False)
+        _scan_process_pool = ProcessPoolExecutor(max_workers=max_processes)
+        _scan_process_pool_size = max_processes
+    return _scan_process_pool
+
+def shutdown_scan_process_pool():
+    """Stops the shared scan process pool (on quit); queued partitions of cancelled scans are dropped."""
+    global _scan_process_pool
+    with _scan_process_pool_lock:
+        if _scan_process_pool is not None:
+            _scan_process_pool.shutdown(wait=False, cancel_futures=True)
+            _scan_process_pool = None
+
+def _process_pool_walk(top, max_depth, stats, max_processes, scan_window, cancel_event=None):
+    """
+    Same output as _scandir_walk (without index rows), for very large trees: the watch
+    folder itself is listed here, each top-level subfolder is walked and classified in a
+    worker process. Only folders with files inside scan_window are yielded.
+    """
+    global _scan_process_pool
+    relevant_files, children, _, local_stats = _list_folder(top, 0, max_depth)
+    for key, value in local_stats.items(): _bump_stat(stats, key, value)
+    if relevant_files is None:
+        return
+    yield top, relevant_files, None
+
+    partitions = [child_path for child_path, _ in children]
+    # a few chunks per process: balances uneven subfolders without one task per case folder
+    chunk_count = min(len(partitions), max_processes * 4)
+    chunks = [partitions[i::chunk_count] for i in range(chunk_count)]
+
+    pending = set()
+    try:
+        with _scan_process_pool_lock:
+            pool = _get_scan_process_pool(max_processes)
+            for chunk in chunks:
+                pending.add(pool.submit(_scan_partitions, chunk, max_depth, scan_window))
+        _bump_stat(stats, "partitions", len(partitions))
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                print(f"[Scan] Process pool walk of '{top}' cancelled.")
+                return
+            done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+            for future in done:
+                records, partition_stats = future.result()
+                for key, value in partition_stats.items(): _bump_stat(stats, key, value)
+                for folder, file_records in records:
+                    yield folder, [FileRecord(os.path.join(folder, name), name, mtime, kind, size)
+                                   for name, mtime, kind, size in file_records], None
+    except BrokenProcessPool:
+        with _scan_process_pool_lock:
+            if _scan_process_pool is pool: _scan_process_pool = None # recreated by the next scan
+        raise
+    finally:
+        for future in pending: future.cancel()
+
+
+# persistent directory index for incremental scans
+class ScanIndex(object):
+    """
+    SQLite index of watch folder directories: mtime, whether the folder has subfolders,
+    its classified relevant files, and the parsed .dentalProject data (keyed by the
+    project file path + mtime it was parsed from).
+
+    Folder mtimes only change when entries are added, removed or renamed, so a folder
+    with an unchanged mtime keeps its file list; the files themselves are still stat'ed
+    on every scan, since one rewritten in place does not touch its folder's mtime.
+    """
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime REAL, "
+                          "has_subdirs INTEGER, files TEXT, parsed TEXT)")
+        self._pending = {} # folder -> row dict waiting to be written
+        self._seen = set()
+
+    def get(self, folder):
+        """Returns the stored row for folder as a dict, or None."""
+        if folder in self._pending:
+            return self._pending[folder]
+        try:
+            row = self.conn.execute("SELECT mtime, has_subdirs, files, parsed FROM dirs WHERE path = ?",
+                                    (folder,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"[Scan Index] Lookup failed for '{folder}': {e}")
+            return None
+        if not row:
+            return None
+        try:
+            files = [FileRecord(os.path.join(folder, name), name, mtime, kind, size)
+                     for name, mtime, kind, size in json.loads(row[2])]
+            return {"mtime": row[0], "has_subdirs": bool(row[1]), "files": files,
+                    "parsed": json.loads(row[3]) if row[3] else None}
+        except (TypeError, ValueError):
+            return None # corrupt or old-format row, treat as unknown
+
+    def mark_seen(self, folder):
+        self._seen.add(folder)
+
+    def update(self, folder, mtime, has_subdirs, files):
+        """Records a freshly listed folder. Keeps parsed data that still matches a project file."""
+        old_row = self.get(folder)
+        parsed = old_row.get("parsed") if old_row else None
+        if parsed and not any(f['path'] == parsed.get("path") and f['mtime'] == parsed.get("mtime") for f in files):
+            parsed = None
+        self._pending[folder] = {"mtime": mtime, "has_subdirs": has_subdirs, "files": files, "parsed": parsed}
+
+    def cached_parse(self, index_row, project_file_info):
+        """Returns parsed project data from index_row if it was parsed from the same file version."""
+        parsed = index_row.get("parsed") if index_row else None
+        if (parsed and parsed.get("path") == project_file_info['path']
+                and parsed.get("mtime") == project_file_info['mtime']):
+            return parsed.get("data")
+        return None
+
+    def store_parse(self, folder, project_file_info, parsed_data):
+        row = self.get(folder)
+        if row is None:
+            return
+        row = dict(row)
+        row["parsed"] = {"path": project_file_info['path'], "mtime": project_file_info['mtime'], "data": parsed_data}
+        self._pending[folder] = row
+
+    def close(self, prune_root=None):
+        """Writes pending rows and closes the database. With prune_root, rows under that
+        folder that were not visited in this scan (deleted folders) are dropped."""
+        try:
+            rows = [(folder, r["mtime"], int(r["has_subdirs"]), json.dumps([(f.name, f.mtime, f.kind, f.size) for f in r["files"]]),
+                     json.dumps(r["parsed"]) if r.get("parsed") else None)
+                    for folder, r in self._pending.items()]
+            self.conn.executemany("INSERT OR REPLACE INTO dirs (path, mtime, has_subdirs, files, parsed) "
+                                  "VALUES (?, ?, ?, ?, ?)", rows)
+            if prune_root:
+                prefix = prune_root.rstrip(os.sep) + os.sep
+                stale = [(p,) for (p,) in self.conn.execute("SELECT path FROM dirs")
+                         if (p == prune_root or p.startswith(prefix)) and p not in self._seen]
+                if stale:
+                    self.conn.executemany("DELETE FROM dirs WHERE path = ?", stale)
+                    print(f"[Scan Index] Dropped {len(stale)} removed folder(s) from index.")
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"[Scan Index] Error saving index '{self.db_path}': {e}")
+        finally:
+            self.conn.close()
+            self._pending = {}
+
+_NOT_PARSED = object() # _build_project_entry: parse the project file itself
+
+def _newest_project_file(relevant_files):
+    """The FileRecord of the most recently modified .dentalProject file, or None."""
+    project_files = [f for f in relevant_files if f.is_project]
+    return max(project_files, key=lambda f: f.mtime) if project_files else None
+
+def _parse_project_file(project_file_info, parse_cache=None):
+    if parse_cache is not None:
+        return parse_cache.parse(project_file_info.path, project_file_info.mtime, project_file_info.size)
+    return parse_dental_project(project_file_info.path)
+
+def _build_project_entry(folder_norm, relevant_files, latest_mtime_in_window, is_target_scan, index=None, index_row=None,
+                         parse_cache=None, parsed_data=_NOT_PARSED):
+    """
+    Turns the classified files (FileRecords) of one folder into a ProjectEntry for the table.
+    Returns None if a full scan folder has no .dentalProject file. parsed_data is the result
+    of _parse_project_file when the caller already parsed the newest project file.
+    """
+    project_file_info = _newest_project_file(relevant_files)
+
+    if project_file_info is None: # No .dentalProject file
+        if not is_target_scan: # Full scan and no .dentalProject file, skip this folder
+            return None
+        project_base_name = os.path.basename(folder_norm)
+        project_path = None
+        parsed_data = {"patient": project_base_name, "practice": "N/A", "work_type": "N/A", "teeth": "?", "filename": "N/A", "case_id": ""}
+    else: # Has .dentalProject file(s), use the most recent one
+        project_path = project_file_info['path']
+        project_base_name = project_file_info['base']
+        if parsed_data is _NOT_PARSED:
+            parsed_data = index.cached_parse(index_row, project_file_info) if index is not None else None
+            if parsed_data is None:
+                parsed_data = _parse_project_file(project_file_info, parse_cache)
+                if parsed_data and index is not None:
+                    index.store_parse(folder_norm, project_file_info, parsed_data)
+        if not parsed_data: # Parsing failed
+            parsed_data = {
+                "patient": project_base_name, "practice": "N/A",
+                "work_type": "Parse Error", "teeth": "?",
+                "filename": project_file_info['name'], "case_id": ""
+            }
+
+    # Gather associated files based on project_base_name or any relevant files if base_name is generic
+    info_file = next((f for f in relevant_files if f['is_info'] and f['base'] == project_base_name), None)
+    if not info_file: info_file = next((f for f in relevant_files if f['is_info']), None) # Fallback: any info file
+    info_path = info_file['path'] if info_file else None
+
+    cad_stl_paths = [f['path'] for f in relevant_files if f['is_cad_stl']] # Collect all CAD STLs
+    model_stl_paths = [f['path'] for f in relevant_files if f['is_model_stl']]
+    other_stl_paths = [f['path'] for f in relevant_files if f['is_other_stl']]
+
+    has_cad = bool(cad_stl_paths)
+    has_info = bool(info_path)
+    has_models = bool(model_stl_paths)
+
+    cam_icon = "✓" if has_cad else "✗"; info_icon = "✓" if has_info else "✗"; print_icon = "✓" if has_models else "✗"
+    file_status_display = f"{cam_icon}C {info_icon}I {print_icon}P"
+
+    # Determine the timestamp for sorting:
+    # If scanning a specific target folder, use the latest file mtime or the folder mtime.
+    # If full scan, use the latest file mtime inside the scan window.
+    timestamp_to_use = latest_mtime_in_window
+    if is_target_scan:
+        if relevant_files: # If files were found, use the newest one
+            timestamp_to_use = max(f['mtime'] for f in relevant_files)
+        else:
+            try: timestamp_to_use = os.path.getmtime(folder_norm)
+            except OSError: timestamp_to_use = time.time()
+
+    return ProjectEntry(
+        last_modified_timestamp=timestamp_to_use,
+        patient=parsed_data.get('patient', project_base_name),
+        work_type=parsed_data.get('work_type', 'N/A'),
+        teeth=parsed_data.get('teeth', '?'),
+        file_status=file_status_display, base_name=project_base_name,
+        project_path=project_path, info_path=info_path,
+        cad_stl_paths=cad_stl_paths, other_stl_paths=other_stl_paths,
+        model_stl_paths=model_stl_paths, parsed_data=parsed_data,
+        folder_path=folder_norm,
+        has_cad=has_cad, has_info=has_info, has_models=has_models,
+        status_icons=(cam_icon, info_icon, print_icon)
+    )
+
 
 # directory scanner function
-def scan_directory(watch_folder, target_folder=None, network_scan_depth=DEFAULT_NETWORK_SCAN_DEPTH):
+def iter_scan_directory(watch_folder, target_folder=None, network_scan_depth=DEFAULT_NETWORK_SCAN_DEPTH,
+                        scan_stats=None, index_path=None, max_workers=1, cancel_event=None,
+                        scan_window=None, prune_old_dirs=False, max_processes=0, parse_cache=None):
+    """
+    Generator form of scan_directory (same arguments): yields each project entry as soon
+    as its folder has been classified, in walk order rather than sorted by time.
+    Closing the generator early, or setting cancel_event, stops the walk. Folders already
+    listed are still written to the scan index, so the next scan can reuse them.
+    """
+    scan_root_is_watch_folder = target_folder is None or target_folder == "" # True if we are scanning the main watch_folder
+    window_start, window_end = scan_window if scan_window else scan_window_bounds(SCAN_WINDOW_TODAY)
+    index = None
+
+    # Determine the directories to scan
+    if not scan_root_is_watch_folder: # Scanning specific target folder(s) (e.g., from watcher trigger)
+        target_folders = [target_folder] if isinstance(target_folder, str) else list(target_folder)
+        folders_iter = []
+        for scan_root in target_folders:
+            scan_root_norm = os.path.normpath(scan_root)
+            try:
+                dir_entries, file_entries = _list_dir_entries(scan_root_norm, scan_stats)
+            except FileNotFoundError:
+                print(f"Scan warning: Target folder not found during scan: {scan_root}")
+                continue
+            except Exception as e:
+                print(f"Scan error: Error listing target folder {scan_root}: {e}")
+                continue
+            folders_iter.append((scan_root_norm, _classify_file_entries(file_entries, scan_stats), None))
+    else: # Full scan of watch_folder
+        if not watch_folder or not os.path.isdir(watch_folder):
+            print(f"Scan error: root path invalid '{watch_folder}'")
+            return
+        scan_root_norm = os.path.normpath(watch_folder)
+        if max_processes > 1:
+            if index_path:
+                print("[Scan] Process pool scan mode does not use the scan index.")
+            folders_iter = _process_pool_walk(scan_root_norm, network_scan_depth, scan_stats, max_processes,
+                                              (window_start, window_end), cancel_event)
+        else:
+            if index_path:
+                try:
+                    index = ScanIndex(index_path)
+                except sqlite3.Error as e:
+                    print(f"[Scan Index] Cannot open '{index_path}', scanning without index: {e}")
+                    index = None
+            folders_iter = _scandir_walk(scan_root_norm, network_scan_depth, scan_stats, index, max_workers,
+                                         cancel_event, window_start if prune_old_dirs else None)
+
+    def _cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+
+    # With max_workers > 1, project files of a full scan are parsed on their own thread pool
+    # while the walk goes on, so XML reads on the share overlap with directory listings.
+    # The scan index is only touched on this thread.
+    parse_pool = (ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ScanParser")
+                  if max_workers > 1 and scan_root_is_watch_folder else None)
+    parsing = {} # future -> (folder, relevant_files, latest_mtime_in_window, project_file_info)
+
+    def _parsed_entries(futures):
+        for future in futures:
+            folder, relevant_files, latest_mtime, project_file_info = parsing.pop(future)
+            parsed_data = future.result()
+            if parsed_data and index is not None:
+                index.store_parse(folder, project_file_info, parsed_data)
+            yield _build_project_entry(folder, relevant_files, latest_mtime, False, parsed_data=parsed_data)
+
+    scan_finished = False
+    try:
+        for current_folder_norm, relevant_files_in_folder, index_row in folders_iter:
+            if _cancelled():
+                break
+            folder_in_window = False
+            latest_mtime_in_window = 0.0
+            for file_info in relevant_files_in_folder:
+                file_mtime = file_info['mtime']
+                if window_start <= file_mtime < window_end:
+                    folder_in_window = True
+                    if file_mtime > latest_mtime_in_window: latest_mtime_in_window = file_mtime
+
+            # A folder is considered a project if it contains files modified inside the scan window,
+            # OR if we are scanning a specific target_folder (triggered by watcher).
+            if folder_in_window or not scan_root_is_watch_folder:
+                project_file_info = _newest_project_file(relevant_files_in_folder) if parse_pool else None
+                if project_file_info is not None and (index is None or index.cached_parse(index_row, project_file_info) is None):
+                    while len(parsing) >= max_workers * 4 and not _cancelled(): # don't run too far ahead of the parsers
+                        done, _ = wait(parsing, timeout=0.05, return_when=FIRST_COMPLETED)
+                        yield from _parsed_entries(done)
+                    future = parse_pool.submit(_parse_project_file, project_file_info, parse_cache)
+                    parsing[future] = (current_folder_norm, relevant_files_in_folder, latest_mtime_in_window, project_file_info)
+                else:
+                    project_entry = _build_project_entry(current_folder_norm, relevant_files_in_folder,
+                                                         latest_mtime_in_window, not scan_root_is_watch_folder,
+                                                         index, index_row, parse_cache)
+                    if project_entry:
+                        yield project_entry
+            if parsing:
+                yield from _parsed_entries([future for future in parsing if future.done()])
+        while parsing and not _cancelled():
+            done, _ = wait(parsing, timeout=0.05, return_when=FIRST_COMPLETED)
+            yield from _parsed_entries(done)
+        scan_finished = not _cancelled()
+    finally:
+        if hasattr(folders_iter, "close"): folders_iter.close() # stop walker threads promptly
+        if parse_pool is not None: parse_pool.shutdown(wait=False, cancel_futures=True)
+        if index is not None:
+            index.close(prune_root=scan_root_norm if scan_finished else None)
+
+def scan_directory(watch_folder, target_folder=None, network_scan_depth=DEFAULT_NETWORK_SCAN_DEPTH, scan_stats=None,
+                   index_path=None, max_workers=1, cancel_event=None, scan_window=None, prune_old_dirs=False,
+                   max_processes=0, parse_cache=None):
     """
     Scans the watch_folder (or a specific target_folder within it)
     for projects modified today OR (if target_folder is specified) projects
     containing files modified today. Uses updated file classification for CAM/Print relevance.
     Handles multiple *cad.stl files.
     Applies network_scan_depth if scanning the whole watch_folder and depth > 0.
+
+    target_folder may also be a list of folders, which are rescanned together (one listing
+    each, missing folders are skipped), e.g. every folder a batch of watcher events touched.
+    scan_window is a (start, end) epoch tuple from scan_window_bounds to use instead of
+    today. prune_old_dirs (with index_path) drops unchanged leaf folders whose files are all
+    older than the window start right in the walk; grouping folders are always listed.
+    max_processes > 1 walks and classifies each top-level subfolder of the watch folder in
+    its own worker process (CPU-bound trees with 100k+ files); the scan index is not used.
+
+    Each folder costs a single os.scandir listing; file types and mtimes come from
+    the DirEntry data instead of per-file isfile/getmtime calls. Pass a dict as
+    scan_stats to get the filesystem call counters (dirs_listed, entries_seen,
+    entry_stats, index_hits, ...) back.
+    If index_path is given, full scans use a persistent ScanIndex at that path so
+    unchanged project folders are neither listed nor re-parsed.
+    max_workers > 1 lists folders of a full scan in parallel on that many threads, and parses
+    project files on another pool of that size while the walk continues (latency-bound
+    network shares); the result is the same as a single-threaded scan.
+    cancel_event (threading.Event) is checked between folders; a cancelled scan returns
+    the projects found so far.
+    parse_cache (ProjectParseCache) skips parsing .dentalProject files whose path, mtime
+    and size are unchanged since they were last parsed.
+    Returns the project entries sorted newest first; see iter_scan_directory for the
+    streaming form.
     """
-    scan_root_is_watch_folder = not target_folder # True if we are scanning the main watch_folder
-    scan_root = watch_folder if scan_root_is_watch_folder else target_folder
+    found_projects = list(iter_scan_directory(watch_folder, target_folder, network_scan_depth,
+                                              scan_stats, index_path, max_workers, cancel_event,
+                                              scan_window, prune_old_dirs, max_processes, parse_cache))
+    found_projects.sort(key=lambda x: x['last_modified_timestamp'], reverse=True)
+    return found_projects
 
-    if not scan_root or not os.path.isdir(scan_root):
-        print(f"Scan error: root path invalid '{scan_root}'")
-        return []
 
+def diff_scan_results(previous, current):
+    """
+    Compares two scan result lists by folder_path.
+    Returns {"added": [entries], "changed": [entries], "removed": [folder_paths], "unchanged": count},
+    so a view can touch only the rows that differ.
+    """
+    previous_by_folder = {entry["folder_path"]: entry for entry in previous or ()}
+    diff = {"added": [], "changed": [], "removed": [], "unchanged": 0}
+    seen = set()
+    for entry in current or ():
+        folder = entry["folder_path"]
+        seen.add(folder)
+        old_entry = previous_by_folder.get(folder)
+        if old_entry is None: diff["added"].append(entry)
+        elif old_entry != entry: diff["changed"].append(entry)
+        else: diff["unchanged"] += 1
+    diff["removed"] = [folder for folder in previous_by_folder if folder not in seen]
+    return diff
+
+
+# scan result cache (stale-while-revalidate)
+class ScanResultCache(object):
+    """
+    In-memory cache of Watch Folder scan results, keyed by watch folder, scan depth and scan
+    window. A hit younger than ttl_secs can be shown straight away while a new scan revalidates
+    it; older entries are dropped on access. Rows of a cancelled scan can be stored as a partial
+    entry, which never replaces a complete one. The least recently used entry is evicted once
+    max_entries is exceeded. Thread-safe.
+    """
+    def __init__(self, ttl_secs=DEFAULT_SCAN_CACHE_TTL_SECS, max_entries=SCAN_CACHE_MAX_ENTRIES):
+        self.ttl_secs = ttl_secs
+        self.max_entries = max_entries
+        self.stats = {}
+        self._entries = OrderedDict() # key -> (stored_at, results, partial)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(watch_folder, network_scan_depth, window_key=(SCAN_WINDOW_TODAY, ""), prune_old_dirs=False):
+        """window_key identifies the window setting (e.g. (mode, value)), not its moving epoch bounds."""
+        return (os.path.normcase(os.path.normpath(watch_folder)), int(network_scan_depth),
+                tuple(window_key), bool(prune_old_dirs))
+
+    def get(self, key, now=None):
+        """Returns (results, age_secs, partial) for a usable entry, or None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                _bump_stat(self.stats, "misses")
+                return None
+            stored_at, results, partial = entry
+            age = now - stored_at
+            if self.ttl_secs <= 0 or age > self.ttl_secs:
+                del self._entries[key]
+                _bump_stat(self.stats, "expired")
+                return None
+            self._entries.move_to_end(key)
+            _bump_stat(self.stats, "hits")
+            return list(results), age, partial
+
+    def put(self, key, results, now=None, partial=False):
+        """partial=True marks the rows of a scan that was cancelled before it finished."""
+        if self.ttl_secs <= 0: return
+        now = time.time() if now is None else now
+        with self._lock:
+            existing = self._entries.get(key)
+            if partial and existing is not None and not existing[2] and now - existing[0] <= self.ttl_secs:
+                _bump_stat(self.stats, "partial_skipped") # the complete entry is still good
+                return
+            self._entries[key] = (now, list(results), bool(partial))
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(1, self.max_entries):
+                self._entries.popitem(last=False)
+                _bump_stat(self.stats, "evictions")
+
+    def invalidate(self, key=None):
+        """Drops one entry, or everything when key is None."""
+        with self._lock:
+            if key is None: self._entries.clear()
+            else: self._entries.pop(key, None)
+
+
+# target folder archiving
+def archive_old_files(target_folder, self_writes=None):
+    """
+    Moves files modified *before* today from target_folder root into YYYY/MM/DD subfolders.
+    The moves are registered with self_writes (SelfWriteSuppressor), if given.
+    Returns {"moved": n, "errors": n}.
+    """
+    stats = {"moved": 0, "errors": 0}
     today_date = datetime.date.today()
-    found_projects = []
-    processed_folders = set() # Used to avoid re-processing if symlinks or weird structures exist
-
-    # Determine the initial list of directories to scan
-    if not scan_root_is_watch_folder: # Scanning a specific target_folder (e.g., from watcher trigger)
+    files_to_archive = []
+    try:
+        for filename in os.listdir(target_folder):
+            source_path = os.path.join(target_folder, filename)
+            if not os.path.isfile(source_path):
+                continue
+            try:
+                mtime_ts = os.path.getmtime(source_path)
+                mod_date = datetime.date.fromtimestamp(mtime_ts)
+                if mod_date < today_date:
+                    archive_subfolder_rel_path = mod_date.strftime('%Y' + os.sep + '%m' + os.sep + '%d')
+                    archive_subfolder_abs_path = os.path.join(target_folder, archive_subfolder_rel_path)
+                    files_to_archive.append({
+                        'name': filename,
+                        'path': source_path,
+                        'archive_dir': archive_subfolder_abs_path,
+                        'mod_date': mod_date # Store for logging if needed
+                        })
+            except FileNotFoundError:
+                 continue # File gone, skip
+            except Exception as e_stat:
+                 stats["errors"] += 1
+                 print(f"Error stating file for archive '{source_path}': {e_stat}")
+    except Exception as e_list:
+         stats["errors"] += 1
+         print(f"Error listing directory for archive '{target_folder}': {e_list}")
+         return stats # Cannot proceed if listing failed
+
+    if not files_to_archive:
+         return stats # Nothing to do
+
+    print(f"Archiving {len(files_to_archive)} file(s) in {shorten_path(target_folder)}...")
+    for file_info in files_to_archive:
+        filename = file_info['name']; source_path = file_info['path']
+        archive_dir = file_info['archive_dir']; final_dest_path = os.path.join(archive_dir, filename)
         try:
-            items_list = os.listdir(scan_root)
-            # Structure for os.walk: (root, dirnames, filenames)
-            root_dirs_iter = [(scan_root, [d for d in items_list if os.path.isdir(os.path.join(scan_root, d))],
-                                         [f for f in items_list if os.path.isfile(os.path.join(scan_root, f))])]
+            os.makedirs(archive_dir, exist_ok=True)
+            print(f"  Moving '{filename}' -> '{os.path.relpath(archive_dir, target_folder)}{os.sep}'")
+            with _writing(self_writes, (source_path, final_dest_path)):
+                shutil.move(source_path, final_dest_path) # Use shutil.move for cross-filesystem compatibility
+            stats["moved"] += 1
         except FileNotFoundError:
-            print(f"Scan warning: Target folder not found during scan: {scan_root}")
-            return []
-        except Exception as e:
-            print(f"Scan error: Error listing target folder {scan_root}: {e}")
-            return []
-    else: # Full scan of watch_folder
-        # os.walk is a generator, which is good.
-        # We need to normalize watch_folder path for correct depth calculation.
-        normalized_watch_folder = os.path.normpath(watch_folder)
-        root_dirs_iter = os.walk(normalized_watch_folder, topdown=True)
-
-
-    for current_root, dirs, files in root_dirs_iter:
-        current_folder_norm = os.path.normpath(current_root)
-
-        if scan_root_is_watch_folder: # Apply depth limiting and archive skipping only for full watch_folder scans
-            # Depth calculation
-            # Ensure current_root starts with normalized_watch_folder for correct relative path
-            if current_folder_norm.startswith(normalized_watch_folder):
-                relative_path = current_folder_norm[len(normalized_watch_folder):].lstrip(os.sep)
-                depth = relative_path.count(os.sep) if relative_path else 0
-            else: # Should not happen if os.walk is used correctly with watch_folder
-                depth = 0 
-
-            if network_scan_depth > 0 and depth >= network_scan_depth:
-                print(f"[Scan Depth] Reached depth limit ({network_scan_depth}) at '{current_folder_norm}'. Pruning dirs: {dirs}")
-                dirs[:] = [] # Don't go deeper
-
-            # Archive path skipping logic (remains unchanged)
-            is_likely_archive_path = False
-            basename = os.path.basename(current_folder_norm)
-            parent_dir = os.path.dirname(current_folder_norm)
-            parent_basename = os.path.basename(parent_dir)
-            grandparent_dir = os.path.dirname(parent_dir)
-            grandparent_basename = os.path.basename(grandparent_dir)
-
-            if basename.isdigit() and len(basename) == 2: # DD
-                if parent_basename.isdigit() and len(parent_basename) == 2: # MM
-                    if grandparent_basename.isdigit() and len(grandparent_basename) == 4: # YYYY
-                        is_likely_archive_path = True
-            elif parent_basename.isdigit() and len(parent_basename) == 4: # YYYY
-                 if basename.isdigit() and len(basename) == 2: # MM (less common structure, but possible)
-                    # This could be YYYY/MM, check if dirs contains DD
-                    # For simplicity, we'll stick to YYYY/MM/DD as the primary archive marker
-                    pass
+             print(f"  Skipping move, source file gone: {filename}")
+             pass # Source file disappeared before move
+        except PermissionError as pe:
+             stats["errors"] += 1
+             print(f"  Permission error moving '{filename}' to archive: {pe}")
+        except Exception as e_move:
+             stats["errors"] += 1
+             print(f"  Error moving file '{filename}' to archive: {e_move}")
 
+    return stats
 
-            if is_likely_archive_path:
-                print(f"[Scan Depth] Skipping likely archive path: {current_folder_norm}")
-                dirs[:] = [] # Prune archive subfolders
-                continue # Don't process files in this folder either, go to next item from os.walk
 
-            if current_folder_norm in processed_folders: # Avoid reprocessing (e.g. symlink loops)
-                print(f"[Scan Depth] Already processed, skipping: {current_folder_norm}")
-                dirs[:] = [] # Don't descend again
-                continue
-            processed_folders.add(current_folder_norm)
+# files written by the application itself
+class SelfWriteSuppressor(object):
+    """
+    Paths the application is writing itself (copies to the target folders, archive moves), so
+    the file watcher can keep running and ignore the events these writes cause. A path is
+    suppressed while its write runs and for linger_secs afterwards (late modify events);
+    expired paths are dropped as they are looked up or when a write ends. Thread-safe.
+    """
+    def __init__(self, linger_secs=SELF_WRITE_SUPPRESS_SECS):
+        self.linger_secs = linger_secs
+        self.stats = {}
+        self._writing = {} # path key -> number of writes in progress
+        self._expires = {} # path key -> time the suppression ends
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def __len__(self):
+        return len(self._writing) + len(self._expires)
+
+    @contextmanager
+    def writing(self, paths):
+        """Suppresses events for paths while the with-block writes them, and linger_secs after."""
+        keys = [self._key(path) for path in paths]
+        with self._lock:
+            for key in keys:
+                self._writing[key] = self._writing.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            now = time.time()
+            with self._lock:
+                for key in keys:
+                    if self._writing[key] > 1: self._writing[key] -= 1
+                    else: del self._writing[key]
+                    self._expires[key] = now + self.linger_secs
+                for key in [key for key, expires in self._expires.items() if expires <= now]:
+                    del self._expires[key]
+
+    def is_suppressed(self, path, now=None):
+        """True if path is being written by us, or was within the last linger_secs."""
+        key = self._key(path)
+        now = time.time() if now is None else now
+        with self._lock:
+            if key in self._writing:
+                _bump_stat(self.stats, "suppressed")
+                return True
+            expires = self._expires.get(key)
+            if expires is None:
+                return False
+            if expires <= now:
+                del self._expires[key]
+                return False
+            _bump_stat(self.stats, "suppressed")
+            return True
+
+@contextmanager
+def _writing(self_writes, paths):
+    """self_writes.writing(paths), or nothing if self_writes is None."""
+    if self_writes is None:
+        yield
+    else:
+        with self_writes.writing(paths):
+            yield
+
+
+# unattended file copying (watcher auto-send)
+def copy_file_with_progress(source_path, dest_path, progress=None, cancel_event=None, chunk_size=COPY_CHUNK_BYTES):
+    """
+    Copies a file like shutil.copy2, in chunks: progress(bytes_done, file_size) is called after
+    every chunk (and once for an empty file), cancel_event stops the copy between chunks. The
+    data goes to dest_path + COPY_TEMP_SUFFIX and is renamed over dest_path once complete, so
+    CAM/print software never picks up a half-written file. Returns False if cancelled (the
+    partial file is removed), raises OSError on failure.
+    """
+    temp_path = dest_path + COPY_TEMP_SUFFIX
+    completed = False
+    try:
+        with open(source_path, "rb") as source, open(temp_path, "wb") as dest:
+            source_stat = os.fstat(source.fileno()) # from the open handle, no extra round trip on a share
+            file_size = source_stat.st_size
+            if hasattr(os, "fchmod"): os.fchmod(dest.fileno(), stat.S_IMODE(source_stat.st_mode))
+            buffer = bytearray(min(chunk_size, max(file_size, 1)))
+            view = memoryview(buffer)
+            bytes_done = 0
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                read = source.readinto(buffer)
+                if read:
+                    dest.write(view[:read])
+                    bytes_done += read
+                if progress is not None and (read or bytes_done == 0):
+                    progress(bytes_done, max(file_size, bytes_done))
+                if not read:
+                    break
+        # modification time, as copy2 (the target folder archiver relies on it)
+        os.utime(temp_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        os.replace(temp_path, dest_path)
+        completed = True
+        return True
+    finally:
+        if not completed:
+            try: os.remove(temp_path)
+            except OSError: pass
 
-        folder_modified_today = False
-        latest_mtime_today = 0.0
-        relevant_files_in_folder = []
+def copy_files_to_target(source_paths, destination_folder, duplicate_action="overwrite", operation_stats=None,
+                         cancel_event=None, self_writes=None, progress=None):
+    """
+    Copies files into destination_folder without asking: a file that already exists there is
+    overwritten or skipped according to duplicate_action ('overwrite' or 'skip'). Stops at the
+    first error, or when cancel_event is set (also in the middle of a file). Counts go into
+    operation_stats ({"copied", "skipped", "errors", "cancelled"}), which is returned. The
+    copies are registered with self_writes (SelfWriteSuppressor), if given. progress, if
+    given, is called as progress(source_path, bytes_done, file_size) while a file is copied.
+    """
+    if operation_stats is None:
+        operation_stats = {"copied": 0, "skipped": 0, "errors": [], "cancelled": False}
+    for source_path in source_paths:
+        if cancel_event is not None and cancel_event.is_set():
+            operation_stats["cancelled"] = True
+            break
+        filename = os.path.basename(source_path)
+        final_dest_path = os.path.join(destination_folder, filename)
+        if duplicate_action == "skip" and os.path.exists(final_dest_path):
+            print(f"Skipping duplicate file (Auto): {filename}")
+            operation_stats["skipped"] = operation_stats.get("skipped", 0) + 1
+            continue
+        file_progress = None if progress is None else partial(progress, source_path)
+        try:
+            with _writing(self_writes, (final_dest_path, final_dest_path + COPY_TEMP_SUFFIX)):
+                copied = copy_file_with_progress(source_path, final_dest_path, file_progress, cancel_event)
+        except FileNotFoundError as e:
+            error = f"Source file not found: {filename}" if e.filename == source_path else str(e)
+            operation_stats["errors"].append({"file": filename, "error": error})
+            print(f"Copy Error: {error}")
+            break
+        except Exception as e:
+            operation_stats["errors"].append({"file": filename, "error": str(e)})
+            print(f"Copy Error: Failed copying file '{filename}': {e}")
+            break
+        if not copied:
+            print(f"Copy cancelled: {filename}")
+            operation_stats["cancelled"] = True
+            break
+        operation_stats["copied"] = operation_stats.get("copied", 0) + 1
+    return operation_stats
+
+
+# background file transfers
+class CopyJob(object):
+    """
+    One send operation for the CopyEngine: groups of files, one per project, each with the
+    operation_stats dict its results are counted in, copied into destination_folder with
+    copy_files_to_target. A group stops at its first error; cancel() stops the whole job.
+    With archive=True, older files in the destination are first moved into YYYY/MM/DD
+    folders (archive_old_files), once per folder and day. Progress fields are written by
+    the engine's worker thread and may be read from any thread.
+    """
+    QUEUED, RUNNING, DONE = "queued", "running", "done"
+    _ids = itertools.count(1)
+
+    def __init__(self, name, destination_folder, groups, duplicate_action="overwrite", archive=False):
+        self.job_id = next(CopyJob._ids)
+        self.name = name
+        self.destination_folder = destination_folder
+        self.groups = groups # [(operation_stats, [source paths])]
+        self.duplicate_action = duplicate_action
+        self.archive = archive
+        self.archive_stats = None # set if the job archived the destination
+        self.state = CopyJob.QUEUED
+        self.files_total = sum(len(source_paths) for _, source_paths in groups)
+        self.files_done = 0
+        self.bytes_done = 0
+        self.current_file = ""
+        self.file_bytes_done = 0
+        self.file_size = 0
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self._done_event = threading.Event()
+        self._completed_bytes = 0
+        self._completed_path = None
+        self._last_progress = 0.0
+
+    @property
+    def results(self):
+        """The operation_stats dicts of the groups (show_copy_summary format)."""
+        return [operation_stats for operation_stats, _ in self.groups]
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set() or any(stats.get("cancelled") for stats in self.results)
+
+    @property
+    def succeeded(self):
+        return self.state == CopyJob.DONE and not self.cancelled and not any(stats.get("errors") for stats in self.results)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def wait(self, timeout=None):
+        """Blocks until the job is done (or timeout seconds); True if done."""
+        return self._done_event.wait(timeout)
+
+    def percent(self):
+        """Files done plus the part of the current file (sizes are not stat'ed up front)."""
+        if self.state == CopyJob.DONE:
+            return 100
+        if not self.files_total:
+            return 0
+        file_part = self.file_bytes_done / self.file_size if self.file_size and self.file_bytes_done < self.file_size else 0
+        return min(100, int((self.files_done + file_part) * 100 / self.files_total))
+
+    def mb_per_s(self, now=None):
+        """Average throughput since the job started."""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at or (time.time() if now is None else now)
+        return self.bytes_done / (1024 * 1024) / max(end - self.started_at, 1e-3)
+
+class CopyEngine(object):
+    """
+    Runs CopyJobs on worker threads, in submission order, so sending never blocks the caller.
+    Jobs for the same destination folder run one at a time (an archive pass never moves files
+    another job is copying in); jobs for different folders run in parallel. on_started,
+    on_progress (throttled to progress_interval) and on_finished are called with the job on
+    the worker thread.
+    """
+    def __init__(self, workers=COPY_WORKERS, self_writes=None, on_started=None, on_progress=None, on_finished=None,
+                 progress_interval=COPY_PROGRESS_INTERVAL_SECS):
+        self.workers = workers
+        self.self_writes = self_writes
+        self.on_started = on_started
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.progress_interval = progress_interval
+        self.stats = {}
+        self._pending = []  # queued jobs, oldest first
+        self._running = {}  # destination key -> running job
+        self._archived = {} # destination key -> date archived without errors
+        self._threads = []
+        self._stopping = False
+        self._condition = threading.Condition()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._pending) + len(self._running)
+
+    def jobs(self):
+        """Running jobs, then queued ones."""
+        with self._condition:
+            return list(self._running.values()) + list(self._pending)
+
+    def submit(self, job):
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError("CopyEngine is shut down")
+            self._pending.append(job)
+            _bump_stat(self.stats, "jobs")
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, daemon=True, name=f"CopyEngine-{len(self._threads) + 1}")
+                self._threads.append(thread)
+                thread.start()
+            self._condition.notify()
+        return job
+
+    def cancel(self, job_id=None):
+        """Cancels one job (or all of them); a running copy stops after its current chunk."""
+        for job in self.jobs():
+            if job_id is None or job.job_id == job_id:
+                job.cancel()
+
+    def shutdown(self, timeout=5.0):
+        """Cancels all jobs and waits up to timeout seconds for the running ones to stop."""
+        with self._condition:
+            self._stopping = True
+            abandoned, self._pending = self._pending, []
+            self._condition.notify_all()
+        for job in abandoned:
+            job.cancel()
+            for operation_stats in job.results: operation_stats["cancelled"] = True
+            self._finish(job)
+        self.cancel()
+        deadline = time.time() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.time()))
+
+    @staticmethod
+    def _key(folder):
+        return os.path.normcase(os.path.abspath(folder))
+
+    def _next_job(self):
+        for index, job in enumerate(self._pending):
+            if self._key(job.destination_folder) not in self._running:
+                return self._pending.pop(index)
+        return None
 
-        for filename in files:
-            filepath = os.path.join(current_folder_norm, filename) # Use normalized current_folder_norm
+    def _work(self):
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None:
+                    if self._stopping:
+                        return
+                    self._condition.wait()
+                    job = self._next_job()
+                key = self._key(job.destination_folder)
+                self._running[key] = job
             try:
-                filename_lower = filename.lower()
-                ext_lower = os.path.splitext(filename_lower)[1]
-                if ext_lower not in [".dentalproject", ".constructioninfo", ".stl"]:
+                self._run(job, key)
+            except Exception as e:
+                print(f"[Copy Engine] Job '{job.name}' failed: {e}")
+                if job.groups: job.groups[0][0].setdefault("errors", []).append({"file": "Process Error", "error": str(e)})
+            finally:
+                with self._condition:
+                    self._running.pop(key, None)
+                    self._condition.notify_all()
+                self._finish(job)
+
+    def _run(self, job, key):
+        job.state = CopyJob.RUNNING
+        job.started_at = time.time()
+        print(f"[Copy Engine] Starting '{job.name}': {job.files_total} file(s) -> {job.destination_folder}")
+        self._notify(self.on_started, job)
+
+        today_str = datetime.date.today().isoformat()
+        if job.archive and not job.cancel_event.is_set() and self._archived.get(key) != today_str:
+            job.archive_stats = archive_old_files(job.destination_folder, self.self_writes)
+            if job.archive_stats.get("errors", 0) == 0:
+                self._archived[key] = today_str
+
+        for operation_stats, source_paths in job.groups:
+            if job.cancel_event.is_set():
+                operation_stats["cancelled"] = True
+                continue
+            copy_files_to_target(source_paths, job.destination_folder, job.duplicate_action, operation_stats,
+                                 job.cancel_event, self.self_writes, partial(self._file_progress, job))
+
+    def _file_progress(self, job, source_path, bytes_done, file_size):
+        if source_path == job._completed_path:
+            return # the file grew while it was copied
+        job.current_file = os.path.basename(source_path)
+        job.file_bytes_done, job.file_size = bytes_done, file_size
+        job.bytes_done = job._completed_bytes + bytes_done
+        _bump_stat(self.stats, "chunks")
+        file_complete = bytes_done >= file_size
+        if file_complete:
+            job._completed_path = source_path
+            job._completed_bytes += file_size
+            job.files_done += 1
+        now = time.time()
+        if file_complete or now - job._last_progress >= self.progress_interval:
+            job._last_progress = now
+            self._notify(self.on_progress, job)
+
+    def _finish(self, job):
+        job.state = CopyJob.DONE
+        job.finished_at = time.time()
+        if job.started_at is not None:
+            _bump_stat(self.stats, "bytes", job.bytes_done)
+            print(f"[Copy Engine] Finished '{job.name}': {job.files_done}/{job.files_total} file(s), "
+                  f"{job.mb_per_s():.1f} MB/s{' (cancelled)' if job.cancelled else ''}")
+        job._done_event.set()
+        self._notify(self.on_finished, job)
+
+    @staticmethod
+    def _notify(callback, job):
+        if callback is None:
+            return
+        try:
+            callback(job)
+        except Exception as e:
+            print(f"[Copy Engine] Listener error: {e}")
+
+
+# bounded debounce bookkeeping
+class DebounceMap(object):
+    """
+    Last-seen time per key (file path, project folder) for debouncing in a process that runs
+    in the tray for weeks. Keys are kept in the order they were last touched, so entries
+    older than ttl_secs are dropped from the front without scanning, and the oldest go
+    first once max_entries is reached. Checks and updates are O(1) (amortized). Thread-safe.
+    """
+    def __init__(self, ttl_secs, max_entries=DEBOUNCE_MAX_ENTRIES):
+        self.ttl_secs = ttl_secs
+        self.max_entries = max_entries
+        self.stats = {}
+        self._times = OrderedDict() # key -> last touched, least recently touched first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._times)
+
+    def _expire(self, now):
+        while self._times:
+            key, touched = next(iter(self._times.items()))
+            if now - touched < self.ttl_secs:
+                break
+            del self._times[key]
+            _bump_stat(self.stats, "expired")
+
+    def age(self, key, now=None):
+        """Seconds since key was last touched, or None if it is unknown (or expired)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._expire(now)
+            touched = self._times.get(key)
+            return None if touched is None else now - touched
+
+    def touch(self, key, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._times[key] = now
+            self._times.move_to_end(key)
+            self._expire(now)
+            while len(self._times) > max(1, self.max_entries):
+                self._times.popitem(last=False)
+                _bump_stat(self.stats, "evicted")
+
+    def debounce(self, key, interval_secs, now=None):
+        """True (and touches key) if key was not touched in the last interval_secs, else False."""
+        now = time.time() if now is None else now
+        age = self.age(key, now)
+        if age is not None and age < interval_secs:
+            _bump_stat(self.stats, "debounced")
+            return False
+        self.touch(key, now)
+        return True
+
+    def memory_bytes(self):
+        """Approximate memory held by the map (container and keys), for diagnostics."""
+        with self._lock:
+            return sys.getsizeof(self._times) + sum(sys.getsizeof(key) + 24 for key in self._times) # + float value
+
+    def clear(self):
+        with self._lock:
+            self._times.clear()
+
+
+# watcher event coalescing
+class WatcherEventQueue(object):
+    """
+    Groups watcher events by project folder. A folder becomes due once no event arrived for
+    it for quiet_secs (or max_wait_secs after its first event, if the events never stop),
+    so a CAD save that writes eight STLs gives one rescan of the folder instead of eight.
+    Thread-safe.
+    """
+    def __init__(self, quiet_secs=DEFAULT_WATCHER_QUIET_SECS, max_wait_secs=WATCHER_MAX_COALESCE_SECS):
+        self.quiet_secs = quiet_secs
+        self.max_wait_secs = max_wait_secs
+        self.stats = {}
+        self._pending = OrderedDict() # folder -> [first_event_time, last_event_time, event_count], oldest first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, folder, now=None):
+        """Records an event for folder (a normalized project folder path)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            _bump_stat(self.stats, "events")
+            pending = self._pending.get(folder)
+            if pending is None:
+                self._pending[folder] = [now, now, 1]
+            else:
+                pending[1] = now
+                pending[2] += 1
+                _bump_stat(self.stats, "coalesced")
+
+    def _due_at(self, pending):
+        first_event, last_event, _ = pending
+        return min(last_event + self.quiet_secs, first_event + max(self.max_wait_secs, self.quiet_secs))
+
+    def pop_due(self, now=None):
+        """Removes and returns the folders that are due, oldest first, as {folder: event_count}."""
+        now = time.time() if now is None else now
+        with self._lock:
+            due = OrderedDict((folder, pending[2]) for folder, pending in self._pending.items()
+                              if self._due_at(pending) <= now)
+            for folder in due:
+                del self._pending[folder]
+            if due:
+                _bump_stat(self.stats, "batches")
+                _bump_stat(self.stats, "folders_flushed", len(due))
+            return due
+
+    def seconds_until_due(self, now=None):
+        """Time until the next folder is due (0 if one already is), or None when nothing is queued."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if not self._pending:
+                return None
+            return max(0.0, min(self._due_at(pending) for pending in self._pending.values()) - now)
+
+    def discard(self, folder):
+        with self._lock:
+            self._pending.pop(folder, None)
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+
+
+# write-completion detection (auto-send)
+def _file_signature(path):
+    """(size, mtime) of path, or None if it cannot be read."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime)
+
+class FileStabilityTracker(object):
+    """
+    Holds project folders back until the files to be auto-sent have stopped changing.
+    Each tracked file's (size, mtime) is polled, first after min_poll_secs and then at a
+    doubling interval (up to max_poll_secs) while nothing changes; any change restarts
+    the wait. A folder is released once all of its files kept the same signature for
+    stable_secs. Thread-safe.
+    """
+    def __init__(self, stable_secs=DEFAULT_AUTO_SEND_STABLE_SECS, min_poll_secs=STABILITY_POLL_MIN_SECS,
+                 max_poll_secs=STABILITY_POLL_MAX_SECS):
+        self.stable_secs = stable_secs
+        self.min_poll_secs = min_poll_secs
+        self.max_poll_secs = max_poll_secs
+        self.stats = {}
+        self._tracked = {} # folder -> [signatures, stable_since, poll_interval, next_poll]
+        self._released = {} # folder -> signatures the folder was released with
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tracked)
+
+    def check(self, folder, paths, now=None):
+        """
+        True if the files in paths can be sent now: stability checks are off, or the folder
+        was released by poll() and its files still have the signatures it was released with.
+        Otherwise starts (or keeps) tracking the folder and returns False.
+        """
+        if self.stable_secs <= 0:
+            return True
+        now = time.time() if now is None else now
+        signatures = {path: _file_signature(path) for path in paths}
+        with self._lock:
+            if self._released.pop(folder, None) == signatures:
+                _bump_stat(self.stats, "released")
+                return True
+            tracked = self._tracked.get(folder)
+            if tracked is None or tracked[0] != signatures:
+                self._tracked[folder] = [signatures, now, self.min_poll_secs, now + self.min_poll_secs]
+                _bump_stat(self.stats, "held" if tracked is None else "changed")
+            return False
+
+    def poll(self, now=None):
+        """Re-checks the folders whose poll is due; returns the folders that are now stable."""
+        now = time.time() if now is None else now
+        with self._lock:
+            due = [(folder, list(tracked[0])) for folder, tracked in self._tracked.items() if tracked[3] <= now]
+        if not due:
+            return []
+        current = {folder: {path: _file_signature(path) for path in paths} for folder, paths in due} # stat outside the lock
+        stable_folders = []
+        with self._lock:
+            for folder, signatures in current.items():
+                tracked = self._tracked.get(folder)
+                if tracked is None: # discarded meanwhile
+                    continue
+                _bump_stat(self.stats, "polls")
+                if signatures != tracked[0]:
+                    tracked[0], tracked[1], tracked[2] = signatures, now, self.min_poll_secs
+                    _bump_stat(self.stats, "changed")
+                elif now - tracked[1] >= self.stable_secs:
+                    del self._tracked[folder]
+                    self._released[folder] = signatures
+                    stable_folders.append(folder)
                     continue
+                else:
+                    tracked[2] = min(tracked[2] * 2, self.max_poll_secs)
+                # don't sleep past the moment the files would count as stable
+                tracked[3] = now + max(0.0, min(tracked[2], tracked[1] + self.stable_secs - now))
+        return stable_folders
+
+    def seconds_until_poll(self, now=None):
+        """Time until the next folder needs a poll (0 if one already does), or None when nothing is held."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if not self._tracked:
+                return None
+            return max(0.0, min(tracked[3] for tracked in self._tracked.values()) - now)
+
+    def discard(self, folder):
+        with self._lock:
+            self._tracked.pop(folder, None)
+            self._released.pop(folder, None)
+
+    def clear(self):
+        with self._lock:
+            self._tracked.clear()
+            self._released.clear()
+
+
+# files the watcher reacts to
+_TEMP_FILE_RE = re.compile("|".join(fnmatch.translate(pattern) for pattern in WATCHER_TEMP_FILE_PATTERNS))
+
+def is_temp_file(filename):
+    """
+    True for temporary save files (WATCHER_TEMP_FILE_PATTERNS), e.g. '~model.stl' or 'model.tmp.stl'
+    before the rename to 'model.stl'. is_watched_file only asks for names with a watched extension.
+    """
+    return _TEMP_FILE_RE.match(filename.lower()) is not None
 
-                if not os.path.isfile(filepath): continue # Should not happen with os.walk files list
-
-                mtime_ts = os.path.getmtime(filepath)
-                base_name_lower = os.path.splitext(filename_lower)[0]
-
-                is_project = ext_lower == ".dentalproject"
-                is_info = ext_lower == ".constructioninfo"
-                is_stl = ext_lower == ".stl"
-
-                is_cad_stl = False
-                is_model_stl = False
-                is_other_stl = False
-
-                if is_stl:
-                    if filename_lower.endswith("cad.stl"):
-                        is_cad_stl = True
-                    elif "model" in base_name_lower: # Covers *model*.stl, *models*.stl etc.
-                        is_model_stl = True
-                    else:
-                        is_other_stl = True
-
-                mtime_date = datetime.date.fromtimestamp(mtime_ts)
-                if mtime_date == today_date:
-                    folder_modified_today = True
-                    latest_mtime_today = max(latest_mtime_today, mtime_ts)
-
-                file_info = {
-                    'path': filepath, 'name': filename, 'base': os.path.splitext(filename)[0],
-                    'is_project': is_project, 'is_info': is_info, 'is_stl': is_stl,
-                    'is_cad_stl': is_cad_stl, 'is_model_stl': is_model_stl, 'is_other_stl': is_other_stl,
-                    'mtime': mtime_ts
-                }
-                relevant_files_in_folder.append(file_info)
-            except FileNotFoundError: # File might disappear during scan
-                continue
-            except Exception as e_file: # Catch other errors reading file properties
-                print(f"Error processing file '{filepath}': {e_file}")
-                continue
+def is_watched_file(filename):
+    """
+    True for the files whose changes trigger notifications/auto-send: .constructionInfo, *cad.stl, *model*.stl.
+    Temporary save files are not watched; the rename to the final name is.
+    """
+    filename_lower = filename.lower()
+    base_name_lower, ext_lower = os.path.splitext(filename_lower)
 
-        # After processing all files in current_root, decide if this folder is a project
-        # A folder is considered a project if it contains files modified today,
-        # OR if we are scanning a specific target_folder (triggered by watcher).
-        if folder_modified_today or not scan_root_is_watch_folder:
-            project_files = sorted([f for f in relevant_files_in_folder if f['is_project']], key=lambda x: x['mtime'], reverse=True)
-            
-            if not project_files: # No .dentalProject file
-                if not scan_root_is_watch_folder: # If it's a specific target_folder scan (watcher)
-                    project_base_name = os.path.basename(current_folder_norm)
-                    project_path = None
-                    parsed_data = {"patient": project_base_name, "practice": "N/A", "work_type": "N/A", "teeth": "?", "filename": "N/A", "case_id": ""}
-                else: # Full scan and no .dentalProject file, skip this folder
-                    continue 
-            else: # Has .dentalProject file(s)
-                project_file_info = project_files[0] # Use the most recent one
-                project_path = project_file_info['path']
-                project_base_name = project_file_info['base']
-                parsed_data = parse_dental_project(project_path)
-                if not parsed_data: # Parsing failed
-                    parsed_data = {
-                        "patient": project_base_name, "practice": "N/A",
-                        "work_type": "Parse Error", "teeth": "?",
-                        "filename": project_file_info['name'], "case_id": ""
-                    }
-
-            # Gather associated files based on project_base_name or any relevant files if base_name is generic
-            info_file = next((f for f in relevant_files_in_folder if f['is_info'] and f['base'] == project_base_name), None)
-            if not info_file: info_file = next((f for f in relevant_files_in_folder if f['is_info']), None) # Fallback: any info file
-            info_path = info_file['path'] if info_file else None
-
-            cad_stl_files = [f for f in relevant_files_in_folder if f['is_cad_stl']]
-            cad_stl_paths = [f['path'] for f in cad_stl_files] # Collect all CAD STLs
-
-            model_stl_paths = [f['path'] for f in relevant_files_in_folder if f['is_model_stl']]
-            other_stl_paths = [f['path'] for f in relevant_files_in_folder if f['is_other_stl']]
-            
-            has_cad = bool(cad_stl_paths)
-            has_info = bool(info_path)
-            has_models = bool(model_stl_paths)
-
-            cam_icon = "✓" if has_cad else "✗"; info_icon = "✓" if has_info else "✗"; print_icon = "✓" if has_models else "✗"
-            file_status_display = f"{cam_icon}C {info_icon}I {print_icon}P"
-
-            # Determine the timestamp for sorting:
-            # If scanning a specific target folder, use its mtime or latest file mtime.
-            # If full scan, use the latest file mtime from today.
-            timestamp_to_use = latest_mtime_today
-            if not scan_root_is_watch_folder: # target_folder scan
-                 timestamp_to_use = os.path.getmtime(current_folder_norm) if os.path.exists(current_folder_norm) else time.time()
-                 if relevant_files_in_folder: # If files were found, use the newest one
-                     timestamp_to_use = max(f['mtime'] for f in relevant_files_in_folder)
-            
-            project_entry = {
-                "last_modified_timestamp": timestamp_to_use,
-                "patient": parsed_data.get('patient', project_base_name),
-                "work_type": parsed_data.get('work_type', 'N/A'),
-                "teeth": parsed_data.get('teeth', '?'),
-                "file_status": file_status_display, "base_name": project_base_name,
-                "project_path": project_path, "info_path": info_path,
-                "cad_stl_paths": cad_stl_paths, "other_stl_paths": other_stl_paths,
-                "model_stl_paths": model_stl_paths, "parsed_data": parsed_data,
-                "folder_path": current_folder_norm,
-                "has_cad": has_cad, "has_info": has_info, "has_models": has_models,
-                "status_icons": (cam_icon, info_icon, print_icon)
-            }
-            found_projects.append(project_entry)
+    if ext_lower == ".constructioninfo":
+        return not is_temp_file(filename_lower)
 
-            if not scan_root_is_watch_folder: # If scanning a specific target_folder, we are done with this single iteration.
-                 break 
+    if ext_lower == ".stl":
+        if filename_lower.endswith("cad.stl") or "model" in base_name_lower:
+            return not is_temp_file(filename_lower)
 
-    found_projects.sort(key=lambda x: x['last_modified_timestamp'], reverse=True)
-    return found_projects
+    return False
+
+
+# polling file watcher (network shares)
+class _PolledEvent(object):
+    """The part of a watchdog FileSystemEvent that WatcherEventHandler uses."""
+    __slots__ = ("event_type", "src_path", "is_directory")
+
+    def __init__(self, event_type, src_path):
+        self.event_type = event_type
+        self.src_path = src_path
+        self.is_directory = False
+
+class SnapshotPollingObserver(threading.Thread):
+    """
+    Stand-in for watchdog's Observer (schedule/start/stop/join/is_alive) on network shares,
+    where native change notifications miss files written by other machines. Keeps an
+    incremental snapshot of every folder's mtime and of the (size, mtime) of its watched
+    files (is_watched_file). A poll lists a folder again only if its mtime changed; the
+    watched files of a checked folder are also stat'ed, because a file overwritten in place
+    leaves its folder's mtime alone. Folders active within POLL_ACTIVE_SECS are checked on
+    every poll, all others on every POLL_COLD_EVERY-th poll. Changes go to the handler's
+    on_created/on_modified on this thread.
+    """
+    def __init__(self, poll_secs=DEFAULT_WATCHER_POLL_SECS):
+        super().__init__(daemon=True, name="SnapshotPollingObserver")
+        self.poll_secs = poll_secs
+        self.stats = {}
+        self._handler = None
+        self._root = None
+        self._dirs = {}     # folder -> mtime when last listed
+        self._subdirs = {}  # folder -> set of subfolders
+        self._files = {}    # folder -> {watched file path: (size, mtime)}
+        self._active = {}   # folder -> newest watched file mtime / change time, for folders within POLL_ACTIVE_SECS
+        self._polls = 0
+        self._stop_event = threading.Event()
+
+    def schedule(self, event_handler, path, recursive=True):
+        """Same call as Observer.schedule; the whole tree below path is always watched."""
+        self._handler = event_handler
+        self._root = os.path.normpath(path)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def __len__(self):
+        return len(self._dirs)
+
+    def run(self):
+        if self._root is None:
+            return
+        start_time = time.time()
+        self._add_tree(self._root, emit=False)
+        print(f"[Polling Watcher] Snapshot of {len(self._dirs)} folders taken in {time.time() - start_time:.1f}s, "
+              f"polling every {self.poll_secs}s.")
+        while not self._stop_event.wait(self.poll_secs):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"[Polling Watcher] Poll error: {e}")
+
+    def poll(self, now=None):
+        """Checks the snapshot against the share once; returns the number of changed watched files."""
+        now = time.time() if now is None else now
+        self._polls += 1
+        _bump_stat(self.stats, "polls")
+        changes = 0
+        for position, folder in enumerate(list(self._dirs)):
+            if self._stop_event.is_set():
+                break
+            if folder not in self._dirs: # removed with its parent during this poll
+                continue
+            # entries added/removed recently (e.g. the folder new projects go into) also make a folder active
+            is_active = now - max(self._active.get(folder, 0), self._dirs[folder]) < POLL_ACTIVE_SECS
+            if not is_active and position % POLL_COLD_EVERY != self._polls % POLL_COLD_EVERY:
+                continue
+            _bump_stat(self.stats, "dirs_checked")
+            try:
+                folder_mtime = os.stat(folder).st_mtime
+            except OSError:
+                if folder != self._root: self._remove_tree(folder)
+                continue
+            if folder_mtime != self._dirs[folder]:
+                folder_changes, new_subdirs = self._list_folder(folder, emit=True, now=now)
+                changes += folder_changes
+                for subdir in new_subdirs: # e.g. a project folder copied in from another workstation
+                    changes += self._add_tree(subdir, emit=True)
+            else: # active, or a cold folder on its turn: a file overwritten in place leaves the folder mtime alone
+                changes += self._stat_files(folder, now)
+        return changes
+
+    def _add_tree(self, top, emit):
+        changes = 0
+        pending = [top]
+        while pending and not self._stop_event.is_set():
+            folder_changes, new_subdirs = self._list_folder(pending.pop(), emit)
+            changes += folder_changes
+            pending.extend(new_subdirs)
+        return changes
+
+    def _remove_tree(self, top):
+        pending = [top]
+        while pending:
+            folder = pending.pop()
+            pending.extend(self._subdirs.pop(folder, ()))
+            self._dirs.pop(folder, None); self._files.pop(folder, None); self._active.pop(folder, None)
+        parent = os.path.dirname(top)
+        if parent in self._subdirs: self._subdirs[parent].discard(top)
+
+    def _list_folder(self, folder, emit, now=None):
+        """
+        (Re)lists folder and compares its watched files with the snapshot; removed subfolders
+        are dropped. Returns (changed file count, new subfolders still to be listed).
+        """
+        now = time.time() if now is None else now
+        _bump_stat(self.stats, "dirs_listed")
+        try:
+            folder_mtime = os.stat(folder).st_mtime # before listing, so a change during the listing shows up next poll
+            subdirs, files = set(), {}
+            with os.scandir(folder) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.add(os.path.join(folder, entry.name))
+                        elif is_watched_file(entry.name):
+                            st = entry.stat()
+                            files[os.path.join(folder, entry.name)] = (st.st_size, st.st_mtime)
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"[Polling Watcher] Cannot list '{folder}': {e}")
+            return 0, ()
+
+        known_subdirs = self._subdirs.get(folder, set())
+        for removed in known_subdirs - subdirs:
+            self._remove_tree(removed)
+        self._dirs[folder] = folder_mtime
+        self._subdirs[folder] = subdirs
+        return self._compare_files(folder, files, emit, now), subdirs - known_subdirs
+
+    def _stat_files(self, folder, now):
+        files = {}
+        for path in self._files.get(folder, ()):
+            _bump_stat(self.stats, "files_stated")
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue # deleted; the folder mtime changed too, the next listing drops it
+            files[path] = (st.st_size, st.st_mtime)
+        return self._compare_files(folder, files, True, now, keep_missing=True)
+
+    def _compare_files(self, folder, files, emit, now, keep_missing=False):
+        known = self._files.get(folder, {})
+        changes = 0
+        for path, signature in files.items():
+            previous = known.get(path)
+            if previous == signature:
+                continue
+            changes += 1
+            if emit and self._handler is not None:
+                _bump_stat(self.stats, "events")
+                event = _PolledEvent("created" if previous is None else "modified", path)
+                try:
+                    if previous is None: self._handler.on_created(event)
+                    else: self._handler.on_modified(event)
+                except Exception as e:
+                    print(f"[Polling Watcher] Handler error for '{path}': {e}")
+        if keep_missing:
+            files = dict(known, **files)
+        self._files[folder] = files
+        newest = max([mtime for _, mtime in files.values()] + [now if changes and emit else 0])
+        if now - newest < POLL_ACTIVE_SECS: self._active[folder] = newest
+        else: self._active.pop(folder, None)
+        return changes
+
+
+class AdaptiveWatchSet(object):
+    """
+    Native observer watches for the folders where work happens, instead of one recursive
+    watch over years of CAD-DATA history (one inotify watch per folder on Linux). Project
+    folders (holding .dentalProject or watched files) changed within active_days are watched
+    recursively; the Watch Folder and every grouping folder above the projects get a watch of
+    their own, so a new case in an old 'Dr X' folder is still seen. Quiet projects are not
+    watched. Folders created later are promoted from the handler's directory events; folders
+    that go quiet keep their watch until the watcher is restarted.
+
+    Every Observer.schedule starts an emitter thread (with its own inotify instance on Linux,
+    128 per user by default), so at most max_schedules are used: beyond that, the watches in
+    a grouping folder are merged into one recursive watch of it, picking the folders with the
+    fewest quiet projects per schedule saved first.
+    """
+    def __init__(self, observer, event_handler, root, active_days=DEFAULT_WATCHER_ACTIVE_DAYS,
+                 max_schedules=WATCHER_ACTIVE_MAX_SCHEDULES):
+        self.observer = observer
+        self.event_handler = event_handler
+        self.root = os.path.normpath(root)
+        self.active_days = active_days
+        self.max_schedules = max_schedules
+        self.stats = {}
+        self._watches = {} # folder -> (recursive, ObservedWatch)
+        self._quiet = {} # grouping folder -> number of quiet (unwatched) project folders directly in it
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._watches)
+
+    def schedule_active(self, now=None):
+        """Schedules the Watch Folder, its grouping folders and recently active projects; returns the number of watches."""
+        now = time.time() if now is None else now
+        with self._lock:
+            plan = {}
+            self._add_tree(self.root, now - self.active_days * 86400, plan)
+            self._apply(self._fit(plan))
+            return len(self._watches)
+
+    def promote(self, folder):
+        """
+        Watches a folder that was just created below a watched one (a new project, or a
+        grouping folder with projects in it). Returns the watched files already inside,
+        which were written before the watch existed.
+        """
+        folder = os.path.normpath(os.path.abspath(folder))
+        with self._lock:
+            if self._is_covered(folder):
+                return []
+            _bump_stat(self.stats, "promoted")
+            plan = {path: recursive for path, (recursive, _) in self._watches.items()}
+            present_files = self._add_tree(folder, None, plan)
+            self._apply(self._fit(plan))
+            return present_files
+
+    def _is_covered(self, folder):
+        if folder in self._watches:
+            return True
+        parent = os.path.dirname(folder)
+        while parent != folder: # stops at the drive/filesystem root
+            watch = self._watches.get(parent)
+            if watch is not None and watch[0]:
+                return True
+            if parent == self.root:
+                break
+            folder, parent = parent, os.path.dirname(parent)
+        return False
+
+    def _add_tree(self, top, cutoff, plan):
+        """
+        Adds top and the folders below it to plan (folder -> recursive): grouping folders
+        all, project folders if modified since cutoff (all of them if None). Returns the
+        watched files in the added project folders.
+        """
+        present_files = []
+        pending = [(top, True)]
+        while pending:
+            folder, active = pending.pop()
+            try:
+                dir_entries, file_entries = _list_dir_entries(folder, self.stats)
+            except OSError as e:
+                print(f"[Watcher] Cannot list '{folder}': {e}")
+                continue
+            watched_files = [entry.path for entry in file_entries if is_watched_file(entry.name)]
+            is_project = bool(watched_files) or any(entry.name.lower().endswith(".dentalproject") for entry in file_entries)
+            if is_project and folder != self.root:
+                if active:
+                    plan[folder] = True
+                    present_files.extend(watched_files)
+                else:
+                    parent = os.path.dirname(folder)
+                    self._quiet[parent] = self._quiet.get(parent, 0) + 1
+                continue
+            plan[folder] = False
+            self._quiet.setdefault(folder, 0)
+            for entry in dir_entries:
+                if _is_likely_archive_path(os.path.normpath(entry.path)):
+                    continue
+                try:
+                    child_active = cutoff is None or entry.stat(follow_symlinks=False).st_mtime >= cutoff
+                except OSError:
+                    continue
+                pending.append((entry.path, child_active))
+        return present_files
+
+    def _fit(self, plan):
+        """Merges planned watches into recursive watches of their grouping folders until max_schedules fit."""
+        while len(plan) > self.max_schedules:
+            excess = len(plan) - self.max_schedules
+            counts, costs = {}, {} # grouping folder -> planned watches inside it (itself included), quiet projects
+            for folder, recursive in plan.items():
+                quiet = 0 if recursive else self._quiet.get(folder, 0)
+                ancestor = folder
+                while True:
+                    if plan.get(ancestor) is False:
+                        counts[ancestor] = counts.get(ancestor, 0) + 1
+                        costs[ancestor] = costs.get(ancestor, 0) + quiet
+                    parent = os.path.dirname(ancestor)
+                    if ancestor == self.root or parent == ancestor:
+                        break
+                    ancestor = parent
+            candidates = [(costs[folder] / min(count - 1, excess), -count, folder)
+                          for folder, count in counts.items() if count > 1]
+            if not candidates:
+                break
+            merged = min(candidates)[2]
+            prefix = merged.rstrip(os.sep) + os.sep
+            for folder in [folder for folder in plan if folder.startswith(prefix)]:
+                del plan[folder]
+            plan[merged] = True
+            _bump_stat(self.stats, "merged")
+        return plan
+
+    def _apply(self, plan):
+        """Schedules the planned watches that are new or changed, then unschedules the dropped ones."""
+        failed = [] # watches below a merge that could not be scheduled are kept
+        for folder, recursive in plan.items():
+            current = self._watches.get(folder)
+            if current is not None and current[0] == recursive:
+                continue
+            try:
+                watch = self.observer.schedule(self.event_handler, folder, recursive=recursive)
+            except OSError as e: # folder removed again, or no inotify instances left
+                print(f"[Watcher] Cannot watch '{folder}': {e}")
+                failed.append(folder.rstrip(os.sep) + os.sep)
+                continue
+            if current is not None:
+                self.observer.unschedule(current[1])
+            self._watches[folder] = (recursive, watch)
+            _bump_stat(self.stats, "recursive_watches" if recursive else "folder_watches")
+        for folder in [folder for folder in self._watches
+                       if folder not in plan and not any(folder.startswith(prefix) for prefix in failed)]:
+            self.observer.unschedule(self._watches.pop(folder)[1])
+            _bump_stat(self.stats, "unscheduled")
 
 
 # watchdog file system event handler
 if WATCHDOG_AVAILABLE:
     class WatcherEventHandler(FileSystemEventHandler):
         """Handles file system events, triggers popups/auto-send for specific files."""
-        last_processed_time = {}
+        last_processed_time = DebounceMap(WATCHER_DEBOUNCE_TTL_SECS) # per changed file, shared by all handlers
         DEBOUNCE_SECONDS = 1.0
 
-        def __init__(self, signal_emitter, watch_path):
+        def __init__(self, signal_emitter, watch_path, self_writes=None):
             super().__init__()
             self.signal_emitter = signal_emitter
             self.watch_path_norm = os.path.normpath(watch_path) if watch_path else None
+            self.self_writes = self_writes # SelfWriteSuppressor: events for our own copies/moves are ignored
+            self.watch_set = None # AdaptiveWatchSet, when only recently active folders are watched
             print(f"[WatcherEventHandler] Initialized for path: {self.watch_path_norm}")
 
         def _is_relevant_change(self, event_path):
@@ -453,30 +2253,17 @@ if WATCHDOG_AVAILABLE:
                 print(f"[WatcherEventHandler] Path check error for '{event_path}': {e}")
                 return False
 
-            filename = os.path.basename(event_path)
-            filename_lower = filename.lower()
-            base_name_lower, ext_lower = os.path.splitext(filename_lower)
-
-            if ext_lower == ".constructioninfo":
-                return True
-
-            if ext_lower == ".stl":
-                if filename_lower.endswith("cad.stl"):
-                    return True
-                if "model" in base_name_lower:
-                    return True
-
-            return False
+            return is_watched_file(os.path.basename(event_path))
 
         def _emit_signal_debounced(self, event_path):
             """Emits the file change signal if the event is relevant and not debounced."""
             abs_event_path = os.path.abspath(event_path)
             now = time.time()
-            last_time = self.last_processed_time.get(abs_event_path, 0)
 
             if self._is_relevant_change(event_path):
-                 if (now - last_time > self.DEBOUNCE_SECONDS):
-                    self.last_processed_time[abs_event_path] = now
+                 if self.self_writes is not None and self.self_writes.is_suppressed(abs_event_path, now):
+                     return # written by this application
+                 if self.last_processed_time.debounce(abs_event_path, self.DEBOUNCE_SECONDS, now):
                     print(f"[WatcherEventHandler] Change detected & debounced: {event_path}")
                     try:
                         self.signal_emitter.file_change_detected.emit(event_path)
@@ -489,6 +2276,29 @@ if WATCHDOG_AVAILABLE:
         def on_created(self, event: FileSystemEvent):
             if not event.is_directory:
                 self._emit_signal_debounced(event.src_path)
+            elif self.watch_set is not None:
+                self._promote_folder(event.src_path)
+
+        def on_moved(self, event: FileSystemEvent):
+            """
+            Renames count for their destination: a temp-file-then-rename save ends here
+            with the final file name (the temp file's own events were filtered out).
+            """
+            dest_path = getattr(event, "dest_path", None)
+            if not dest_path:
+                return
+            if not event.is_directory:
+                self._emit_signal_debounced(dest_path)
+            elif self.watch_set is not None:
+                self._promote_folder(dest_path) # e.g. 'New Folder' renamed to the case name
+
+        def _promote_folder(self, folder_path):
+            """Adds a new folder to the watch set; files that landed in it before its watch count as changes."""
+            try:
+                for file_path in self.watch_set.promote(folder_path):
+                    self._emit_signal_debounced(file_path)
+            except Exception as e:
+                print(f"[WatcherEventHandler] Could not watch new folder '{folder_path}': {e}")
 
         def on_modified(self, event: FileSystemEvent):
             if not event.is_directory:
@@ -496,9 +2306,11 @@ if WATCHDOG_AVAILABLE:
 else:
     # Dummy class if watchdog isn't available
     class WatcherEventHandler(object):
-        def __init__(self, signal_emitter, watch_path): pass
+        last_processed_time = DebounceMap(WATCHER_DEBOUNCE_TTL_SECS)
+        def __init__(self, signal_emitter, watch_path, self_writes=None): pass
         def on_created(self, event): pass
         def on_modified(self, event): pass
+        def on_moved(self, event): pass
 
 
 # hotkey listener thread class
@@ -6,31 +6,45 @@
 
 import sys
 import os
-import shutil
 import datetime
 import webbrowser
 from collections import defaultdict
 from functools import partial # for callbacks, nifty
 import json # config stuff (Used indirectly via MainWindow methods)
 import time
+import threading # scan cancellation token
 
 # imporft core functionalities
 import core
 from core import (
     VTK_AVAILABLE, KEYBOARD_AVAILABLE, WATCHDOG_AVAILABLE, Observer,
     WatcherEventHandler, HotkeyListener, shorten_path, get_relative_time,
-    scan_directory, parse_dental_project,
+    scan_directory, shutdown_scan_process_pool, parse_dental_project, scan_window_bounds, describe_scan_window, ScanResultCache, ProjectEntry,
+    ProjectParseCache, WatcherEventQueue, FileStabilityTracker, SelfWriteSuppressor, DebounceMap,
+    SnapshotPollingObserver, AdaptiveWatchSet, is_network_path, CopyEngine, CopyJob,
     APP_NAME, ORG_NAME, APP_VERSION, DEFAULT_HOTKEY,
     SETTINGS_WATCH_FOLDER, SETTINGS_TARGET_FOLDER_CAM, SETTINGS_MODELS_FOLDER,
     SETTINGS_HOTKEY, SETTINGS_ARCHIVE_ENABLED, DEFAULT_ARCHIVE_ENABLED,
     SETTINGS_LAST_ARCHIVE_DATE_CAM, SETTINGS_LAST_ARCHIVE_DATE_PRINT,
     SETTINGS_LIVE_NOTIFY_ENABLED, DEFAULT_LIVE_NOTIFY_ENABLED,
     SETTINGS_NOTIFICATION_DEBOUNCE_SECS, DEFAULT_NOTIFICATION_DEBOUNCE_SECS,
+    SETTINGS_WATCHER_QUIET_SECS, DEFAULT_WATCHER_QUIET_SECS,
+    SETTINGS_WATCHER_MODE, DEFAULT_WATCHER_MODE, SETTINGS_WATCHER_POLL_SECS, DEFAULT_WATCHER_POLL_SECS,
+    SETTINGS_WATCHER_ACTIVE_DAYS, DEFAULT_WATCHER_ACTIVE_DAYS,
+    WATCHER_MODE_AUTO, WATCHER_MODE_NATIVE, WATCHER_MODE_POLLING, WATCHER_MODE_ACTIVE,
+    SETTINGS_AUTO_SEND_STABLE_SECS, DEFAULT_AUTO_SEND_STABLE_SECS,
     SETTINGS_AUTO_SEND_ENABLED, DEFAULT_AUTO_SEND_ENABLED,
     SETTINGS_DUPLICATE_CHECK_ACTION, DEFAULT_DUPLICATE_CHECK_ACTION,
     SETTINGS_AUTO_DUPLICATE_ACTION, DEFAULT_AUTO_DUPLICATE_ACTION,
     SETTINGS_NETWORK_SCAN_DEPTH, DEFAULT_NETWORK_SCAN_DEPTH, # Import new settings
-    AUTO_SEND_STATUS_FILE, VIEWER_BACKGROUND_COLOR, VIEWER_MODEL_COLOR,
+    SETTINGS_SCAN_INDEX_ENABLED, DEFAULT_SCAN_INDEX_ENABLED,
+    SETTINGS_SCAN_THREADS, DEFAULT_SCAN_THREADS, SETTINGS_SCAN_PROCESSES, DEFAULT_SCAN_PROCESSES,
+    SETTINGS_SCAN_WINDOW_MODE, DEFAULT_SCAN_WINDOW_MODE, SETTINGS_SCAN_WINDOW_VALUE, DEFAULT_SCAN_WINDOW_VALUE,
+    SETTINGS_SCAN_PRUNE_OLD_DIRS, DEFAULT_SCAN_PRUNE_OLD_DIRS,
+    SETTINGS_PARSE_CACHE_PERSIST, DEFAULT_PARSE_CACHE_PERSIST, PARSE_CACHE_FILE,
+    SETTINGS_SCAN_CACHE_TTL_SECS, DEFAULT_SCAN_CACHE_TTL_SECS,
+    SCAN_WINDOW_TODAY, SCAN_WINDOW_HOURS, SCAN_WINDOW_WORKING_DAYS, SCAN_WINDOW_SINCE,
+    AUTO_SEND_STATUS_FILE, SCAN_INDEX_FILE, VIEWER_BACKGROUND_COLOR, VIEWER_MODEL_COLOR,
     VIEWER_AXES_ENABLED
 )
 
@@ -51,11 +65,12 @@ from PyQt6.QtWidgets import (
     QPushButton, QLabel, QMessageBox, QSystemTrayIcon, QMenu, QFileDialog,
     QStatusBar, QSizePolicy, QTableWidget, QTableWidgetItem, QAbstractItemView,
     QHeaderView, QStyle, QDialog, QFormLayout, QLineEdit,
-    QDialogButtonBox, QFrame, QCheckBox, QComboBox
+    QDialogButtonBox, QFrame, QCheckBox, QComboBox, QProgressBar
 )
 from PyQt6.QtGui import QIcon, QAction, QFont, QColor, QDesktopServices, QGuiApplication, QPixmap, QClipboard, \
     QIntValidator
-from PyQt6.QtCore import Qt, QSettings, pyqtSignal, QObject, QCoreApplication, QTimer, QSize, QUrl
+from PyQt6.QtCore import Qt, QSettings, pyqtSignal, QObject, QCoreApplication, QTimer, QSize, QUrl, QThread, \
+    QItemSelectionModel
 
 # setup signals for thread communication
 # used to talk between threads (hotkey listener -> main, watchdog -> main)
@@ -65,26 +80,266 @@ class HotkeySignalEmitter(QObject):
 class WatchdogSignalEmitter(QObject):
     file_change_detected = pyqtSignal(str) # send the path that changed
 
+class CopySignalEmitter(QObject):
+    # CopyEngine callbacks (worker threads) -> queued to the GUI thread; the CopyJob is passed along
+    job_started = pyqtSignal(object)
+    job_progress = pyqtSignal(object)
+    job_finished = pyqtSignal(object)
+
 # Worker for background scanning
 class ScanWorker(QObject):
+    scan_batch = pyqtSignal(list)            # project entries found since the previous batch
     scan_complete = pyqtSignal(list, float)  # found_files_data, scan_duration
     scan_error = pyqtSignal(str, float)      # error_message, scan_duration
-
-    def __init__(self, watch_folder, network_scan_depth): # Added network_scan_depth
+    scan_cancelled = pyqtSignal(list, float) # partial found_files_data, scan_duration
+    scan_diff = pyqtSignal(dict)             # core.diff_scan_results against previous_results, sent before scan_complete
+    finished = pyqtSignal()                  # emitted last, whatever the outcome
+    BATCH_INTERVAL_SECS = 0.25 # max time found rows wait before being sent to the table
+
+    def __init__(self, watch_folder, network_scan_depth, index_path=None, scan_threads=DEFAULT_SCAN_THREADS,
+                 scan_window=None, prune_old_dirs=False, previous_results=None,
+                 scan_processes=DEFAULT_SCAN_PROCESSES, parse_cache=None, cache_key=None): # Added network_scan_depth
         super().__init__()
         self.watch_folder = watch_folder
         self.network_scan_depth = network_scan_depth
+        self.index_path = index_path # None = full scan without the directory index
+        self.scan_threads = scan_threads
+        self.scan_window = scan_window # (start, end) epoch bounds, None = today
+        self.prune_old_dirs = prune_old_dirs
+        self.previous_results = previous_results or [] # rows currently shown, the diff baseline
+        self.scan_processes = scan_processes # > 1: process pool scan mode
+        self.parse_cache = parse_cache # shared ProjectParseCache of the main window
+        self.cache_key = cache_key # ScanResultCache key of this scan
+        self.partial_results = None # rows found before a cancel, set before scan_cancelled is emitted
+        self.cancel_event = threading.Event()
+        self._pending = [] # found rows not yet sent with scan_batch
+        self._pending_lock = threading.Lock()
+
+    def cancel(self):
+        """Asks the running scan to stop; safe to call from any thread. The walk checks it between folders."""
+        self.cancel_event.set()
+
+    def _emit_pending(self):
+        """Sends the pending rows as one scan_batch. Emitted under the lock so batches keep their order."""
+        with self._pending_lock:
+            if not self._pending: return
+            batch, self._pending = self._pending, []
+            self.scan_batch.emit(batch)
+
+    def _flush_pending_periodically(self, stop_event):
+        # Runs beside the walk: rows found just before a slow folder listing still reach
+        # the table within BATCH_INTERVAL_SECS instead of waiting for the next entry
+        while not stop_event.wait(self.BATCH_INTERVAL_SECS):
+            self._emit_pending()
 
     def run_scan(self):
         start_time = time.time()
+        flush_stop = threading.Event()
+        flusher = threading.Thread(target=self._flush_pending_periodically, args=(flush_stop,),
+                                   name="ScanBatchFlusher", daemon=True)
         try:
-            # Pass network_scan_depth to core.scan_directory
-            found_files_data = core.scan_directory(self.watch_folder, network_scan_depth=self.network_scan_depth)
+            # Stream entries as folders are classified; the first row is sent immediately,
+            # later ones in batches (flushed every BATCH_INTERVAL_SECS) so the table isn't
+            # redrawn for every project
+            scan_stats = {}
+            found_files_data = []
+            flusher.start()
+            for project_entry in core.iter_scan_directory(self.watch_folder, network_scan_depth=self.network_scan_depth,
+                                                          scan_stats=scan_stats, index_path=self.index_path,
+                                                          max_workers=self.scan_threads,
+                                                          cancel_event=self.cancel_event,
+                                                          scan_window=self.scan_window,
+                                                          prune_old_dirs=self.prune_old_dirs,
+                                                          max_processes=self.scan_processes,
+                                                          parse_cache=self.parse_cache):
+                found_files_data.append(project_entry)
+                with self._pending_lock:
+                    self._pending.append(project_entry)
+                if len(found_files_data) == 1:
+                    self._emit_pending()
+            flush_stop.set()
+            self._emit_pending()
+            found_files_data.sort(key=lambda x: x['last_modified_timestamp'], reverse=True)
             scan_duration = time.time() - start_time
+            if self.cancel_event.is_set():
+                print(f"[Scan] Cancelled after {scan_duration:.2f}s with {len(found_files_data)} partial result(s).")
+                self.partial_results = found_files_data
+                self.scan_cancelled.emit(found_files_data, scan_duration)
+                return
+            print(f"[Scan Stats] {scan_stats.get('dirs_listed', 0)} dir listings, "
+                  f"{scan_stats.get('entries_seen', 0)} entries, {scan_stats.get('entry_stats', 0)} file stats, "
+                  f"{scan_stats.get('index_hits', 0)} index hits, {scan_stats.get('dirs_pruned', 0)} old dirs pruned "
+                  f"({scan_duration:.2f}s)")
+            if self.parse_cache is not None:
+                print(f"[Parse Cache] {self.parse_cache.stats['hits']} hits, {self.parse_cache.stats['misses']} misses, "
+                      f"{len(self.parse_cache)} projects cached (since start)")
+            self.scan_diff.emit(core.diff_scan_results(self.previous_results, found_files_data))
             self.scan_complete.emit(found_files_data, scan_duration)
         except Exception as e:
             scan_duration = time.time() - start_time
             self.scan_error.emit(str(e), scan_duration)
+        finally:
+            flush_stop.set()
+            if flusher.is_alive(): flusher.join()
+            self.finished.emit()
+
+# Worker for watcher-triggered processing
+class WatcherWorker(QObject):
+    """
+    Runs watcher triggers on its own thread: rescans the changed project folders, decides
+    about auto-send and has the files copied by the copy engine (waiting for the job, so
+    sends are recorded in order). It only talks to the window through signals; the
+    notification popup, and auto-sends that could need a duplicate/folder dialog, stay on
+    the GUI thread. Each request gets a snapshot of the settings (see MainWindow._watcher_config).
+    """
+    auto_send_started = pyqtSignal(str, str, str)          # folder_path, "cam"/"print", display name
+    auto_send_finished = pyqtSignal(str, str, bool, dict)  # folder_path, "cam"/"print", success, operation_stats
+    auto_send_needs_gui = pyqtSignal(str, str, object)     # folder_path, "cam"/"print", item_data
+    archive_finished = pyqtSignal(str, dict)               # "CAM"/"Print", archive_stats
+    project_processed = pyqtSignal(str, object, bool)      # folder_path, item_data, auto-send handled (no notification)
+    batch_finished = pyqtSignal()                          # request done, the window reschedules its timers
+
+    def __init__(self, parse_cache=None, stability_tracker=None, self_writes=None, copy_engine=None):
+        super().__init__()
+        self.parse_cache = parse_cache
+        self.stability_tracker = stability_tracker
+        self.self_writes = self_writes # SelfWriteSuppressor shared with the file watcher
+        self.copy_engine = copy_engine if copy_engine is not None else CopyEngine(self_writes=self_writes)
+        self.cancel_event = threading.Event() # set on quit, stops processing between folders
+        self.sent_today = set() # (folder_path, kind, date) sent by this worker; the config snapshot may lag behind
+        self.archived_today = {} # "CAM"/"Print" -> date archived by this worker
+
+    def process_folders(self, folders, config):
+        """Slot: rescans folders (one scan_directory call) and processes each once."""
+        try:
+            self._process(folders, config)
+        except Exception as e:
+            print(f"[Watcher Worker] Error processing {len(folders)} folder(s): {e}")
+        finally:
+            self.batch_finished.emit()
+
+    def poll_stability(self, config):
+        """Slot: re-checks folders held back from auto-send and processes those whose files are stable."""
+        try:
+            stable_folders = self.stability_tracker.poll() if self.stability_tracker is not None else []
+            if stable_folders:
+                print(f"[Watcher Stability] Files stable in {len(stable_folders)} folder(s), processing...")
+                self._process(stable_folders, config)
+        except Exception as e:
+            print(f"[Watcher Worker] Error polling file stability: {e}")
+        finally:
+            self.batch_finished.emit()
+
+    def _process(self, folders, config):
+        if not config["live_notify_enabled"] and not config["auto_send_enabled"]:
+            return
+        found_projects = scan_directory(config["watch_folder"], target_folder=folders, parse_cache=self.parse_cache,
+                                        cancel_event=self.cancel_event)
+        projects_by_folder = {item_data['folder_path']: item_data for item_data in found_projects}
+        for folder_path_norm in folders:
+            if self.cancel_event.is_set():
+                return
+            item_data = projects_by_folder.get(folder_path_norm)
+            if item_data is None:
+                print(f"[Watcher Process] Scan found no project data in '{os.path.basename(folder_path_norm)}'. Cannot process trigger.")
+                continue
+            print(f"[Watcher Process] Processing trigger for: {os.path.basename(folder_path_norm)}")
+            auto_sent = self._auto_send_ready_files(folder_path_norm, item_data, config)
+            if auto_sent is not None: # None: held until the files are stable, decided again then
+                self.project_processed.emit(folder_path_norm, item_data, auto_sent)
+
+    def _already_sent(self, folder_path_norm, kind, config):
+        today_str = datetime.date.today().isoformat()
+        return ((folder_path_norm, kind, today_str) in self.sent_today or
+                kind in config["auto_sent_today"].get(folder_path_norm, ()))
+
+    def _auto_send_ready_files(self, folder_path_norm, item_data, config):
+        """
+        Auto-sends what is ready. Returns True if anything was sent (or handed to the GUI to send,
+        or is still being sent by it), None if the folder is held until its files are stable.
+        """
+        if not config["auto_send_enabled"]:
+            return False
+        patient_name = item_data.get('patient', os.path.basename(folder_path_norm))
+        ready = {"cam": item_data.get('has_cad', False) and item_data.get('has_info', False),
+                 "print": item_data.get('has_models', False)}
+        targets = {"cam": config["target_folder_cam"], "print": config["target_folder_print"]}
+        kinds_to_send = []
+        kinds_in_flight = False # sent by the GUI right now (duplicate/folder dialog), counts as handled
+        for kind, label in (("cam", "CAM"), ("print", "Print")):
+            if (folder_path_norm, kind) in config["auto_sends_in_flight"]:
+                print(f"[Watcher Process] Auto-Send {label} for '{patient_name}' is still in progress.")
+                kinds_in_flight = True
+                continue
+            already_sent = self._already_sent(folder_path_norm, kind, config)
+            if ready[kind] and targets[kind] and not already_sent:
+                kinds_to_send.append(kind)
+                continue
+            reasons = []
+            if not ready[kind]: reasons.append(f"{label} files not ready")
+            if not targets[kind]: reasons.append(f"{label} target not set")
+            if already_sent: reasons.append(f"Already sent {label} today")
+            print(f"[Watcher Process] Cannot Auto-Send {label} for '{patient_name}': {', '.join(reasons)}")
+        if not kinds_to_send:
+            return kinds_in_flight
+
+        files_by_kind = {"cam": [item_data.get('info_path')] + list(item_data.get('cad_stl_paths', [])),
+                         "print": list(item_data.get('model_stl_paths', []))}
+        files_to_send = [p for kind in kinds_to_send for p in files_by_kind[kind] if p]
+        if self.stability_tracker is not None and not self.stability_tracker.check(folder_path_norm, files_to_send):
+            print(f"[Watcher Process] Holding Auto-Send for '{patient_name}' until its files are unchanged "
+                  f"for {self.stability_tracker.stable_secs}s.")
+            return None
+
+        auto_sent = False
+        for kind in kinds_to_send:
+            if self._auto_send(folder_path_norm, kind, item_data, [p for p in files_by_kind[kind] if p], targets[kind], config):
+                auto_sent = True
+        return auto_sent or kinds_in_flight
+
+    def _auto_send(self, folder_path_norm, kind, item_data, source_paths, target_folder, config):
+        label = "CAM" if kind == "cam" else "Print"
+        display_name = f"{item_data.get('patient', 'Unknown')} [{item_data.get('base_name', '?')}]"
+        source_paths = [p for p in source_paths if os.path.exists(p)]
+        cam_files_ok = item_data.get('info_path') in source_paths and len(source_paths) > 1 # .constructionInfo + at least one *cad.stl
+        if not source_paths or (kind == "cam" and not cam_files_ok):
+            print(f"Auto-Send {label} skipped for {display_name}: required files are missing.")
+            return False
+
+        duplicate_action = config["auto_duplicate_action"]
+        if duplicate_action not in ("skip", "overwrite"):
+            # 'manual' asks the user about duplicates, and a missing target folder asks to be created
+            if not os.path.isdir(target_folder) or any(os.path.exists(os.path.join(target_folder, os.path.basename(p)))
+                                                       for p in source_paths):
+                self.auto_send_needs_gui.emit(folder_path_norm, kind, item_data)
+                return True
+            duplicate_action = "overwrite" # nothing to overwrite
+        elif not os.path.isdir(target_folder):
+            self.auto_send_needs_gui.emit(folder_path_norm, kind, item_data)
+            return True
+
+        self.auto_send_started.emit(folder_path_norm, kind, display_name)
+        operation_stats = {"project_name": display_name, "copied": 0, "skipped": 0, "errors": [], "cancelled": False}
+        job = self.copy_engine.submit(CopyJob(f"Auto-Send {label}: {display_name}", target_folder,
+                                              [(operation_stats, source_paths)], duplicate_action,
+                                              archive=self._archive_due(label, config)))
+        job.wait()
+        if job.archive_stats is not None:
+            if job.archive_stats.get("errors", 0) == 0:
+                self.archived_today[label] = datetime.date.today().isoformat()
+            self.archive_finished.emit(label, job.archive_stats)
+        success = job.succeeded
+        if success:
+            self.sent_today.add((folder_path_norm, kind, datetime.date.today().isoformat()))
+        self.auto_send_finished.emit(folder_path_norm, kind, success, operation_stats)
+        return success
+
+    def _archive_due(self, folder_type_name, config):
+        """True if the copy job should archive the target folder first (not yet done today)."""
+        if not config["archive_enabled"]:
+            return False
+        today_str = datetime.date.today().isoformat()
+        return today_str not in (config["last_archive_dates"].get(folder_type_name), self.archived_today.get(folder_type_name))
 
 # application styles (Neon Void theme)
 NEON_VOID_STYLE = """
@@ -437,14 +692,35 @@ class SettingsDialog(QDialog):
                                                                DEFAULT_LIVE_NOTIFY_ENABLED, type=bool)
         self.current_notify_debounce = self.settings.value(SETTINGS_NOTIFICATION_DEBOUNCE_SECS,
                                                            DEFAULT_NOTIFICATION_DEBOUNCE_SECS, type=int)
+        self.current_watcher_quiet = self.settings.value(SETTINGS_WATCHER_QUIET_SECS,
+                                                         DEFAULT_WATCHER_QUIET_SECS, type=int)
+        self.current_watcher_mode = self.settings.value(SETTINGS_WATCHER_MODE, DEFAULT_WATCHER_MODE)
+        self.current_watcher_poll = self.settings.value(SETTINGS_WATCHER_POLL_SECS,
+                                                        DEFAULT_WATCHER_POLL_SECS, type=int)
+        self.current_watcher_active_days = self.settings.value(SETTINGS_WATCHER_ACTIVE_DAYS,
+                                                               DEFAULT_WATCHER_ACTIVE_DAYS, type=int)
         self.current_auto_send_enabled = self.settings.value(SETTINGS_AUTO_SEND_ENABLED, DEFAULT_AUTO_SEND_ENABLED,
                                                              type=bool)
         self.current_duplicate_action = self.settings.value(SETTINGS_DUPLICATE_CHECK_ACTION,
                                                             DEFAULT_DUPLICATE_CHECK_ACTION)
         self.current_auto_duplicate_action = self.settings.value(SETTINGS_AUTO_DUPLICATE_ACTION,
                                                                  DEFAULT_AUTO_DUPLICATE_ACTION)
+        self.current_auto_send_stable = self.settings.value(SETTINGS_AUTO_SEND_STABLE_SECS,
+                                                            DEFAULT_AUTO_SEND_STABLE_SECS, type=int)
         self.current_network_scan_depth = self.settings.value(SETTINGS_NETWORK_SCAN_DEPTH,
                                                               DEFAULT_NETWORK_SCAN_DEPTH, type=int)
+        self.current_scan_index_enabled = self.settings.value(SETTINGS_SCAN_INDEX_ENABLED,
+                                                              DEFAULT_SCAN_INDEX_ENABLED, type=bool)
+        self.current_scan_threads = self.settings.value(SETTINGS_SCAN_THREADS, DEFAULT_SCAN_THREADS, type=int)
+        self.current_scan_processes = self.settings.value(SETTINGS_SCAN_PROCESSES, DEFAULT_SCAN_PROCESSES, type=int)
+        self.current_scan_window_mode = self.settings.value(SETTINGS_SCAN_WINDOW_MODE, DEFAULT_SCAN_WINDOW_MODE)
+        self.current_scan_window_value = self.settings.value(SETTINGS_SCAN_WINDOW_VALUE, DEFAULT_SCAN_WINDOW_VALUE)
+        self.current_scan_prune_old_dirs = self.settings.value(SETTINGS_SCAN_PRUNE_OLD_DIRS,
+                                                               DEFAULT_SCAN_PRUNE_OLD_DIRS, type=bool)
+        self.current_scan_cache_ttl = self.settings.value(SETTINGS_SCAN_CACHE_TTL_SECS,
+                                                          DEFAULT_SCAN_CACHE_TTL_SECS, type=int)
+        self.current_parse_cache_persist = self.settings.value(SETTINGS_PARSE_CACHE_PERSIST,
+                                                               DEFAULT_PARSE_CACHE_PERSIST, type=bool)
 
 
         layout = QVBoxLayout(self)
@@ -515,6 +791,61 @@ class SettingsDialog(QDialog):
             lambda state: self.debounce_edit.setEnabled(state == Qt.CheckState.Checked.value and WATCHDOG_AVAILABLE)
         )
 
+        self.watcher_quiet_edit = QLineEdit(str(self.current_watcher_quiet))
+        self.watcher_quiet_edit.setValidator(QIntValidator(1, 60))
+        self.watcher_quiet_edit.setToolTip(
+            "Changes in a project folder are collected until no watched file in it has changed\n"
+            "for this many seconds; the folder is then rescanned once for notifications/auto-send.")
+        watcher_quiet_layout = QHBoxLayout()
+        watcher_quiet_layout.addWidget(self.watcher_quiet_edit)
+        watcher_quiet_layout.addWidget(QLabel("seconds"))
+        watcher_quiet_layout.addStretch()
+        form_layout.addRow("Change Quiet Time:", watcher_quiet_layout)
+        self.watcher_quiet_edit.setEnabled(WATCHDOG_AVAILABLE)
+
+        self.watcher_mode_combo = QComboBox()
+        self.watcher_mode_combo.addItem("Auto (poll network shares)", WATCHER_MODE_AUTO)
+        self.watcher_mode_combo.addItem("Native Events", WATCHER_MODE_NATIVE)
+        self.watcher_mode_combo.addItem("Polling", WATCHER_MODE_POLLING)
+        self.watcher_mode_combo.addItem("Active Folders Only", WATCHER_MODE_ACTIVE)
+        self.watcher_mode_combo.setToolTip(
+            "Native events miss files written by other computers to a network share (SMB/NFS).\n"
+            "Polling compares folder snapshots instead: recently active project folders every interval,\n"
+            "all other folders every few intervals. Auto polls Watch Folders on network shares only\n"
+            "(UNC paths and mapped drives on Windows, SMB/NFS mounts on Linux).\n"
+            "Active Folders Only uses native events, but watches only projects changed within the\n"
+            "Active Days, new folders and the folders grouping the projects, instead of every folder of\n"
+            "the CAD-DATA history. With many grouping folders it falls back to watching whole subfolders.")
+        mode_index = self.watcher_mode_combo.findData(self.current_watcher_mode)
+        self.watcher_mode_combo.setCurrentIndex(mode_index if mode_index != -1 else 0)
+        self.watcher_poll_edit = QLineEdit(str(self.current_watcher_poll))
+        self.watcher_poll_edit.setValidator(QIntValidator(1, 300))
+        self.watcher_poll_edit.setToolTip("Seconds between two polls of the Watch Folder (Polling mode).")
+        watcher_mode_layout = QHBoxLayout()
+        watcher_mode_layout.addWidget(self.watcher_mode_combo)
+        watcher_mode_layout.addWidget(QLabel("Poll Every:"))
+        watcher_mode_layout.addWidget(self.watcher_poll_edit)
+        watcher_mode_layout.addWidget(QLabel("seconds"))
+        form_layout.addRow("Watch Mode:", watcher_mode_layout)
+        self.watcher_mode_combo.setEnabled(WATCHDOG_AVAILABLE)
+        self.watcher_poll_edit.setEnabled(WATCHDOG_AVAILABLE)
+
+        self.watcher_active_days_edit = QLineEdit(str(self.current_watcher_active_days))
+        self.watcher_active_days_edit.setValidator(QIntValidator(1, 365))
+        self.watcher_active_days_edit.setToolTip(
+            "Active Folders Only mode: project folders modified within this many days are watched.\n"
+            "Changes in older projects are still found by a manual scan.")
+        watcher_active_days_layout = QHBoxLayout()
+        watcher_active_days_layout.addWidget(self.watcher_active_days_edit)
+        watcher_active_days_layout.addWidget(QLabel("days"))
+        watcher_active_days_layout.addStretch()
+        form_layout.addRow("Active Days:", watcher_active_days_layout)
+        self.watcher_active_days_edit.setEnabled(WATCHDOG_AVAILABLE and self.current_watcher_mode == WATCHER_MODE_ACTIVE)
+        self.watcher_mode_combo.currentIndexChanged.connect(
+            lambda index: self.watcher_active_days_edit.setEnabled(
+                WATCHDOG_AVAILABLE and self.watcher_mode_combo.itemData(index) == WATCHER_MODE_ACTIVE)
+        )
+
         self.auto_send_enabled_checkbox = QCheckBox("Enable Automatic Sending")
         self.auto_send_enabled_checkbox.setChecked(self.current_auto_send_enabled)
         auto_send_tooltip = ("Automatically send files to Target folders (CAM/Print)\n"
@@ -528,6 +859,17 @@ class SettingsDialog(QDialog):
         self.auto_send_enabled_checkbox.stateChanged.connect(self.update_auto_duplicate_enabled_state)
         form_layout.addRow("", self.auto_send_enabled_checkbox)
 
+        self.auto_send_stable_edit = QLineEdit(str(self.current_auto_send_stable))
+        self.auto_send_stable_edit.setValidator(QIntValidator(0, 120))
+        self.auto_send_stable_edit.setToolTip(
+            "Auto-Send waits until the project's files have kept the same size and modification time\n"
+            "for this many seconds, so files still being written are not copied half-finished (0 = off).")
+        auto_send_stable_layout = QHBoxLayout()
+        auto_send_stable_layout.addWidget(self.auto_send_stable_edit)
+        auto_send_stable_layout.addWidget(QLabel("seconds"))
+        auto_send_stable_layout.addStretch()
+        form_layout.addRow("Wait for Stable Files:", auto_send_stable_layout)
+
         file_options_label = QLabel("File Handling")
         file_options_label.setStyleSheet("font-weight: bold; margin-top: 15px; margin-bottom: 5px;")
         form_layout.addRow(file_options_label)
@@ -569,6 +911,35 @@ class SettingsDialog(QDialog):
         performance_label.setStyleSheet("font-weight: bold; margin-top: 15px; margin-bottom: 5px;")
         form_layout.addRow(performance_label)
 
+        self.scan_window_combo = QComboBox()
+        self.scan_window_combo.addItem("Today", SCAN_WINDOW_TODAY)
+        self.scan_window_combo.addItem("Last N Hours", SCAN_WINDOW_HOURS)
+        self.scan_window_combo.addItem("Last N Working Days", SCAN_WINDOW_WORKING_DAYS)
+        self.scan_window_combo.addItem("Since Date/Time", SCAN_WINDOW_SINCE)
+        self.scan_window_combo.setToolTip(
+            "Which projects a Watch Folder scan lists, by file modification time.\n"
+            "Working days are Mon-Fri and include today; weekends in between are included.")
+        window_index = self.scan_window_combo.findData(self.current_scan_window_mode)
+        self.scan_window_combo.setCurrentIndex(window_index if window_index != -1 else 0)
+        self.scan_window_value_edit = QLineEdit(str(self.current_scan_window_value))
+        self.scan_window_value_edit.setToolTip("Hours (e.g. 3), working days (e.g. 2) or a start time (YYYY-MM-DD HH:MM).")
+        self.scan_window_combo.currentIndexChanged.connect(self.update_scan_window_value_state)
+        window_layout = QHBoxLayout()
+        window_layout.addWidget(self.scan_window_combo)
+        window_layout.addWidget(self.scan_window_value_edit)
+        form_layout.addRow("Scan Window:", window_layout)
+        self.update_scan_window_value_state()
+
+        self.scan_prune_old_dirs_checkbox = QCheckBox("Skip folders not changed inside the scan window")
+        self.scan_prune_old_dirs_checkbox.setChecked(self.current_scan_prune_old_dirs)
+        self.scan_prune_old_dirs_checkbox.setToolTip(
+            "With incremental scans: project folders the index knows, whose files are all\n"
+            "older than the scan window, are dropped right in the walk.\n"
+            "Folders that group projects (per doctor, per month) are always listed, since\n"
+            "their time does not change when a project inside them is modified."
+        )
+        form_layout.addRow("", self.scan_prune_old_dirs_checkbox)
+
         self.network_scan_depth_edit = QLineEdit(str(self.current_network_scan_depth))
         self.network_scan_depth_edit.setValidator(QIntValidator(0, 10)) # 0 for unlimited, up to 10 levels
         self.network_scan_depth_edit.setToolTip(
@@ -582,6 +953,70 @@ class SettingsDialog(QDialog):
         depth_layout.addStretch()
         form_layout.addRow("Network/Slow Scan Depth:", depth_layout)
 
+        self.scan_threads_edit = QLineEdit(str(self.current_scan_threads))
+        self.scan_threads_edit.setValidator(QIntValidator(1, 32))
+        self.scan_threads_edit.setToolTip(
+            "Number of folders listed in parallel during Watch Folder scans; as many\n"
+            "project files are parsed in parallel while the listing goes on.\n"
+            "Network shares are limited by round-trip latency, so 4-16 threads\n"
+            "can make scans several times faster. 1 = single-threaded scan."
+        )
+        threads_layout = QHBoxLayout()
+        threads_layout.addWidget(self.scan_threads_edit)
+        threads_layout.addWidget(QLabel("threads (1-32)"))
+        threads_layout.addStretch()
+        form_layout.addRow("Parallel Scan Threads:", threads_layout)
+
+        self.scan_processes_edit = QLineEdit(str(self.current_scan_processes))
+        self.scan_processes_edit.setValidator(QIntValidator(0, 64))
+        self.scan_processes_edit.setToolTip(
+            "For very large Watch Folders (100k+ files) on multi-core machines: each top-level\n"
+            f"subfolder is scanned in one of this many worker processes (this PC has {os.cpu_count()} cores).\n"
+            "0 or 1 = off (threads only). Incremental scans are not used in this mode."
+        )
+        processes_layout = QHBoxLayout()
+        processes_layout.addWidget(self.scan_processes_edit)
+        processes_layout.addWidget(QLabel("processes (0=off)"))
+        processes_layout.addStretch()
+        form_layout.addRow("Scan Processes:", processes_layout)
+
+        self.scan_index_enabled_checkbox = QCheckBox("Incremental scans (reuse unchanged folders)")
+        self.scan_index_enabled_checkbox.setChecked(self.current_scan_index_enabled)
+        self.scan_index_enabled_checkbox.setToolTip(
+            f"Keep an index of Watch Folder directories ({SCAN_INDEX_FILE}).\n"
+            "Project folders whose modification time has not changed since the last scan\n"
+            "are not listed again; only their known project files are checked (a file\n"
+            "overwritten in place does not change its folder's time), and unchanged\n"
+            "project files are not parsed again. This makes repeat scans much faster."
+        )
+        form_layout.addRow("", self.scan_index_enabled_checkbox)
+        self.scan_prune_old_dirs_checkbox.setEnabled(self.current_scan_index_enabled) # pruning needs the index
+        self.scan_index_enabled_checkbox.stateChanged.connect(
+            lambda state: self.scan_prune_old_dirs_checkbox.setEnabled(state == Qt.CheckState.Checked.value)
+        )
+
+        self.parse_cache_persist_checkbox = QCheckBox("Keep parsed projects across restarts")
+        self.parse_cache_persist_checkbox.setChecked(self.current_parse_cache_persist)
+        self.parse_cache_persist_checkbox.setToolTip(
+            "Parsed .dentalProject data is always reused while the app runs, as long as the file's\n"
+            "modification time and size are unchanged. With this option it is also saved to\n"
+            f"{PARSE_CACHE_FILE}, so the first scan after a restart does not parse every project again."
+        )
+        form_layout.addRow("", self.parse_cache_persist_checkbox)
+
+        self.scan_cache_ttl_edit = QLineEdit(str(self.current_scan_cache_ttl))
+        self.scan_cache_ttl_edit.setValidator(QIntValidator(0, 86400))
+        self.scan_cache_ttl_edit.setToolTip(
+            "When a scan starts (hotkey or Scan button), results of a previous scan with the same\n"
+            "settings that are at most this old are shown immediately while the folder is rescanned;\n"
+            "the table is then updated with any differences. 0 = always wait for the scan."
+        )
+        cache_layout = QHBoxLayout()
+        cache_layout.addWidget(self.scan_cache_ttl_edit)
+        cache_layout.addWidget(QLabel("seconds (0=off)"))
+        cache_layout.addStretch()
+        form_layout.addRow("Show Cached Results For:", cache_layout)
+
 
         layout.addLayout(form_layout)
         layout.addStretch(1)
@@ -600,6 +1035,7 @@ class SettingsDialog(QDialog):
         """Enable/disable the auto-duplicate setting based on Auto-Send and Watchdog status."""
         is_enabled = self.auto_send_enabled_checkbox.isChecked() and WATCHDOG_AVAILABLE
         self.auto_duplicate_action_combo.setEnabled(is_enabled)
+        self.auto_send_stable_edit.setEnabled(is_enabled)
         if not WATCHDOG_AVAILABLE:
              self.auto_duplicate_action_combo.setToolTip("Requires 'watchdog' library and 'Enable Automatic Sending'.")
         elif not self.auto_send_enabled_checkbox.isChecked():
@@ -609,6 +1045,14 @@ class SettingsDialog(QDialog):
                 "Action for duplicate files during AUTOMATIC operations\n(Auto-Send or Triggered File Updates).\n'Use Manual Setting' may show a popup based on the setting above.")
 
 
+    def update_scan_window_value_state(self):
+        """The value field is only used by the windows that take a number or a start time."""
+        mode = self.scan_window_combo.currentData()
+        self.scan_window_value_edit.setEnabled(mode != SCAN_WINDOW_TODAY)
+        placeholders = {SCAN_WINDOW_HOURS: "hours, e.g. 3", SCAN_WINDOW_WORKING_DAYS: "working days, e.g. 2",
+                        SCAN_WINDOW_SINCE: "YYYY-MM-DD HH:MM"}
+        self.scan_window_value_edit.setPlaceholderText(placeholders.get(mode, ""))
+
     def browse_watch_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Watch Folder",
                                                   self.watch_folder_edit.text() or os.path.expanduser("~"))
@@ -636,16 +1080,61 @@ class SettingsDialog(QDialog):
             if notify_debounce < 5: notify_debounce = 5
         except ValueError:
             notify_debounce = DEFAULT_NOTIFICATION_DEBOUNCE_SECS
+        try:
+            watcher_quiet = int(self.watcher_quiet_edit.text())
+            if not (1 <= watcher_quiet <= 60): # Validate range
+                watcher_quiet = DEFAULT_WATCHER_QUIET_SECS
+        except ValueError:
+            watcher_quiet = DEFAULT_WATCHER_QUIET_SECS
+        watcher_mode = self.watcher_mode_combo.currentData()
+        try:
+            watcher_poll = int(self.watcher_poll_edit.text())
+            if not (1 <= watcher_poll <= 300): # Validate range
+                watcher_poll = DEFAULT_WATCHER_POLL_SECS
+        except ValueError:
+            watcher_poll = DEFAULT_WATCHER_POLL_SECS
+        try:
+            watcher_active_days = int(self.watcher_active_days_edit.text())
+            if not (1 <= watcher_active_days <= 365): # Validate range
+                watcher_active_days = DEFAULT_WATCHER_ACTIVE_DAYS
+        except ValueError:
+            watcher_active_days = DEFAULT_WATCHER_ACTIVE_DAYS
         auto_send_enabled = self.auto_send_enabled_checkbox.isChecked()
         duplicate_action = self.duplicate_action_combo.currentData()
         auto_duplicate_action = self.auto_duplicate_action_combo.currentData()
+        try:
+            auto_send_stable = int(self.auto_send_stable_edit.text())
+            if not (0 <= auto_send_stable <= 120): # Validate range
+                auto_send_stable = DEFAULT_AUTO_SEND_STABLE_SECS
+        except ValueError:
+            auto_send_stable = DEFAULT_AUTO_SEND_STABLE_SECS
         try:
             network_scan_depth_int = int(self.network_scan_depth_edit.text())
             if not (0 <= network_scan_depth_int <= 10): # Validate range
                  network_scan_depth_int = DEFAULT_NETWORK_SCAN_DEPTH
         except ValueError:
             network_scan_depth_int = DEFAULT_NETWORK_SCAN_DEPTH
-
+        try:
+            scan_threads_int = int(self.scan_threads_edit.text())
+            if not (1 <= scan_threads_int <= 32): # Validate range
+                scan_threads_int = DEFAULT_SCAN_THREADS
+        except ValueError:
+            scan_threads_int = DEFAULT_SCAN_THREADS
+        try:
+            scan_processes_int = int(self.scan_processes_edit.text())
+            if not (0 <= scan_processes_int <= 64): # Validate range
+                scan_processes_int = DEFAULT_SCAN_PROCESSES
+        except ValueError:
+            scan_processes_int = DEFAULT_SCAN_PROCESSES
+        scan_index_enabled = self.scan_index_enabled_checkbox.isChecked()
+        scan_window_mode = self.scan_window_combo.currentData()
+        scan_window_value = self.scan_window_value_edit.text().strip() if scan_window_mode != SCAN_WINDOW_TODAY else ""
+        scan_prune_old_dirs = self.scan_prune_old_dirs_checkbox.isChecked()
+        parse_cache_persist = self.parse_cache_persist_checkbox.isChecked()
+        try:
+            scan_cache_ttl = max(0, int(self.scan_cache_ttl_edit.text()))
+        except ValueError:
+            scan_cache_ttl = DEFAULT_SCAN_CACHE_TTL_SECS
 
         errors = []
         if not watch_folder:
@@ -655,6 +1144,11 @@ class SettingsDialog(QDialog):
 
         if not target_folder_cam: errors.append("Target Folder (CAM) cannot be empty.")
 
+        try:
+            scan_window_bounds(scan_window_mode, scan_window_value)
+        except (ValueError, TypeError) as e_window:
+            errors.append(f"Invalid Scan Window value '{scan_window_value}': {e_window}")
+
         if auto_send_enabled and not target_folder_print:
             warning_msg = ("Warning: Auto-Send is enabled, but the Target (Print) folder is not set. "
                            "Automatic sending of print files will be disabled.")
@@ -682,10 +1176,23 @@ class SettingsDialog(QDialog):
         self.settings.setValue(SETTINGS_ARCHIVE_ENABLED, archive_enabled)
         self.settings.setValue(SETTINGS_LIVE_NOTIFY_ENABLED, live_notify_enabled)
         self.settings.setValue(SETTINGS_NOTIFICATION_DEBOUNCE_SECS, notify_debounce)
+        self.settings.setValue(SETTINGS_WATCHER_QUIET_SECS, watcher_quiet)
+        self.settings.setValue(SETTINGS_WATCHER_MODE, watcher_mode)
+        self.settings.setValue(SETTINGS_WATCHER_POLL_SECS, watcher_poll)
+        self.settings.setValue(SETTINGS_WATCHER_ACTIVE_DAYS, watcher_active_days)
         self.settings.setValue(SETTINGS_AUTO_SEND_ENABLED, auto_send_enabled)
         self.settings.setValue(SETTINGS_DUPLICATE_CHECK_ACTION, duplicate_action)
         self.settings.setValue(SETTINGS_AUTO_DUPLICATE_ACTION, auto_duplicate_action)
+        self.settings.setValue(SETTINGS_AUTO_SEND_STABLE_SECS, auto_send_stable)
         self.settings.setValue(SETTINGS_NETWORK_SCAN_DEPTH, network_scan_depth_int)
+        self.settings.setValue(SETTINGS_SCAN_THREADS, scan_threads_int)
+        self.settings.setValue(SETTINGS_SCAN_PROCESSES, scan_processes_int)
+        self.settings.setValue(SETTINGS_SCAN_INDEX_ENABLED, scan_index_enabled)
+        self.settings.setValue(SETTINGS_SCAN_WINDOW_MODE, scan_window_mode)
+        self.settings.setValue(SETTINGS_SCAN_WINDOW_VALUE, scan_window_value)
+        self.settings.setValue(SETTINGS_SCAN_PRUNE_OLD_DIRS, scan_prune_old_dirs)
+        self.settings.setValue(SETTINGS_SCAN_CACHE_TTL_SECS, scan_cache_ttl)
+        self.settings.setValue(SETTINGS_PARSE_CACHE_PERSIST, parse_cache_persist)
 
 
         if KEYBOARD_AVAILABLE:
@@ -1094,14 +1601,18 @@ class NotificationDialog(QDialog):
         if self.main_window:
             # Call main window's send function, passing is_auto=True
             # so it uses the automatic duplicate handling setting.
-            success = self.main_window.send_cam_for_project(self.item_data, is_auto=True)
-            if success:
-                self.send_cam_button.setText("Sent CAM ✓")
-                self.send_cam_button.setEnabled(False)
-            else:
-                 self._reset_send_cam_button() # Re-enable if sending failed
+            self.send_cam_button.setText("Sending CAM...")
+            self.send_cam_button.setEnabled(False)
+            if not self.main_window.send_cam_for_project(self.item_data, is_auto=True, on_finished=self._cam_send_finished):
+                 self._reset_send_cam_button() # Re-enable if sending could not start
         # DO NOT CLOSE the dialog
 
+    def _cam_send_finished(self, success):
+        try:
+            if success: self.send_cam_button.setText("Sent CAM ✓")
+            else: self._reset_send_cam_button() # Re-enable if sending failed
+        except RuntimeError: pass # dialog closed while the files were copied
+
     def _reset_send_cam_button(self):
         """Resets the Send CAM button text and enabled state."""
         self.send_cam_button.setText("Send to CAM")
@@ -1111,14 +1622,18 @@ class NotificationDialog(QDialog):
     def do_send_print(self):
         if self.main_window:
             # Pass is_auto=True for silent duplicate check based on auto setting
-            success = self.main_window.send_print_for_project(self.item_data, is_auto=True)
-            if success:
-                self.send_print_button.setText("Sent Print ✓")
-                self.send_print_button.setEnabled(False)
-            else:
-                self._reset_send_print_button() # Re-enable if sending failed
+            self.send_print_button.setText("Sending Print...")
+            self.send_print_button.setEnabled(False)
+            if not self.main_window.send_print_for_project(self.item_data, is_auto=True, on_finished=self._print_send_finished):
+                self._reset_send_print_button() # Re-enable if sending could not start
         # DO NOT CLOSE the dialog
 
+    def _print_send_finished(self, success):
+        try:
+            if success: self.send_print_button.setText("Sent Print ✓")
+            else: self._reset_send_print_button() # Re-enable if sending failed
+        except RuntimeError: pass # dialog closed while the files were copied
+
     def _reset_send_print_button(self):
         """Resets the Send Print button text and enabled state."""
         self.send_print_button.setText("Send to Print")
@@ -1148,12 +1663,14 @@ class NotificationDialog(QDialog):
 # the main window class
 class MainWindow(QMainWindow):
     last_failed_items = [] # maybe for retry later? (not used now)
+    watcher_batch_requested = pyqtSignal(list, dict) # folders, settings snapshot -> WatcherWorker.process_folders
+    watcher_poll_requested = pyqtSignal(dict)        # settings snapshot -> WatcherWorker.poll_stability
     current_stl_viewer = None # reference to the viewer dialog if open
     active_notification_dialog = None # reference to the notification popup if open
-    recently_notified_projects = {} # track last notify time per folder path {folder_path: timestamp}
     auto_send_status = {} # track auto-sends today {folder_path: {"cam_sent": bool, "print_sent": bool, "date": "YYYY-MM-DD"}}
     scan_thread = None # For QThread
     scan_worker = None # For ScanWorker
+    SCAN_CANCEL_WAIT_MS = 250 # how long a superseded scan gets to wind down before the new one starts
 
     class DuplicateAction:
         ASK = 0
@@ -1174,6 +1691,45 @@ class MainWindow(QMainWindow):
         self.is_operation_running = False
         self.scan_thread = None # Initialize scan_thread
         self.scan_worker = None # Initialize scan_worker
+        self.retired_scans = [] # (thread, worker) of cancelled scans still winding down; kept alive until finished
+        self.scan_result_cache = ScanResultCache() # TTL set by load_app_settings
+        self.parse_cache = ProjectParseCache() # parsed .dentalProject data, shared by scans and watcher triggers
+        self.watcher_queue = WatcherEventQueue() # changed project folders waiting for their batched rescan
+        self.recently_notified_projects = DebounceMap(DEFAULT_NOTIFICATION_DEBOUNCE_SECS) # last notify time per folder; TTL = notify cooldown
+        self.watcher_flush_timer = QTimer(self) # fires when the next queued folder has gone quiet
+        self.watcher_flush_timer.setSingleShot(True)
+        self.watcher_flush_timer.timeout.connect(self._flush_watcher_queue)
+        self.stability_tracker = FileStabilityTracker() # holds auto-send until the files stop changing
+        self.stability_timer = QTimer(self)
+        self.stability_timer.setSingleShot(True)
+        self.stability_timer.timeout.connect(self._poll_file_stability)
+        self.watcher_busy = False # a request is running on the watcher worker thread
+        self.watcher_thread = QThread() # watcher triggers are rescanned, decided and copied here
+        self.self_writes = SelfWriteSuppressor() # our own copies/moves, ignored by the file watcher
+        self.copy_signal_emitter = CopySignalEmitter()
+        self.copy_engine = CopyEngine(self_writes=self.self_writes, # all sends are copied on its threads
+                                      on_started=self.copy_signal_emitter.job_started.emit,
+                                      on_progress=self.copy_signal_emitter.job_progress.emit,
+                                      on_finished=self.copy_signal_emitter.job_finished.emit)
+        self.copy_jobs = {} # job_id -> summary context of the jobs submitted from the GUI
+        self.auto_sends_in_flight = set() # (folder_path, kind) of auto-sends the GUI has submitted and not finished
+        self.copy_signal_emitter.job_started.connect(self._handle_copy_job_progress)
+        self.copy_signal_emitter.job_progress.connect(self._handle_copy_job_progress)
+        self.copy_signal_emitter.job_finished.connect(self._handle_copy_job_finished)
+        self.watcher_worker = WatcherWorker(self.parse_cache, self.stability_tracker, self.self_writes, self.copy_engine)
+        self.watcher_worker.moveToThread(self.watcher_thread)
+        self.watcher_batch_requested.connect(self.watcher_worker.process_folders)
+        self.watcher_poll_requested.connect(self.watcher_worker.poll_stability)
+        self.watcher_worker.auto_send_started.connect(self._handle_auto_send_started)
+        self.watcher_worker.auto_send_finished.connect(self._handle_auto_send_finished)
+        self.watcher_worker.auto_send_needs_gui.connect(self._handle_auto_send_needs_gui)
+        self.watcher_worker.archive_finished.connect(self._record_archive_result)
+        self.watcher_worker.project_processed.connect(self._handle_watcher_project)
+        self.watcher_worker.batch_finished.connect(self._handle_watcher_batch_finished)
+        self.watcher_thread.start()
+        self.scan_cache_key = None # cache key of the running scan
+        self.scan_revalidating = False # True while the table shows earlier rows and the scan only patches them
+        self.table_scan_key = None # cache key of the scan whose results the table shows
 
         self.fs_observer = None
         self.fs_event_handler = None
@@ -1185,6 +1741,7 @@ class MainWindow(QMainWindow):
 
         self.load_app_settings()
         self.load_auto_send_status() # load status from json file
+        if self.parse_cache_persist: self.parse_cache.load(PARSE_CACHE_FILE)
         self.init_ui()
         self.init_tray_icon()
         self.apply_styles()
@@ -1235,13 +1792,32 @@ class MainWindow(QMainWindow):
                                                        type=bool)
         self.notify_debounce_secs = self.settings.value(SETTINGS_NOTIFICATION_DEBOUNCE_SECS,
                                                         DEFAULT_NOTIFICATION_DEBOUNCE_SECS, type=int)
+        self.recently_notified_projects.ttl_secs = self.notify_debounce_secs
+        self.watcher_quiet_secs = self.settings.value(SETTINGS_WATCHER_QUIET_SECS, DEFAULT_WATCHER_QUIET_SECS, type=int)
+        self.watcher_queue.quiet_secs = self.watcher_quiet_secs
+        self.watcher_mode = self.settings.value(SETTINGS_WATCHER_MODE, DEFAULT_WATCHER_MODE)
+        self.watcher_poll_secs = self.settings.value(SETTINGS_WATCHER_POLL_SECS, DEFAULT_WATCHER_POLL_SECS, type=int)
+        self.watcher_active_days = self.settings.value(SETTINGS_WATCHER_ACTIVE_DAYS, DEFAULT_WATCHER_ACTIVE_DAYS, type=int)
         self.auto_send_enabled = self.settings.value(SETTINGS_AUTO_SEND_ENABLED, DEFAULT_AUTO_SEND_ENABLED, type=bool)
         self.duplicate_check_action_setting = self.settings.value(SETTINGS_DUPLICATE_CHECK_ACTION,
                                                                   DEFAULT_DUPLICATE_CHECK_ACTION)
         self.auto_duplicate_action_setting = self.settings.value(SETTINGS_AUTO_DUPLICATE_ACTION,
                                                                 DEFAULT_AUTO_DUPLICATE_ACTION)
+        self.auto_send_stable_secs = self.settings.value(SETTINGS_AUTO_SEND_STABLE_SECS, DEFAULT_AUTO_SEND_STABLE_SECS, type=int)
+        self.stability_tracker.stable_secs = self.auto_send_stable_secs
         self.network_scan_depth = self.settings.value(SETTINGS_NETWORK_SCAN_DEPTH,
                                                       DEFAULT_NETWORK_SCAN_DEPTH, type=int)
+        self.scan_index_enabled = self.settings.value(SETTINGS_SCAN_INDEX_ENABLED,
+                                                      DEFAULT_SCAN_INDEX_ENABLED, type=bool)
+        self.scan_threads = self.settings.value(SETTINGS_SCAN_THREADS, DEFAULT_SCAN_THREADS, type=int)
+        self.scan_processes = self.settings.value(SETTINGS_SCAN_PROCESSES, DEFAULT_SCAN_PROCESSES, type=int)
+        self.scan_window_mode = self.settings.value(SETTINGS_SCAN_WINDOW_MODE, DEFAULT_SCAN_WINDOW_MODE)
+        self.scan_window_value = self.settings.value(SETTINGS_SCAN_WINDOW_VALUE, DEFAULT_SCAN_WINDOW_VALUE)
+        self.scan_prune_old_dirs = self.settings.value(SETTINGS_SCAN_PRUNE_OLD_DIRS, DEFAULT_SCAN_PRUNE_OLD_DIRS, type=bool)
+        self.scan_window_label = describe_scan_window(self.scan_window_mode, self.scan_window_value)
+        self.scan_cache_ttl_secs = self.settings.value(SETTINGS_SCAN_CACHE_TTL_SECS, DEFAULT_SCAN_CACHE_TTL_SECS, type=int)
+        self.scan_result_cache.ttl_secs = self.scan_cache_ttl_secs
+        self.parse_cache_persist = self.settings.value(SETTINGS_PARSE_CACHE_PERSIST, DEFAULT_PARSE_CACHE_PERSIST, type=bool)
 
 
     def reload_settings_and_update_ui(self):
@@ -1251,6 +1827,7 @@ class MainWindow(QMainWindow):
         old_auto_send_enabled = self.auto_send_enabled
         old_watch_folder = self.watch_folder
         old_notify_debounce = self.notify_debounce_secs
+        old_watcher_mode = (self.watcher_mode, self.watcher_poll_secs, self.watcher_active_days)
 
         self.load_app_settings()
 
@@ -1262,9 +1839,14 @@ class MainWindow(QMainWindow):
                 self.live_notify_enabled != old_live_notify_enabled or
                 self.auto_send_enabled != old_auto_send_enabled or
                 self.watch_folder != old_watch_folder or
-                self.notify_debounce_secs != old_notify_debounce # Debounce change also requires restart/update logic
+                self.notify_debounce_secs != old_notify_debounce or # Debounce change also requires restart/update logic
+                (self.watcher_mode, self.watcher_poll_secs, self.watcher_active_days) != old_watcher_mode
         )
 
+        if self.watch_folder != old_watch_folder:
+            self.watcher_queue.clear() # queued and held folders belong to the old Watch Folder
+            self.stability_tracker.clear()
+
         if watcher_settings_changed:
             print("[Settings] Watcher-relevant settings changed, restarting watcher...")
             self.stop_file_watcher()
@@ -1490,6 +2072,13 @@ class MainWindow(QMainWindow):
         self.auto_dup_status_label = QLabel(); self.auto_dup_status_label.setObjectName("statusBarLabel")
         self.network_depth_status_label = QLabel(); self.network_depth_status_label.setObjectName("statusBarLabel") # New status label
         self.hotkey_status_label = QLabel(); self.hotkey_status_label.setObjectName("statusBarLabel")
+        self.copy_progress_bar = QProgressBar(); self.copy_progress_bar.setRange(0, 100)
+        self.copy_progress_bar.setMaximumWidth(140); self.copy_progress_bar.hide()
+        self.copy_cancel_button = QPushButton("✕"); self.copy_cancel_button.setToolTip("Cancel all running and queued transfers")
+        self.copy_cancel_button.setMaximumWidth(28); self.copy_cancel_button.hide()
+        self.copy_cancel_button.clicked.connect(self.cancel_copy_jobs)
+        self.statusBar.addPermanentWidget(self.copy_progress_bar)
+        self.statusBar.addPermanentWidget(self.copy_cancel_button)
         self.statusBar.addPermanentWidget(self.watch_status_label)
         self.statusBar.addPermanentWidget(self.cam_target_status_label)
         self.statusBar.addPermanentWidget(self.print_target_status_label)
@@ -1680,10 +2269,21 @@ class MainWindow(QMainWindow):
 
         network_depth_display_val = "Unlimited" if self.network_scan_depth == 0 else str(self.network_scan_depth)
         network_depth_display = f"ScanDepth: {network_depth_display_val}"
+        if self.scan_processes > 1: network_depth_display += f" ({self.scan_processes} procs)"
+        elif self.scan_index_enabled: network_depth_display += " (Indexed)"
 
 
         self.watch_status_label.setText(f"👁️ Watch: {watch_display}")
-        self.watch_status_label.setToolTip(self.watch_folder if self.watch_folder else "Watch folder not set")
+        watch_tooltip = self.watch_folder if self.watch_folder else "Watch folder not set"
+        if isinstance(self.fs_observer, SnapshotPollingObserver):
+            poll_stats = self.fs_observer.stats
+            watch_tooltip += (f"\nPolling every {self.fs_observer.poll_secs}s: {len(self.fs_observer)} folder(s), "
+                              f"{poll_stats.get('polls', 0)} poll(s), {poll_stats.get('events', 0)} change(s) found")
+        watch_set = getattr(self.fs_event_handler, "watch_set", None)
+        if watch_set is not None:
+            watch_tooltip += (f"\n{len(watch_set)} watch(es) on folders active in the last {watch_set.active_days} day(s), "
+                              f"{watch_set.stats.get('promoted', 0)} new folder(s) added since start")
+        self.watch_status_label.setToolTip(watch_tooltip)
 
         self.cam_target_status_label.setText(f"➡️ CAM: {cam_target_display}")
         self.cam_target_status_label.setToolTip(self.target_folder_cam if self.target_folder_cam else "Target (CAM) folder not set")
@@ -1697,6 +2297,9 @@ class MainWindow(QMainWindow):
         self.live_notify_status_label.setText(live_notify_display)
         notify_tooltip = "Live file change notifications disabled."
         if self.live_notify_enabled: notify_tooltip = f"Show popup on file change (Cooldown: {self.notify_debounce_secs}s)" if WATCHDOG_AVAILABLE else "Live notifications disabled (requires 'watchdog')"
+        path_debounce = WatcherEventHandler.last_processed_time
+        notify_tooltip += (f"\nDebounce memory: {len(path_debounce)} file path(s), {len(self.recently_notified_projects)} folder(s), "
+                           f"~{(path_debounce.memory_bytes() + self.recently_notified_projects.memory_bytes()) / 1024:.1f} KB")
         self.live_notify_status_label.setToolTip(notify_tooltip)
 
         self.auto_send_status_label.setText(auto_send_display)
@@ -1710,9 +2313,15 @@ class MainWindow(QMainWindow):
         self.auto_dup_status_label.setToolTip(autodup_tooltip + f"\nCurrent: {self.auto_duplicate_action_setting.capitalize()}")
 
         self.network_depth_status_label.setText(network_depth_display)
-        depth_tooltip = f"Watch Folder scan depth: {network_depth_display_val} levels."
+        depth_tooltip = f"Watch Folder scan depth: {network_depth_display_val} levels, {self.scan_threads} scan thread(s)."
         if self.network_scan_depth == 0: depth_tooltip += " (Deepest scan, potentially slow on network drives)"
         else: depth_tooltip += " (Limited depth for faster network scans)"
+        if self.scan_processes > 1: depth_tooltip += f"\nProcess pool scan mode: {self.scan_processes} worker processes"
+        elif self.scan_index_enabled: depth_tooltip += f"\nIncremental scans ON: unchanged folders reused from {SCAN_INDEX_FILE}"
+        depth_tooltip += (f"\nParsed project cache: {len(self.parse_cache)} projects, {self.parse_cache.stats['hits']} hits / "
+                          f"{self.parse_cache.stats['misses']} misses" + (f" (saved to {PARSE_CACHE_FILE})" if self.parse_cache_persist else ""))
+        depth_tooltip += f"\nScan window: projects modified {self.scan_window_label}"
+        if self.scan_prune_old_dirs and self.scan_index_enabled: depth_tooltip += " (indexed project folders unchanged since the window start are skipped)"
         self.network_depth_status_label.setToolTip(depth_tooltip)
 
 
@@ -1802,7 +2411,7 @@ class MainWindow(QMainWindow):
 
     def handle_hotkey_press(self):
         """Handles the signal from the HotkeyListener thread."""
-        if not self.is_operation_running: # Removed is_listener_intentionally_stopped check here as the listener's 'enabled' flag handles it
+        if not self.is_operation_running or self._scan_in_progress(): # a running scan is superseded by the new one; Removed is_listener_intentionally_stopped check here as the listener's 'enabled' flag handles it
             print(f"Hotkey '{self.hotkey_combo}' detected, triggering scan...")
             self.show_window() # Bring window to front
             QTimer.singleShot(50, self.scan_and_show) # Delay slightly to ensure window shows first
@@ -1814,9 +2423,6 @@ class MainWindow(QMainWindow):
     def handle_filesystem_change(self, changed_path):
         """Handles the signal from Watchdog when a relevant file changes."""
         print(f"[Watcher Trigger] Received signal for path: {changed_path}")
-        if self.is_operation_running:
-            print("[Watcher Trigger] Ignored: Another operation is running.")
-            return
         if not WATCHDOG_AVAILABLE:
             print("[Watcher Trigger] Ignored: Watchdog library not available.")
             return
@@ -1838,115 +2444,146 @@ class MainWindow(QMainWindow):
         if not self.live_notify_enabled and not self.auto_send_enabled:
             return
 
-        now = time.time()
-        notification_debounce_passed = True
-        folder_display_name = os.path.basename(folder_path_norm)
-
-        if self.live_notify_enabled:
-            last_notify_time = self.recently_notified_projects.get(folder_path_norm, 0)
-            elapsed = now - last_notify_time
-            if elapsed < self.notify_debounce_secs:
-                notification_debounce_passed = False
-                print(f"[Watcher Trigger] Notification debounce active for '{folder_display_name}'. {elapsed:.1f}s < {self.notify_debounce_secs}s")
-            else:
-                print(f"[Watcher Trigger] Notification debounce passed for '{folder_display_name}'.")
-                pass # We will update the timestamp in the processing function
-
-        print(f"[Watcher Trigger] Scheduling processing for '{folder_display_name}'...")
-        QTimer.singleShot(750, lambda: self._process_change_trigger(folder_path_norm, notification_debounce_passed))
-
-    def _process_change_trigger(self, folder_path_norm, notification_debounce_passed):
-        """Scans the specific folder and decides whether to notify or auto-send."""
-        folder_display_name = os.path.basename(folder_path_norm)
-        print(f"[Watcher Process] Processing trigger for: {folder_display_name}")
-
-        if self.is_operation_running:
-            print(f"[Watcher Process] Skipped processing '{folder_display_name}': Another operation is running.")
+        # Events are coalesced per project folder; the folder is rescanned once it has gone quiet
+        self.watcher_queue.add(folder_path_norm)
+        self._schedule_watcher_flush()
+
+    def _schedule_watcher_flush(self, delay_ms=None):
+        """(Re)starts the flush timer for the next queued folder that goes quiet."""
+        if delay_ms is None:
+            delay_secs = self.watcher_queue.seconds_until_due()
+            if delay_secs is None:
+                return # nothing queued
+            delay_ms = int(delay_secs * 1000) + 50
+        self.watcher_flush_timer.start(delay_ms)
+
+    def _flush_watcher_queue(self):
+        """Hands all queued folders that have gone quiet to the watcher worker as one batch."""
+        if self.is_operation_running or self.watcher_busy:
+            self._schedule_watcher_flush(1000) # queued folders wait for the running operation
             return
 
-        found_projects = scan_directory(self.watch_folder, target_folder=folder_path_norm)
-
-        if not found_projects:
-            print(f"[Watcher Process] Scan found no project data in '{folder_display_name}'. Cannot process trigger.")
+        due_folders = self.watcher_queue.pop_due()
+        if due_folders:
+            print(f"[Watcher Queue] Rescanning {len(due_folders)} folder(s) for {sum(due_folders.values())} change event(s)...")
+            self.watcher_busy = True
+            self.watcher_batch_requested.emit(list(due_folders), self._watcher_config())
+        else:
+            self._schedule_watcher_flush()
+
+    def _schedule_stability_poll(self, delay_ms=None):
+        """(Re)starts the timer for the next file stability poll of a held folder."""
+        if delay_ms is None:
+            delay_secs = self.stability_tracker.seconds_until_poll()
+            if delay_secs is None:
+                return # nothing held
+            delay_ms = int(delay_secs * 1000) + 10
+        self.stability_timer.start(delay_ms)
+
+    def _poll_file_stability(self):
+        """Asks the watcher worker to re-check the files of folders held back from auto-send."""
+        if self.is_operation_running or self.watcher_busy:
+            self._schedule_stability_poll(1000)
             return
+        self.watcher_busy = True
+        self.watcher_poll_requested.emit(self._watcher_config())
 
-        item_data = found_projects[0]
+    def _watcher_config(self):
+        """Snapshot of the settings and today's auto-send status the watcher worker decides with."""
+        today_str = datetime.date.today().isoformat()
+        auto_sent_today = {}
+        for folder_path, status in self.auto_send_status.items():
+            if isinstance(status, dict) and status.get("date") == today_str:
+                auto_sent_today[folder_path] = tuple(kind for kind in ("cam", "print") if status.get(f"{kind}_sent"))
+        return {
+            "watch_folder": self.watch_folder,
+            "live_notify_enabled": self.live_notify_enabled,
+            "auto_send_enabled": self.auto_send_enabled,
+            "target_folder_cam": self.target_folder_cam,
+            "target_folder_print": self.target_folder_print,
+            "auto_duplicate_action": self.auto_duplicate_action_setting,
+            "archive_enabled": self.archive_enabled,
+            "last_archive_dates": {"CAM": self.settings.value(SETTINGS_LAST_ARCHIVE_DATE_CAM, ""),
+                                   "Print": self.settings.value(SETTINGS_LAST_ARCHIVE_DATE_PRINT, "")},
+            "auto_sent_today": auto_sent_today,
+            "auto_sends_in_flight": frozenset(self.auto_sends_in_flight),
+        }
+
+    def _handle_watcher_batch_finished(self):
+        self.watcher_busy = False
+        self._schedule_watcher_flush()
+        self._schedule_stability_poll()
+
+    def _handle_auto_send_started(self, folder_path_norm, kind, display_name):
+        label = "CAM" if kind == "cam" else "Print"
+        print(f"[Watcher Process] Auto-sending {label} for: {display_name}")
+        self.statusBar.showMessage(f"🤖 Auto-sending {label}: {display_name}...", 0)
+
+    def _handle_auto_send_finished(self, folder_path_norm, kind, success, operation_stats):
+        label = "CAM" if kind == "cam" else "Print"
+        display_name = operation_stats.get("project_name", os.path.basename(folder_path_norm))
+        if success:
+            self.update_auto_send_status(folder_path_norm, kind) # Mark as sent *after* success
+            print(f"Auto-Send {label} successful for {display_name}: {operation_stats['copied']} copied, {operation_stats['skipped']} skipped.")
+        elif operation_stats.get("cancelled"):
+            print(f"Auto-Send {label} cancelled for {display_name}.")
+        else:
+            print(f"Auto-Send {label} failed for {display_name}. Errors: {len(operation_stats['errors'])}. Check logs.")
+        if not self.copy_engine.jobs(): self.statusBar.clearMessage()
+
+    def _handle_auto_send_needs_gui(self, folder_path_norm, kind, item_data):
+        """
+        Auto-sends that may have to ask about duplicates or the target folder run here, as before.
+        One per project and kind is in flight until its copy job finishes; while another operation
+        is running, the folder is queued again instead of being dropped.
+        """
+        key = (folder_path_norm, kind)
+        if self.has_been_auto_sent(folder_path_norm, kind) or key in self.auto_sends_in_flight:
+            return # sent meanwhile, or still being copied
+        if self.is_operation_running:
+            print(f"[Watcher Process] Auto-Send for '{os.path.basename(folder_path_norm)}' waits for the running operation.")
+            self.watcher_queue.add(folder_path_norm)
+            self._schedule_watcher_flush()
+            return
+        self.auto_sends_in_flight.add(key)
+        send_for_project = self.send_cam_for_project if kind == "cam" else self.send_print_for_project
+        if not send_for_project(item_data, is_auto=True, # is_auto=True uses auto duplicate setting
+                                on_finished=partial(self._mark_auto_sent, folder_path_norm, kind)):
+            self.auto_sends_in_flight.discard(key) # not sent (declined, files missing); the next trigger tries again
+
+    def _mark_auto_sent(self, folder_path_norm, kind, success):
+        self.auto_sends_in_flight.discard((folder_path_norm, kind))
+        if success:
+            self.update_auto_send_status(folder_path_norm, kind) # Mark as sent *after* success
+
+    def _handle_watcher_project(self, folder_path_norm, item_data, auto_send_handled):
+        """Shows the notification popup for a processed watcher trigger, unless an auto-send covered it."""
+        folder_display_name = os.path.basename(folder_path_norm)
         patient_name = item_data.get('patient', folder_display_name) # Use folder name as fallback
+        if not self.live_notify_enabled:
+            if not auto_send_handled:
+                print(f"[Watcher Process] No action taken for '{patient_name}' on this trigger (check logs above for reasons).")
+            return
+        if auto_send_handled:
+            print(f"[Watcher Process] Auto-send completed for '{patient_name}'. Notification skipped for this trigger.")
+            return
 
-        can_auto_send_cam = False
-        can_auto_send_print = False
-        can_notify = False
-
-        cam_ready = item_data.get('has_cad', False) and item_data.get('has_info', False)
-        cam_target_ok = bool(self.target_folder_cam)
-        already_sent_cam = self.has_been_auto_sent(folder_path_norm, "cam")
-        if self.auto_send_enabled and cam_ready and cam_target_ok and not already_sent_cam:
-            can_auto_send_cam = True
-        elif self.auto_send_enabled:
-             reasons = []
-             if not cam_ready: reasons.append("CAM files not ready")
-             if not cam_target_ok: reasons.append("CAM target not set")
-             if already_sent_cam: reasons.append("Already sent CAM today")
-             if reasons: print(f"[Watcher Process] Cannot Auto-Send CAM for '{patient_name}': {', '.join(reasons)}")
-
-
-        print_ready = item_data.get('has_models', False)
-        print_target_ok = bool(self.target_folder_print)
-        already_sent_print = self.has_been_auto_sent(folder_path_norm, "print")
-        if self.auto_send_enabled and print_ready and print_target_ok and not already_sent_print:
-            can_auto_send_print = True
-        elif self.auto_send_enabled:
-             reasons = []
-             if not print_ready: reasons.append("Print files not ready")
-             if not print_target_ok: reasons.append("Print target not set")
-             if already_sent_print: reasons.append("Already sent Print today")
-             if reasons: print(f"[Watcher Process] Cannot Auto-Send Print for '{patient_name}': {', '.join(reasons)}")
-
-
+        elapsed = self.recently_notified_projects.age(folder_path_norm) # None once the cooldown has expired
+        notification_debounce_passed = elapsed is None or elapsed >= self.notify_debounce_secs
         popup_active = self.active_notification_dialog and self.active_notification_dialog.isVisible()
-        if self.live_notify_enabled and notification_debounce_passed and not popup_active:
-            can_notify = True
-        elif self.live_notify_enabled:
+        if not notification_debounce_passed or popup_active:
             reasons = []
-            if not notification_debounce_passed: reasons.append("Debounce active")
+            if not notification_debounce_passed: reasons.append(f"Debounce active ({elapsed:.1f}s < {self.notify_debounce_secs}s)")
             if popup_active: reasons.append("Another popup active")
-            if reasons: print(f"[Watcher Process] Cannot Notify for '{patient_name}': {', '.join(reasons)}")
-
-        action_taken_this_trigger = False
-
-        if can_auto_send_cam:
-            print(f"[Watcher Process] Auto-sending CAM for: {patient_name}")
-            self.statusBar.showMessage(f"🤖 Auto-sending CAM: {patient_name}...", 5000)
-            QCoreApplication.processEvents()
-            success = self.send_cam_for_project(item_data, is_auto=True) # is_auto=True uses auto duplicate setting
-            if success:
-                self.update_auto_send_status(folder_path_norm, "cam") # Mark as sent *after* success
-                action_taken_this_trigger = True
-            self.statusBar.clearMessage() # Clear status bar after action
-
-        if can_auto_send_print:
-            print(f"[Watcher Process] Auto-sending Print for: {patient_name}")
-            self.statusBar.showMessage(f"🤖 Auto-sending Print: {patient_name}...", 5000)
-            QCoreApplication.processEvents()
-            success = self.send_print_for_project(item_data, is_auto=True) # is_auto=True
-            if success:
-                self.update_auto_send_status(folder_path_norm, "print")
-                action_taken_this_trigger = True
-            self.statusBar.clearMessage()
-
-        if can_notify and not action_taken_this_trigger:
-            print(f"[Watcher Process] Showing notification for project: {patient_name}")
-            self.recently_notified_projects[folder_path_norm] = time.time()
-
-            self.active_notification_dialog = NotificationDialog(item_data, self, parent=self)
-            self.active_notification_dialog.finished.connect(self._notification_dialog_closed)
-            self.active_notification_dialog.show()
-
-        elif can_notify and action_taken_this_trigger:
-            print(f"[Watcher Process] Auto-send completed for '{patient_name}'. Notification skipped for this trigger.")
+            print(f"[Watcher Process] Cannot Notify for '{patient_name}': {', '.join(reasons)}")
+            return
 
-        elif not can_notify and not can_auto_send_cam and not can_auto_send_print:
-             print(f"[Watcher Process] No action taken for '{patient_name}' on this trigger (check logs above for reasons).")
+        print(f"[Watcher Process] Showing notification for project: {patient_name}")
+        self.recently_notified_projects.touch(folder_path_norm)
+
+        self.active_notification_dialog = NotificationDialog(item_data, self, parent=self)
+        self.active_notification_dialog.finished.connect(self._notification_dialog_closed)
+        self.active_notification_dialog.show()
 
 
     def _notification_dialog_closed(self, result_code):
@@ -1962,121 +2599,302 @@ class MainWindow(QMainWindow):
             print(f"Error disconnecting notification finished signal: {e}")
 
     # manual/hotkey scan function
+    def _scan_in_progress(self):
+        """True while a (non-cancelled) ScanWorker is running."""
+        return self.scan_thread is not None and self.scan_thread.isRunning()
+
+    def _cancel_running_scan(self, wait_ms=SCAN_CANCEL_WAIT_MS):
+        """
+        Cooperatively cancels the current scan (no QThread.terminate). The worker stops at the next
+        folder; folders it already listed stay in the scan index for the next scan to reuse.
+        The thread is kept referenced until it has finished.
+        """
+        if not self._scan_in_progress():
+            return
+        print("Cancelling previous scan...")
+        self.scan_worker.cancel()
+        self.retired_scans.append((self.scan_thread, self.scan_worker))
+        if self.scan_thread.wait(wait_ms): # normally stops within a few ms
+            self._cache_partial_scan(self.scan_worker) # before the replacing scan looks up the cache
+        else:
+            print(f"Previous scan still winding down after {wait_ms} ms (blocked on a slow listing); continuing.")
+        self.scan_thread = None
+        self.scan_worker = None
+
     def scan_and_show(self):
         """Performs the full directory scan in a background thread and populates the table."""
-        if self.is_operation_running:
+        if self.is_operation_running and not self._scan_in_progress():
             print("Scan skipped: Another operation is already running.")
             self.statusBar.showMessage("Scan skipped: Operation in progress.", 3000)
             return
         if not self.check_folders_exist():  # check_folders_exist shows its own message
             return
 
+        # A newer scan supersedes the running one
+        self._cancel_running_scan()
+
         self.is_operation_running = True
         self.update_button_state()  # Disable buttons during scan
-        self.statusBar.showMessage(f"Scanning '{shorten_path(self.watch_folder)}' for projects modified today...", 0)  # Persistent message
-        self.info_label.setText(f"Scanning '{shorten_path(self.watch_folder)}'...")
-        self.table_widget.setRowCount(0) # Clear table before scan
+        self.statusBar.showMessage(f"Scanning '{shorten_path(self.watch_folder)}' for projects modified {self.scan_window_label}...", 0)  # Persistent message
+
+        # Stale-while-revalidate: rows of the same scan (on screen, or cached) stay visible and
+        # the new scan only patches the differences into them
+        self.scan_cache_key = ScanResultCache.make_key(self.watch_folder, self.network_scan_depth,
+                                                       (self.scan_window_mode, self.scan_window_value),
+                                                       self.scan_prune_old_dirs)
+        if self.table_scan_key == self.scan_cache_key and self.table_widget.rowCount():
+            self.scan_revalidating = True
+            self.info_label.setText(f"Refreshing {self.table_widget.rowCount()} project(s)...")
+        else:
+            self.table_widget.setRowCount(0) # Clear table before scan
+            self.table_scan_key = None
+            cached = self.scan_result_cache.get(self.scan_cache_key)
+            if cached:
+                cached_results, cached_age, cached_partial = cached
+                self.scan_revalidating = True
+                self.table_scan_key = self.scan_cache_key
+                self._append_project_rows(cached_results)
+                source = "an interrupted scan" if cached_partial else get_relative_time(time.time() - cached_age)
+                self.info_label.setText(f"Showing {len(cached_results)} project(s) from {source}, refreshing...")
+            else:
+                self.scan_revalidating = False
+                self.info_label.setText(f"Scanning '{shorten_path(self.watch_folder)}'...")
+        previous_results = self._table_project_items() if self.scan_revalidating else []
         QCoreApplication.processEvents()  # Update UI
 
-        # Kill previous thread and worker if they exist and are running
-        if self.scan_thread and self.scan_thread.isRunning():
-            print("Terminating previous scan thread...")
-            self.scan_thread.quit() # Request termination
-            self.scan_thread.wait(2000) # Wait up to 2 seconds
-            if self.scan_thread.isRunning(): # Force terminate if still running
-                 print("Force terminating previous scan thread.")
-                 self.scan_thread.terminate()
-                 self.scan_thread.wait()
-            self.scan_thread = None
-            self.scan_worker = None
-
-
         self.scan_thread = QThread()
+        # Window bounds are computed once here; an invalid stored value falls back to today
+        try:
+            scan_window = scan_window_bounds(self.scan_window_mode, self.scan_window_value)
+        except (ValueError, TypeError) as e:
+            print(f"Invalid scan window ({self.scan_window_mode}: '{self.scan_window_value}'), using today: {e}")
+            scan_window = scan_window_bounds(SCAN_WINDOW_TODAY)
+
         # Pass network_scan_depth to ScanWorker
-        self.scan_worker = ScanWorker(self.watch_folder, self.network_scan_depth)
+        self.scan_worker = ScanWorker(self.watch_folder, self.network_scan_depth,
+                                      SCAN_INDEX_FILE if self.scan_index_enabled else None, self.scan_threads,
+                                      scan_window, self.scan_prune_old_dirs, previous_results, self.scan_processes,
+                                      self.parse_cache, self.scan_cache_key)
         self.scan_worker.moveToThread(self.scan_thread)
 
         # Connections
         self.scan_thread.started.connect(self.scan_worker.run_scan)
+        self.scan_worker.scan_batch.connect(self._handle_scan_batch)
+        self.scan_worker.scan_diff.connect(self._handle_scan_diff)
         self.scan_worker.scan_complete.connect(self._handle_scan_complete)
         self.scan_worker.scan_error.connect(self._handle_scan_error)
+        self.scan_worker.scan_cancelled.connect(self._handle_scan_cancelled)
 
         # Cleanup connections
-        self.scan_thread.finished.connect(self._finalize_scan_operation) # Central cleanup
+        self.scan_worker.finished.connect(self.scan_thread.quit) # run_scan is done, stop the thread's event loop
+        self.scan_worker.finished.connect(self.scan_worker.deleteLater)
+        self.scan_thread.finished.connect(partial(self._finalize_scan_operation, self.scan_thread)) # Central cleanup
         self.scan_thread.finished.connect(self.scan_thread.deleteLater)
-        # self.scan_worker.finished.connect(self.scan_worker.deleteLater) # QObject doesn't have a finished signal
 
         self.scan_thread.start()
 
+    def _fill_table_row(self, row, item_data):
+        """Creates the table items (text, alignment, colours, tooltip, UserRole data) for one project row."""
+        timestamp_for_sort = int(item_data["last_modified_timestamp"])
+        relative_time_str = get_relative_time(item_data["last_modified_timestamp"])
+        item_time = QTableWidgetItem(relative_time_str)
+        item_time.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        item_time.setData(Qt.ItemDataRole.UserRole + 1, timestamp_for_sort)
+        item_time.setData(Qt.ItemDataRole.UserRole, item_data)
+
+        item_patient = QTableWidgetItem(item_data["patient"])
+        item_patient.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+
+        item_work = QTableWidgetItem(item_data["work_type"])
+        item_work.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+
+        item_teeth = QTableWidgetItem(item_data["teeth"])
+        if "Full Arch" in item_data["teeth"]:
+            item_teeth.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+        else:
+            item_teeth.setTextAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
+
+        item_status = QTableWidgetItem(item_data["file_status"])
+        item_status.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        icons = item_data.get("status_icons", ("?", "?", "?"))
+        if all(i == "✓" for i in icons): item_status.setForeground(QColor("#00FF7F"))
+        elif any(i == "✓" for i in icons): item_status.setForeground(QColor("#FFD700"))
+        else: item_status.setForeground(QColor("#FF4D4D"))
+
+        self.table_widget.setItem(row, 0, item_time)
+        self.table_widget.setItem(row, 1, item_patient)
+        self.table_widget.setItem(row, 2, item_work)
+        self.table_widget.setItem(row, 3, item_teeth)
+        self.table_widget.setItem(row, 4, item_status)
+
+        tooltip_text = self.generate_row_tooltip(item_data)
+        item_time.setToolTip(tooltip_text)
+
+    def _append_project_rows(self, items):
+        """Appends project rows to the table (sorting is suspended while rows are inserted)."""
+        if not items: return
+        self.table_widget.setSortingEnabled(False) # Row indexes must stay put while items are set
+        self.table_widget.setUpdatesEnabled(False)  # Batch update start
+        try:
+            first_row = self.table_widget.rowCount()
+            self.table_widget.setRowCount(first_row + len(items))
+            for offset, item_data in enumerate(items):
+                self._fill_table_row(first_row + offset, item_data)
+        finally:
+            self.table_widget.setUpdatesEnabled(True)  # Batch update end
+            self.table_widget.setSortingEnabled(True)
+            self.table_widget.sortByColumn(0, Qt.SortOrder.DescendingOrder)
+
+    def _is_current_scan_signal(self):
+        """False for signals from a cancelled ScanWorker that were already queued when it was superseded."""
+        return self.sender() is self.scan_worker
+
+    def _table_project_items(self):
+        """The project entry dicts of all table rows, in row order."""
+        items = []
+        for row in range(self.table_widget.rowCount()):
+            item0 = self.table_widget.item(row, 0)
+            if item0: items.append(item0.data(Qt.ItemDataRole.UserRole))
+        return items
+
+    def _table_rows_by_folder(self):
+        """{folder_path: row} for the current table rows."""
+        rows = {}
+        for row in range(self.table_widget.rowCount()):
+            item0 = self.table_widget.item(row, 0)
+            item_data = item0.data(Qt.ItemDataRole.UserRole) if item0 else None
+            if item_data: rows[item_data["folder_path"]] = row
+        return rows
+
+    def _selected_folder_paths(self):
+        selected = set()
+        for index in self.table_widget.selectionModel().selectedRows():
+            item0 = self.table_widget.item(index.row(), 0)
+            item_data = item0.data(Qt.ItemDataRole.UserRole) if item0 else None
+            if item_data: selected.add(item_data["folder_path"])
+        return selected
+
+    def _restore_table_view(self, selected_folders, scroll_value):
+        """Re-selects rows by folder_path (rows may have moved) and restores the scroll position."""
+        if selected_folders != self._selected_folder_paths():
+            selection_model = self.table_widget.selectionModel()
+            selection_model.clearSelection()
+            flags = QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows
+            for folder, row in self._table_rows_by_folder().items():
+                if folder in selected_folders:
+                    selection_model.select(self.table_widget.model().index(row, 0), flags)
+        self.table_widget.verticalScrollBar().setValue(scroll_value)
+
+    def _apply_project_rows_diff(self, upserts, removed_folders=()):
+        """
+        Inserts new rows, rebuilds only rows whose entry changed and removes rows of
+        removed_folders; selection and scroll position are kept.
+        """
+        rows_by_folder = self._table_rows_by_folder()
+        removed_rows = sorted((rows_by_folder[f] for f in removed_folders if f in rows_by_folder), reverse=True)
+        if not upserts and not removed_rows: return
+        selected_folders = self._selected_folder_paths()
+        scroll_value = self.table_widget.verticalScrollBar().value()
+        self.table_widget.setSortingEnabled(False) # Row indexes must stay put while items are set
+        self.table_widget.setUpdatesEnabled(False)
+        try:
+            for row in removed_rows:
+                self.table_widget.removeRow(row)
+            if removed_rows: rows_by_folder = self._table_rows_by_folder()
+            for item_data in upserts:
+                row = rows_by_folder.get(item_data["folder_path"])
+                if row is None:
+                    row = self.table_widget.rowCount()
+                    self.table_widget.insertRow(row)
+                    rows_by_folder[item_data["folder_path"]] = row
+                elif self.table_widget.item(row, 0).data(Qt.ItemDataRole.UserRole) == item_data:
+                    continue # unchanged, keep the existing items
+                self._fill_table_row(row, item_data)
+        finally:
+            self.table_widget.setUpdatesEnabled(True)
+            self.table_widget.setSortingEnabled(True)
+            self.table_widget.sortByColumn(0, Qt.SortOrder.DescendingOrder)
+            self._restore_table_view(selected_folders, scroll_value)
+
+    def _refresh_relative_times(self):
+        """Updates the 'x min ago' text of rows that were kept from an earlier scan."""
+        for row in range(self.table_widget.rowCount()):
+            item0 = self.table_widget.item(row, 0)
+            item_data = item0.data(Qt.ItemDataRole.UserRole) if item0 else None
+            if not item_data: continue
+            relative_time_str = get_relative_time(item_data["last_modified_timestamp"])
+            if item0.text() != relative_time_str: item0.setText(relative_time_str)
+
+    def _handle_scan_batch(self, items):
+        """Adds rows streamed by the ScanWorker while the scan is still running."""
+        if not self._is_current_scan_signal(): return
+        if self.scan_revalidating: self._apply_project_rows_diff(items) # upsert into the rows already shown
+        else: self._append_project_rows(items)
+        count = self.table_widget.rowCount()
+        self.info_label.setText(f"Scanning '{shorten_path(self.watch_folder)}'... {count} project{'s' if count != 1 else ''} found so far.")
+
     def _handle_scan_complete(self, found_files_data, scan_duration):
-        """Handles successful scan results from the ScanWorker."""
+        """Handles successful scan results from the ScanWorker (rows were already added batch by batch)."""
+        if not self._is_current_scan_signal(): return
         print(f"Scan completed in {scan_duration:.2f} seconds.")
-        self.table_widget.setSortingEnabled(False) # Disable sorting during population
+        self.scan_revalidating = False
+        self.table_scan_key = self.scan_cache_key
+        self.scan_result_cache.put(self.scan_cache_key, found_files_data)
+        if self.parse_cache_persist: self.parse_cache.save(PARSE_CACHE_FILE) # no-op if nothing new was parsed
 
         if found_files_data:
             count = len(found_files_data)
             plural_s = "s" if count != 1 else ""
             viewer_info = "(Double-click row to view STLs)" if VTK_AVAILABLE else "(STL Viewer disabled)"
-            self.info_label.setText(f"Found {count} project{plural_s} modified today. {viewer_info}")
+            self.info_label.setText(f"Found {count} project{plural_s} modified {self.scan_window_label}. {viewer_info}")
             self.statusBar.showMessage(f"Scan complete: Found {count} project{plural_s}. ({scan_duration:.2f}s)", 5000)
-
-            self.table_widget.setUpdatesEnabled(False)  # Batch update start
-            try:
-                self.table_widget.setRowCount(count)  # Pre-allocate rows
-                for row, item_data in enumerate(found_files_data):
-                    timestamp_for_sort = int(item_data["last_modified_timestamp"])
-                    relative_time_str = get_relative_time(item_data["last_modified_timestamp"])
-                    item_time = QTableWidgetItem(relative_time_str)
-                    item_time.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                    item_time.setData(Qt.ItemDataRole.UserRole + 1, timestamp_for_sort)
-                    item_time.setData(Qt.ItemDataRole.UserRole, item_data)
-
-                    item_patient = QTableWidgetItem(item_data["patient"])
-                    item_patient.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-
-                    item_work = QTableWidgetItem(item_data["work_type"])
-                    item_work.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-
-                    item_teeth = QTableWidgetItem(item_data["teeth"])
-                    if "Full Arch" in item_data["teeth"]:
-                        item_teeth.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-                    else:
-                        item_teeth.setTextAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
-
-                    item_status = QTableWidgetItem(item_data["file_status"])
-                    item_status.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    icons = item_data.get("status_icons", ("?", "?", "?"))
-                    if all(i == "✓" for i in icons): item_status.setForeground(QColor("#00FF7F"))
-                    elif any(i == "✓" for i in icons): item_status.setForeground(QColor("#FFD700"))
-                    else: item_status.setForeground(QColor("#FF4D4D"))
-
-                    self.table_widget.setItem(row, 0, item_time)
-                    self.table_widget.setItem(row, 1, item_patient)
-                    self.table_widget.setItem(row, 2, item_work)
-                    self.table_widget.setItem(row, 3, item_teeth)
-                    self.table_widget.setItem(row, 4, item_status)
-
-                    tooltip_text = self.generate_row_tooltip(item_data)
-                    item_time.setToolTip(tooltip_text)
-            finally:
-                self.table_widget.setUpdatesEnabled(True)  # Batch update end
-                self.table_widget.setSortingEnabled(True)
-                self.table_widget.sortByColumn(0, Qt.SortOrder.DescendingOrder)
         else:
-            self.info_label.setText(f"No projects modified today found in '{shorten_path(self.watch_folder)}'.")
-            self.statusBar.showMessage(f"Scan complete: No projects found modified today. ({scan_duration:.2f}s)", 5000)
+            self.info_label.setText(f"No projects modified {self.scan_window_label} found in '{shorten_path(self.watch_folder)}'.")
+            self.statusBar.showMessage(f"Scan complete: No projects found modified {self.scan_window_label}. ({scan_duration:.2f}s)", 5000)
 
         self.table_widget.setSortingEnabled(True) # Ensure sorting is re-enabled
 
+    def _handle_scan_diff(self, diff):
+        """Patches the differences of a completed scan into the rows that were already shown."""
+        if not self._is_current_scan_signal(): return
+        print(f"[Scan Diff] {len(diff['added'])} added, {len(diff['changed'])} changed, "
+              f"{len(diff['removed'])} removed, {diff['unchanged']} unchanged.")
+        if self.scan_revalidating:
+            self._apply_project_rows_diff(diff["added"] + diff["changed"], diff["removed"])
+            self._refresh_relative_times()
+
     def _handle_scan_error(self, error_message, scan_duration):
         """Handles scan errors from the ScanWorker."""
+        if not self._is_current_scan_signal(): return
+        self.scan_revalidating = False # cached rows (if any) stay visible, but are not refreshed
         print(f"Scan Error (took {scan_duration:.2f}s): {error_message}")
         QMessageBox.critical(self, "Scan Error", f"An unexpected error occurred during scan:\n{error_message}")
         self.info_label.setText("Scan failed. Check error messages.")
         self.statusBar.showMessage(f"Scan failed! ({scan_duration:.1f}s)", 5000)
 
-    def _finalize_scan_operation(self):
+    def _handle_scan_cancelled(self, partial_results, scan_duration):
+        """A superseded scan stopped early; its rows are kept as a partial scan cache entry."""
+        print(f"Superseded scan stopped after {scan_duration:.2f}s with {len(partial_results)} partial result(s).")
+        worker = self.sender()
+        if isinstance(worker, ScanWorker): self._cache_partial_scan(worker) # no-op if cached on cancel
+
+    def _cache_partial_scan(self, worker):
+        """
+        Stores the rows a cancelled scan found as a partial ScanResultCache entry, so the next scan
+        of the same folder shows them while it revalidates instead of starting from an empty table.
+        """
+        partial_results, worker.partial_results = worker.partial_results, None
+        if partial_results and worker.cache_key is not None:
+            self.scan_result_cache.put(worker.cache_key, partial_results, partial=True)
+
+    def _finalize_scan_operation(self, finished_thread=None):
         """Finalizes the scan operation, resetting UI state."""
+        retired = [(t, w) for t, w in self.retired_scans if t is finished_thread]
+        if retired:
+            # a cancelled scan wound down; the scan that replaced it still owns the UI state
+            for entry in retired: self.retired_scans.remove(entry)
+            print("Cancelled scan thread finished.")
+            return
         print("Finalizing scan operation...")
         self.is_operation_running = False
         self.update_button_state() # Re-enable buttons and update tooltips
@@ -2348,114 +3166,45 @@ class MainWindow(QMainWindow):
 
 
     # archiving logic implementation
-    def trigger_archive_if_needed(self, target_folder, folder_type_name):
-        """Checks if archiving is enabled and needed for today, then runs it."""
-        archive_stats = {"moved": 0, "errors": 0}
+    def _archive_due(self, target_folder, folder_type_name):
+        """True if archiving is enabled and has not run today for the folder type (the copy job archives first)."""
         if not self.archive_enabled:
-            return archive_stats
+            return False
         if not target_folder or not os.path.isdir(target_folder):
              print(f"Archiving skipped for {folder_type_name}: Target folder invalid or not set ('{target_folder}')")
-             return archive_stats
+             return False
 
         if folder_type_name == "CAM": settings_key = SETTINGS_LAST_ARCHIVE_DATE_CAM
         elif folder_type_name == "Print": settings_key = SETTINGS_LAST_ARCHIVE_DATE_PRINT
         else:
              print(f"Warning: Unknown folder type '{folder_type_name}' for archiving.")
-             return archive_stats # Unknown type, cannot archive
+             return False # Unknown type, cannot archive
 
         today_str = datetime.date.today().isoformat()
         last_archive_date = self.settings.value(settings_key, "")
+        return last_archive_date != today_str # the copy engine also archives a folder only once a day
 
-        if last_archive_date == today_str:
-             return archive_stats # Already archived today
-
-        print(f"Archiving check needed for {folder_type_name} folder...")
-        self.statusBar.showMessage(f"Checking for old files to archive in {folder_type_name} folder...", 0)
-        QCoreApplication.processEvents()
-
-        try:
-            archive_stats = self.archive_old_files_in_target(target_folder)
-            moved = archive_stats.get("moved", 0)
-            errors = archive_stats.get("errors", 0)
-            print(f"Archiving for {folder_type_name} complete: Moved {moved} files, Errors: {errors}.")
-            if errors == 0:
-                self.settings.setValue(settings_key, today_str)
-                self.settings.sync()
-                print(f"Updated last archive date for {folder_type_name} to {today_str}.")
-            else:
-                print(f"Archive errors occurred in {folder_type_name}, not updating last archive date.")
-                QMessageBox.warning(self, "Archive Error", f"Archiving for {folder_type_name} encountered {errors} error(s). Check logs. Last archive date not updated.")
-
-        except Exception as e:
-            QMessageBox.warning(self, "Archive Error",
-                                f"An unexpected error occurred during archiving in {folder_type_name} folder:\n{e}")
-            print(f"Unexpected archive error for {folder_type_name}: {e}")
-        finally:
-            self.statusBar.clearMessage()
-
-        return archive_stats
-
-    def archive_old_files_in_target(self, target_folder):
-        """Moves files modified *before* today from target_folder root into YYYY/MM/DD subfolders."""
-        stats = {"moved": 0, "errors": 0}
-        today_date = datetime.date.today()
-        files_to_archive = []
-        try:
-            for filename in os.listdir(target_folder):
-                source_path = os.path.join(target_folder, filename)
-                if not os.path.isfile(source_path):
-                    continue
-                try:
-                    mtime_ts = os.path.getmtime(source_path)
-                    mod_date = datetime.date.fromtimestamp(mtime_ts)
-                    if mod_date < today_date:
-                        archive_subfolder_rel_path = mod_date.strftime('%Y' + os.sep + '%m' + os.sep + '%d')
-                        archive_subfolder_abs_path = os.path.join(target_folder, archive_subfolder_rel_path)
-                        files_to_archive.append({
-                            'name': filename,
-                            'path': source_path,
-                            'archive_dir': archive_subfolder_abs_path,
-                            'mod_date': mod_date # Store for logging if needed
-                            })
-                except FileNotFoundError:
-                     continue # File gone, skip
-                except Exception as e_stat:
-                     stats["errors"] += 1
-                     print(f"Error stating file for archive '{source_path}': {e_stat}")
-        except Exception as e_list:
-             stats["errors"] += 1
-             print(f"Error listing directory for archive '{target_folder}': {e_list}")
-             return stats # Cannot proceed if listing failed
-
-        if not files_to_archive:
-             return stats # Nothing to do
-
-        print(f"Archiving {len(files_to_archive)} file(s) in {shorten_path(target_folder)}...")
-        for file_info in files_to_archive:
-            filename = file_info['name']; source_path = file_info['path']
-            archive_dir = file_info['archive_dir']; final_dest_path = os.path.join(archive_dir, filename)
-            try:
-                os.makedirs(archive_dir, exist_ok=True)
-                print(f"  Moving '{filename}' -> '{os.path.relpath(archive_dir, target_folder)}{os.sep}'")
-                shutil.move(source_path, final_dest_path) # Use shutil.move for cross-filesystem compatibility
-                stats["moved"] += 1
-            except FileNotFoundError:
-                 print(f"  Skipping move, source file gone: {filename}")
-                 pass # Source file disappeared before move
-            except PermissionError as pe:
-                 stats["errors"] += 1
-                 print(f"  Permission error moving '{filename}' to archive: {pe}")
-            except Exception as e_move:
-                 stats["errors"] += 1
-                 print(f"  Error moving file '{filename}' to archive: {e_move}")
-
-        return stats
-
-    # core file operations (copying)
-    def _copy_file_to_target(self, source_path, destination_folder, operation_stats,
-                             is_multi_operation=False, is_auto_operation=False):
-        """Copies a single file, handling duplicates based on settings. Updates operation_stats dict.
-           Returns True on success/skip, False on error/cancel."""
+    def _record_archive_result(self, folder_type_name, archive_stats):
+        """Stores today as the last archive date of the folder type if archiving had no errors, else warns."""
+        settings_key = SETTINGS_LAST_ARCHIVE_DATE_CAM if folder_type_name == "CAM" else SETTINGS_LAST_ARCHIVE_DATE_PRINT
+        today_str = datetime.date.today().isoformat()
+        moved = archive_stats.get("moved", 0)
+        errors = archive_stats.get("errors", 0)
+        print(f"Archiving for {folder_type_name} complete: Moved {moved} files, Errors: {errors}.")
+        if errors == 0:
+            self.settings.setValue(settings_key, today_str)
+            self.settings.sync()
+            print(f"Updated last archive date for {folder_type_name} to {today_str}.")
+        else:
+            print(f"Archive errors occurred in {folder_type_name}, not updating last archive date.")
+            QMessageBox.warning(self, "Archive Error", f"Archiving for {folder_type_name} encountered {errors} error(s). Check logs. Last archive date not updated.")
+
+    # duplicate decisions (GUI thread) and copy jobs (copy engine threads)
+    def _plan_file_copy(self, source_path, destination_folder, operation_stats,
+                        is_multi_operation=False, is_auto_operation=False, archive_pending=False):
+        """Decides whether a file gets copied, handling duplicates based on settings. Updates operation_stats dict.
+           Returns True to copy, False on skip/error/cancel (skipped files are counted, errors/cancel recorded).
+           With archive_pending, an existing file from before today is no duplicate: the job archives it first."""
         if not source_path or not os.path.exists(source_path):
             source_name = os.path.basename(source_path) if source_path else "N/A"
             err_msg = f"Source file not found: {source_name}"
@@ -2467,7 +3216,13 @@ class MainWindow(QMainWindow):
         final_dest_path = os.path.join(destination_folder, filename)
         copy_action = self.DuplicateAction.OVERWRITE # Default assumes overwrite if no check needed
 
-        if os.path.exists(final_dest_path):
+        dest_exists = os.path.exists(final_dest_path)
+        if dest_exists and archive_pending:
+            today_start = datetime.datetime.combine(datetime.date.today(), datetime.time()).timestamp()
+            try: dest_exists = os.path.getmtime(final_dest_path) >= today_start
+            except OSError: dest_exists = False
+
+        if dest_exists:
             determined_action = False
             effective_duplicate_setting = self.duplicate_check_action_setting # Default to manual setting
 
@@ -2506,7 +3261,7 @@ class MainWindow(QMainWindow):
                 skip_msg = f"Skipping duplicate file{' (Auto)' if is_auto_operation and self.auto_duplicate_action_setting == 'skip' else ''}: {filename}"
                 print(skip_msg)
                 operation_stats["skipped"] = operation_stats.get("skipped", 0) + 1
-                return True # Skipped successfully
+                return False # Skipped
 
             elif copy_action == self.DuplicateAction.CANCEL:
                 print(f"User cancelled operation due to duplicate: {filename}")
@@ -2517,23 +3272,103 @@ class MainWindow(QMainWindow):
                  if (is_auto_operation and self.auto_duplicate_action_setting == 'overwrite') or \
                     (not is_auto_operation and self.duplicate_check_action_setting == 'overwrite'):
                      print(f"Overwriting duplicate file (Setting): {filename}")
-                 pass # Proceed to copy below
-
-        try:
-            shutil.copy2(source_path, final_dest_path) # copy2 preserves metadata (like modification time)
-            operation_stats["copied"] = operation_stats.get("copied", 0) + 1
-            return True # Copied successfully
-        except Exception as e:
-            err_msg = f"Failed copying file '{filename}': {e}"
-            operation_stats["errors"].append({"file": filename, "error": str(e)})
-            print(f"Copy Error: {err_msg}")
-            return False # Copy failed
-
+                 pass # Copied by the job
+
+        return True
+
+    def _submit_copy_job(self, operation_name, job_name, folder_type_name, target_folder, projects,
+                         skipped_projects_info=None, is_multi_operation=False, is_auto_operation=False, on_finished=None):
+        """
+        Decides about duplicates for all files of projects ([(display_name, source_paths)]) -
+        dialogs run here - then hands the copies to the copy engine as one job. The summary
+        (or, for auto operations, the log lines) and on_finished(success) follow when the job
+        is done. Returns the CopyJob, or None if the user cancelled.
+        """
+        archive_pending = self._archive_due(target_folder, folder_type_name)
+        self.current_multi_duplicate_choice = self.DuplicateAction.ASK # Reset choice for this operation
+        groups = []
+        for display_name, source_paths in projects:
+            operation_stats = {"project_name": display_name, "copied": 0, "skipped": 0, "errors": [], "cancelled": False}
+            files_to_copy = []
+            for source_path in source_paths:
+                if self._plan_file_copy(source_path, target_folder, operation_stats, is_multi_operation,
+                                        is_auto_operation, archive_pending):
+                    files_to_copy.append(source_path)
+                elif operation_stats["cancelled"]:
+                    print(f"{operation_name} cancelled by user at project {display_name}. Nothing was copied.")
+                    if not is_auto_operation:
+                        self.show_copy_summary(operation_name, [], target_folder, skipped_projects_info, operation_cancelled=True)
+                    return None
+                elif operation_stats["errors"]:
+                    print(f"  Error with file {os.path.basename(source_path)} for {display_name}. Stopping this project.")
+                    break # Stop processing files for *this* project on error
+            groups.append((operation_stats, files_to_copy))
+
+        job = CopyJob(job_name, target_folder, groups, archive=archive_pending)
+        self.copy_jobs[job.job_id] = {"operation_name": operation_name, "folder_type_name": folder_type_name,
+                                      "skipped": skipped_projects_info or [], "is_auto": is_auto_operation,
+                                      "on_finished": on_finished}
+        self.copy_engine.submit(job)
+        self._update_copy_progress()
+        return job
+
+    def _handle_copy_job_progress(self, job):
+        self._update_copy_progress(job)
+
+    def _handle_copy_job_finished(self, job):
+        """Renders the result of a finished copy job; jobs of the watcher worker are reported by it."""
+        context = self.copy_jobs.pop(job.job_id, None)
+        self._update_copy_progress()
+        if context is None:
+            return
+        if job.archive_stats is not None:
+            self._record_archive_result(context["folder_type_name"], job.archive_stats)
+        if not context["is_auto"]:
+            self.show_copy_summary(context["operation_name"], job.results, job.destination_folder,
+                                   context["skipped"], job.archive_stats, job.cancel_event.is_set())
+        else:
+            operation_stats = job.results[0] if job.results else {"copied": 0, "skipped": 0, "errors": []}
+            if job.succeeded: print(f"{job.name} successful: {operation_stats['copied']} copied, {operation_stats['skipped']} skipped.")
+            elif job.cancelled: print(f"{job.name} cancelled.")
+            else: print(f"{job.name} failed. Errors: {len(operation_stats['errors'])}. Check logs.")
+        if context["on_finished"]:
+            context["on_finished"](job.succeeded)
+
+    def _update_copy_progress(self, job=None):
+        """Shows the running copy job (file, percent, MB/s) in the status bar; hides the progress widgets when idle."""
+        jobs = self.copy_engine.jobs()
+        if not jobs:
+            if self.copy_progress_bar.isVisible():
+                self.copy_progress_bar.hide(); self.copy_cancel_button.hide()
+                self.statusBar.clearMessage()
+            return
+        running = [j for j in jobs if j.state == CopyJob.RUNNING]
+        if job is None or job.state != CopyJob.RUNNING:
+            job = running[0] if running else jobs[0]
+        self.copy_progress_bar.setValue(job.percent())
+        self.copy_progress_bar.show(); self.copy_cancel_button.show()
+        if job.state != CopyJob.RUNNING:
+            self.statusBar.showMessage(f"📤 Queued: {job.name}", 0)
+            return
+        file_percent = int(job.file_bytes_done * 100 / job.file_size) if job.file_size else 0
+        progress_msg = (f"📤 {job.name} - File {min(job.files_done + 1, job.files_total)}/{job.files_total}: "
+                        f"{job.current_file} ({file_percent}%), {job.mb_per_s():.1f} MB/s")
+        if len(jobs) > 1: progress_msg += f" | {len(jobs) - 1} more job(s)"
+        self.statusBar.showMessage(progress_msg, 0)
+        self.copy_progress_bar.setToolTip(f"{job.name}: {job.files_done}/{job.files_total} file(s), "
+                                          f"{job.bytes_done / (1024 * 1024):.1f} MB copied ({job.percent()}%)")
+
+    def cancel_copy_jobs(self):
+        """Cancels the running and queued copy jobs; a file being copied stops after its current chunk."""
+        jobs = self.copy_engine.jobs()
+        if jobs:
+            print(f"[Copy Engine] Cancelling {len(jobs)} job(s)...")
+            self.copy_engine.cancel()
+            self.statusBar.showMessage("Cancelling transfers...", 0)
 
     def ask_duplicate_action(self, filename, target_folder, ask_for_all=False):
         """Shows a dialog asking the user what to do with a duplicate file. Returns DuplicateAction enum."""
         self.disable_hotkey_action_temporarily()
-        self.stop_file_watcher()
 
         msgBox = QMessageBox(self)
         msgBox.setIcon(QMessageBox.Icon.Question)
@@ -2566,15 +3401,15 @@ class MainWindow(QMainWindow):
         elif clicked_button == cancel_button: result = self.DuplicateAction.CANCEL
 
         QTimer.singleShot(10, self.start_hotkey_listener) # Re-enable listener action
-        QTimer.singleShot(20, self.start_file_watcher)
         return result
 
 
     # single project actions (from context menu or notification)
-    def send_cam_for_project(self, item_data, is_auto=False):
+    def send_cam_for_project(self, item_data, is_auto=False, on_finished=None):
         """Handles sending CAM files (*.info, ALL *cad.stl) for a single project.
-           Uses auto-duplicate setting if is_auto=True. Returns True on success, False on failure/cancel."""
-        if not isinstance(item_data, dict):
+           Uses auto-duplicate setting if is_auto=True. Returns True if the copy job was submitted;
+           on_finished(success) is called when it is done."""
+        if not isinstance(item_data, (dict, ProjectEntry)):
             print("[Send CAM Single] Error: Invalid item_data provided.")
             return False
         if self.is_operation_running and not is_auto: # Allow auto-send even if manual op running? No, safer to block.
@@ -2582,90 +3417,52 @@ class MainWindow(QMainWindow):
              if not is_auto: self.statusBar.showMessage("Operation already in progress.", 3000)
              return False
 
-        self.is_operation_running = True; self.update_button_state() # Block other actions
-        operation_successful = False
+        self.is_operation_running = True; self.update_button_state() # Block other actions while deciding
+        job = None
         display_name = f"{item_data.get('patient', 'Unknown')} [{item_data.get('base_name', '?')}]"
         print(f"[Send CAM Single] Starting for: {display_name} (is_auto={is_auto})")
 
-        if not self.target_folder_cam:
-            msg = "Target (CAM) folder is not configured."
-            if not is_auto: self.show_config_error_message(msg)
-            else: print(f"Auto-Send CAM skipped for {display_name}: {msg}")
-            self.is_operation_running = False; self.update_button_state(); return False
-        if not self.check_or_create_folder(self.target_folder_cam, "Target (CAM)"):
-            msg = "Target (CAM) folder creation cancelled or failed."
-            if not is_auto: QMessageBox.warning(self, "Folder Error", msg)
-            else: print(f"Send CAM skipped for {display_name}: {msg}")
-            self.is_operation_running = False; self.update_button_state(); return False
-
-        info_path = item_data.get('info_path');
-        cad_stl_paths = [p for p in item_data.get('cad_stl_paths', []) if p and os.path.exists(p)] # Existing paths
-        info_exists = info_path and os.path.exists(info_path);
-        cad_exists = bool(cad_stl_paths)
-
-        if not info_exists or not cad_exists:
-            msg = "Missing required files (at least one *cad.stl and .constructionInfo)."
-            if not is_auto: QMessageBox.warning(self, "Missing Files", f"Cannot perform Send to CAM for {display_name}.\n{msg}")
-            else: print(f"Send CAM skipped for {display_name}: {msg}")
-            self.is_operation_running = False; self.update_button_state(); return False
-
-        # For single project actions, we might still want to temporarily disable hotkey action
-        # but not fully stop the listener unless it's a long operation.
-        # For now, let's assume these are quick enough not to need disabling,
-        # or rely on is_operation_running to prevent concurrent hotkey scans.
-        # self.disable_hotkey_action_temporarily() # Consider if needed
-        
-        self.stop_file_watcher() # Stop file watcher during copy operations
-        archive_stats = self.trigger_archive_if_needed(self.target_folder_cam, "CAM") # Archive *before* copying
-
-        files_to_process = ([info_path] if info_exists else []) + cad_stl_paths
-        operation_stats = {"copied": 0, "skipped": 0, "errors": [], "project_name": display_name, "cancelled": False}
-
-        if not is_auto: self.info_label.setText(f"Sending to CAM: {display_name}..."); QCoreApplication.processEvents()
-
-        process_ok = True
         try:
-            self.current_multi_duplicate_choice = self.DuplicateAction.ASK # Reset just in case
-
-            for i, source_path in enumerate(files_to_process):
-                progress_msg = f"Sending CAM ({i + 1}/{len(files_to_process)}): {os.path.basename(source_path)}..."
-                if not is_auto: self.statusBar.showMessage(progress_msg, 0); QCoreApplication.processEvents()
-
-                if not self._copy_file_to_target(source_path, self.target_folder_cam, operation_stats,
-                                                 is_multi_operation=False, is_auto_operation=is_auto):
-                    if operation_stats.get("cancelled", False):
-                        print(f"Send to CAM cancelled by user for project {display_name}.")
-                        process_ok = False; break # Stop processing this project
-                    else: # Actual copy error
-                        process_ok = False;
-                        break
+            if not self.target_folder_cam:
+                msg = "Target (CAM) folder is not configured."
+                if not is_auto: self.show_config_error_message(msg)
+                else: print(f"Auto-Send CAM skipped for {display_name}: {msg}")
+                return False
+            if not self.check_or_create_folder(self.target_folder_cam, "Target (CAM)"):
+                msg = "Target (CAM) folder creation cancelled or failed."
+                if not is_auto: QMessageBox.warning(self, "Folder Error", msg)
+                else: print(f"Send CAM skipped for {display_name}: {msg}")
+                return False
 
-            if process_ok:
-                 operation_successful = True
+            info_path = item_data.get('info_path');
+            cad_stl_paths = [p for p in item_data.get('cad_stl_paths', []) if p and os.path.exists(p)] # Existing paths
+            info_exists = info_path and os.path.exists(info_path);
+            cad_exists = bool(cad_stl_paths)
 
+            if not info_exists or not cad_exists:
+                msg = "Missing required files (at least one *cad.stl and .constructionInfo)."
+                if not is_auto: QMessageBox.warning(self, "Missing Files", f"Cannot perform Send to CAM for {display_name}.\n{msg}")
+                else: print(f"Send CAM skipped for {display_name}: {msg}")
+                return False
+
+            # The file watcher keeps running; events for the copied files are suppressed (self.self_writes)
+            files_to_process = ([info_path] if info_exists else []) + cad_stl_paths
+            job_name = f"{'Auto-Send' if is_auto else 'Send'} CAM: {display_name}"
+            job = self._submit_copy_job("Send to CAM", job_name, "CAM", self.target_folder_cam,
+                                        [(display_name, files_to_process)], is_auto_operation=is_auto,
+                                        on_finished=on_finished)
         except Exception as e:
-            operation_stats["errors"].append({"file": "Process Error", "error": f"Unexpected error: {e}"});
-            print(f"Error during single CAM copy for {display_name}: {e}")
-            operation_successful = False
+            print(f"Error preparing single CAM copy for {display_name}: {e}")
         finally:
-            if not is_auto:
-                self.update_hotkey_ui_elements(); self.statusBar.clearMessage()
-                self.show_copy_summary("Send to CAM", [operation_stats], self.target_folder_cam, archive_stats=archive_stats)
-            else:
-                if operation_successful: print(f"Auto-Send CAM successful for {display_name}: {operation_stats['copied']} copied, {operation_stats['skipped']} skipped.")
-                elif operation_stats.get("cancelled"): print(f"Auto-Send CAM cancelled for {display_name} due to duplicate handling.")
-                else: print(f"Auto-Send CAM failed for {display_name}. Errors: {len(operation_stats['errors'])}. Check logs.")
-
             self.is_operation_running = False; self.update_button_state() # Re-enable buttons
-            # self.start_hotkey_listener() # Re-enable if it was disabled
-            self.start_file_watcher() # Restart file watcher
 
-        return operation_successful
+        return job is not None
 
-    def send_print_for_project(self, item_data, is_auto=False):
+    def send_print_for_project(self, item_data, is_auto=False, on_finished=None):
         """Handles sending Print files (*model*.stl) for a single project.
-           Uses auto-duplicate setting if is_auto=True. Returns True on success, False on failure/cancel."""
-        if not isinstance(item_data, dict):
+           Uses auto-duplicate setting if is_auto=True. Returns True if the copy job was submitted;
+           on_finished(success) is called when it is done."""
+        if not isinstance(item_data, (dict, ProjectEntry)):
              print("[Send Print Single] Error: Invalid item_data provided.")
              return False
         if self.is_operation_running and not is_auto:
@@ -2674,87 +3471,48 @@ class MainWindow(QMainWindow):
              return False
 
         self.is_operation_running = True; self.update_button_state()
-        operation_successful = False
+        job = None
         display_name = f"{item_data.get('patient', 'Unknown')} [{item_data.get('base_name', '?')}]"
         print(f"[Send Print Single] Starting for: {display_name} (is_auto={is_auto})")
 
-        if not self.target_folder_print:
-            msg = "Target (Print) folder is not configured."
-            if not is_auto: self.show_config_error_message(msg)
-            else: print(f"Auto-Send Print skipped for {display_name}: {msg}")
-            self.is_operation_running = False; self.update_button_state(); return False
-        if not self.check_or_create_folder(self.target_folder_print, "Target (Print)"):
-             msg = "Target (Print) folder creation cancelled or failed."
-             if not is_auto: QMessageBox.warning(self, "Folder Error", msg)
-             else: print(f"Send Print skipped for {display_name}: {msg}")
-             self.is_operation_running = False; self.update_button_state(); return False
-
-
-        model_stl_paths = [p for p in item_data.get('model_stl_paths', []) if p and os.path.exists(p)]
-        if not model_stl_paths:
-            msg = "No existing model files (*model*.stl) found to send to print."
-            if not is_auto: QMessageBox.information(self, "No Model Files", f"{msg}\nProject: {display_name}")
-            else: print(f"Send Print skipped for {display_name}: {msg}")
-            self.is_operation_running = False; self.update_button_state(); return False
-
-        # self.disable_hotkey_action_temporarily() # Consider if needed
-        self.stop_file_watcher()
-        archive_stats = self.trigger_archive_if_needed(self.target_folder_print, "Print")
-        operation_stats = {"project_name": display_name, "copied": 0, "skipped": 0, "errors": [], "cancelled": False}
-
-        if not is_auto: self.info_label.setText(f"Sending to Print: {display_name}..."); QCoreApplication.processEvents()
-
-        process_ok = True
         try:
-            self.current_multi_duplicate_choice = self.DuplicateAction.ASK # Reset
-
-            for i, source_path in enumerate(model_stl_paths):
-                progress_msg = f"Sending Print ({i + 1}/{len(model_stl_paths)}): {os.path.basename(source_path)}..."
-                if not is_auto: self.statusBar.showMessage(progress_msg, 0); QCoreApplication.processEvents()
-
-                if not self._copy_file_to_target(source_path, self.target_folder_print, operation_stats,
-                                                 is_multi_operation=False, is_auto_operation=is_auto):
-                    if operation_stats.get("cancelled", False):
-                        print(f"Send to Print cancelled by user for project {display_name}.")
-                        process_ok = False; break
-                    else: # Copy error
-                        process_ok = False;
-                        break
-
-            if process_ok:
-                 operation_successful = True
+            if not self.target_folder_print:
+                msg = "Target (Print) folder is not configured."
+                if not is_auto: self.show_config_error_message(msg)
+                else: print(f"Auto-Send Print skipped for {display_name}: {msg}")
+                return False
+            if not self.check_or_create_folder(self.target_folder_print, "Target (Print)"):
+                 msg = "Target (Print) folder creation cancelled or failed."
+                 if not is_auto: QMessageBox.warning(self, "Folder Error", msg)
+                 else: print(f"Send Print skipped for {display_name}: {msg}")
+                 return False
+
+            model_stl_paths = [p for p in item_data.get('model_stl_paths', []) if p and os.path.exists(p)]
+            if not model_stl_paths:
+                msg = "No existing model files (*model*.stl) found to send to print."
+                if not is_auto: QMessageBox.information(self, "No Model Files", f"{msg}\nProject: {display_name}")
+                else: print(f"Send Print skipped for {display_name}: {msg}")
+                return False
 
+            job_name = f"{'Auto-Send' if is_auto else 'Send'} Print: {display_name}"
+            job = self._submit_copy_job("Send to Print", job_name, "Print", self.target_folder_print,
+                                        [(display_name, model_stl_paths)], is_auto_operation=is_auto,
+                                        on_finished=on_finished)
         except Exception as e:
-            operation_stats["errors"].append({"file": "Process Error", "error": f"Unexpected error: {e}"});
-            print(f"Error during single Print copy for {display_name}: {e}")
-            operation_successful = False
+            print(f"Error preparing single Print copy for {display_name}: {e}")
         finally:
-            if not is_auto:
-                self.update_hotkey_ui_elements(); self.statusBar.clearMessage()
-                self.show_copy_summary("Send to Print", [operation_stats], self.target_folder_print, archive_stats=archive_stats)
-            else:
-                if operation_successful: print(f"Auto-Send Print successful for {display_name}: {operation_stats['copied']} copied, {operation_stats['skipped']} skipped.")
-                elif operation_stats.get("cancelled"): print(f"Auto-Send Print cancelled for {display_name} due to duplicate handling.")
-                else: print(f"Auto-Send Print failed for {display_name}. Errors: {len(operation_stats['errors'])}. Check logs.")
-
             self.is_operation_running = False; self.update_button_state()
-            # self.start_hotkey_listener() # Re-enable if it was disabled
-            self.start_file_watcher()
 
-        return operation_successful
+        return job is not None
 
 
     # multi-project actions (from main window buttons)
-    def process_selected_cam_info(self):
-        """Handles the 'Send to CAM' button action for multiple selected rows.
-           Copies ONLY *.info and ALL *cad.stl files."""
-        if self.is_operation_running:
-             self.statusBar.showMessage("Operation already in progress.", 3000)
-             return
+    def _selected_rows_data(self):
+        """Project data of the selected table rows, in table order (empty list with a status message if none)."""
         selected_items = self.table_widget.selectionModel().selectedRows()
         if not selected_items:
              self.statusBar.showMessage("No projects selected.", 3000)
-             return
+             return []
 
         selected_rows_data = []
         for index in sorted([item.row() for item in selected_items]):
@@ -2765,32 +3523,30 @@ class MainWindow(QMainWindow):
 
         if not selected_rows_data:
              self.statusBar.showMessage("Could not retrieve data for selected rows.", 3000)
+        return selected_rows_data
+
+    def process_selected_cam_info(self):
+        """Handles the 'Send to CAM' button action for multiple selected rows.
+           Copies ONLY *.info and ALL *cad.stl files."""
+        if self.is_operation_running:
+             self.statusBar.showMessage("Operation already in progress.", 3000)
+             return
+        selected_rows_data = self._selected_rows_data()
+        if not selected_rows_data:
              return
 
         if not self.target_folder_cam: self.show_config_error_message("Target (CAM) folder is not configured."); return
         if not self.check_or_create_folder(self.target_folder_cam, "Target (CAM)"): return
 
-        self.is_operation_running = True; self.update_button_state() # Block UI
-        self.disable_hotkey_action_temporarily(); self.stop_file_watcher() # Disable hotkey action, stop watcher
-        archive_stats = self.trigger_archive_if_needed(self.target_folder_cam, "CAM") # Archive first
-        all_operation_stats = []; skipped_projects_info = []
-        self.current_multi_duplicate_choice = self.DuplicateAction.ASK # Reset choice for this operation
-        operation_cancelled_globally = False
+        self.is_operation_running = True; self.update_button_state() # Block UI while deciding about duplicates
+        self.disable_hotkey_action_temporarily() # Disable hotkey action
+        projects = []; skipped_projects_info = []
         total_projects_to_process = len(selected_rows_data)
-
-        plural_s = "s" if total_projects_to_process != 1 else ""
-        self.info_label.setText(f"Sending to CAM for {total_projects_to_process} selected project{plural_s}..."); QCoreApplication.processEvents()
-        print(f"[Send CAM Multi] Starting for {total_projects_to_process} projects...")
+        print(f"[Send CAM Multi] Preparing {total_projects_to_process} projects...")
 
         try:
-            for idx, item_data in enumerate(selected_rows_data):
-                if operation_cancelled_globally: break # Stop if user cancelled the whole batch
-
-                current_project_num = idx + 1;
+            for item_data in selected_rows_data:
                 display_name = f"{item_data.get('patient', 'Unknown')} [{item_data.get('base_name', '?')}]"
-                project_folder = item_data.get('folder_path', 'N/A')
-                print(f"[Send CAM Multi] Processing project {current_project_num}/{total_projects_to_process}: {display_name}")
-
                 info_path = item_data.get('info_path');
                 cad_stl_paths = [p for p in item_data.get('cad_stl_paths', []) if p and os.path.exists(p)]
                 info_exists = info_path and os.path.exists(info_path);
@@ -2803,42 +3559,22 @@ class MainWindow(QMainWindow):
                     print(f"  Skipping {display_name}: {reason}")
                     skipped_projects_info.append({"name": display_name, "reason": reason}); continue
 
-                files_to_process = ([info_path] if info_exists else []) + cad_stl_paths
-                project_stats = {"project_name": display_name, "copied": 0, "skipped": 0, "errors": [], "cancelled": False}
-                self.statusBar.showMessage(f"Sending CAM ({current_project_num}/{total_projects_to_process}): {display_name}...", 0); QCoreApplication.processEvents()
-
-                process_ok_for_project = True
-                for file_idx, source_path in enumerate(files_to_process):
-                    file_progress_msg = f"Sending CAM ({current_project_num}/{total_projects_to_process}) File {file_idx+1}/{len(files_to_process)}: {os.path.basename(source_path)}"
-                    self.statusBar.showMessage(file_progress_msg, 0); QCoreApplication.processEvents()
-
-                    if not self._copy_file_to_target(source_path, self.target_folder_cam, project_stats,
-                                                     is_multi_operation=True, is_auto_operation=False):
-                        if project_stats.get("cancelled", False):
-                            operation_cancelled_globally = True
-                            print(f"Multi-Send CAM cancelled globally by user at project {display_name}.")
-                            process_ok_for_project = False; break # Stop processing this project and the entire batch
-                        else: # Actual copy error
-                            process_ok_for_project = False;
-                            print(f"  Error copying file {os.path.basename(source_path)} for {display_name}. Stopping this project.")
-                            break # Stop processing files for *this* project on error
-
-                if not (operation_cancelled_globally and project_stats.get("cancelled", False)):
-                     all_operation_stats.append(project_stats)
+                projects.append((display_name, ([info_path] if info_exists else []) + cad_stl_paths))
 
+            plural_s = "s" if total_projects_to_process != 1 else ""
+            self._submit_copy_job("Multi Send to CAM", f"Send CAM ({total_projects_to_process} project{plural_s})", "CAM",
+                                  self.target_folder_cam, projects, skipped_projects_info, is_multi_operation=True)
 
         except Exception as e:
              err_msg = f"Unexpected error during Multi Send to CAM: {e}"
              print(err_msg)
-             all_operation_stats.append({"project_name": "Multi Send Error", "copied": 0, "skipped": 0, "errors": [{"file": "Process Error", "error": err_msg}]})
-             operation_cancelled_globally = True # Treat as cancelled to be safe
+             self.show_copy_summary("Multi Send to CAM", [{"project_name": "Multi Send Error", "copied": 0, "skipped": 0, "errors": [{"file": "Process Error", "error": err_msg}]}],
+                                    self.target_folder_cam, skipped_projects_info, operation_cancelled=True)
 
         finally:
-            print(f"[Send CAM Multi] Finished processing {total_projects_to_process} projects.")
-            self.update_hotkey_ui_elements(); self.statusBar.clearMessage()
-            self.show_copy_summary("Multi Send to CAM", all_operation_stats, self.target_folder_cam, skipped_projects_info, archive_stats, operation_cancelled_globally)
+            self.update_hotkey_ui_elements()
             self.is_operation_running = False; self.update_button_state() # Re-enable UI
-            self.start_hotkey_listener(); self.start_file_watcher() # Re-enable hotkey action, restart watcher
+            self.start_hotkey_listener() # Re-enable hotkey action
 
 
     def process_selected_print_files(self):
@@ -2847,86 +3583,44 @@ class MainWindow(QMainWindow):
         if self.is_operation_running:
              self.statusBar.showMessage("Operation already in progress.", 3000)
              return
-        selected_items = self.table_widget.selectionModel().selectedRows()
-        if not selected_items:
-             self.statusBar.showMessage("No projects selected.", 3000)
-             return
-
-        selected_rows_data = []
-        for index in sorted([item.row() for item in selected_items]):
-             item0 = self.table_widget.item(index, 0)
-             if item0:
-                  data = item0.data(Qt.ItemDataRole.UserRole)
-                  if data: selected_rows_data.append(data)
-
+        selected_rows_data = self._selected_rows_data()
         if not selected_rows_data:
-             self.statusBar.showMessage("Could not retrieve data for selected rows.", 3000)
              return
 
         if not self.target_folder_print: self.show_config_error_message("Target (Print) folder is not configured."); return
         if not self.check_or_create_folder(self.target_folder_print, "Target (Print)"): return
 
         self.is_operation_running = True; self.update_button_state()
-        self.disable_hotkey_action_temporarily(); self.stop_file_watcher() # Disable hotkey action, stop watcher
-        archive_stats = self.trigger_archive_if_needed(self.target_folder_print, "Print")
-        all_operation_stats = []; skipped_projects_info = []
-        self.current_multi_duplicate_choice = self.DuplicateAction.ASK
-        operation_cancelled_globally = False
+        self.disable_hotkey_action_temporarily() # Disable hotkey action
+        projects = []; skipped_projects_info = []
         total_projects_to_process = len(selected_rows_data)
-
-        plural_s = "s" if total_projects_to_process != 1 else ""
-        self.info_label.setText(f"Sending to Print for {total_projects_to_process} selected project{plural_s}..."); QCoreApplication.processEvents()
-        print(f"[Send Print Multi] Starting for {total_projects_to_process} projects...")
+        print(f"[Send Print Multi] Preparing {total_projects_to_process} projects...")
 
         try:
-            for idx, item_data in enumerate(selected_rows_data):
-                if operation_cancelled_globally: break
-
-                current_project_num = idx + 1;
+            for item_data in selected_rows_data:
                 display_name = f"{item_data.get('patient', 'Unknown')} [{item_data.get('base_name', '?')}]"
-                print(f"[Send Print Multi] Processing project {current_project_num}/{total_projects_to_process}: {display_name}")
-
                 model_stl_paths = [p for p in item_data.get('model_stl_paths', []) if p and os.path.exists(p)]
                 if not model_stl_paths:
                     reason = "No model files (*model*.stl) found"
                     print(f"  Skipping {display_name}: {reason}")
                     skipped_projects_info.append({"name": display_name, "reason": reason}); continue
 
-                files_to_process = model_stl_paths
-                project_stats = {"project_name": display_name, "copied": 0, "skipped": 0, "errors": [], "cancelled": False}
-                self.statusBar.showMessage(f"Sending Print ({current_project_num}/{total_projects_to_process}): {display_name}...", 0); QCoreApplication.processEvents()
-
-                process_ok_for_project = True
-                for file_idx, source_path in enumerate(files_to_process):
-                    file_progress_msg = f"Sending Print ({current_project_num}/{total_projects_to_process}) File {file_idx+1}/{len(files_to_process)}: {os.path.basename(source_path)}"
-                    self.statusBar.showMessage(file_progress_msg, 0); QCoreApplication.processEvents()
-
-                    if not self._copy_file_to_target(source_path, self.target_folder_print, project_stats,
-                                                     is_multi_operation=True, is_auto_operation=False):
-                        if project_stats.get("cancelled", False):
-                            operation_cancelled_globally = True
-                            print(f"Multi-Send Print cancelled globally by user at project {display_name}.")
-                            process_ok_for_project = False; break
-                        else: # Copy error
-                            process_ok_for_project = False;
-                            print(f"  Error copying file {os.path.basename(source_path)} for {display_name}. Stopping this project.")
-                            break # Stop this project on error
-
-                if not (operation_cancelled_globally and project_stats.get("cancelled", False)):
-                     all_operation_stats.append(project_stats)
+                projects.append((display_name, model_stl_paths))
+
+            plural_s = "s" if total_projects_to_process != 1 else ""
+            self._submit_copy_job("Multi Send to Print", f"Send Print ({total_projects_to_process} project{plural_s})", "Print",
+                                  self.target_folder_print, projects, skipped_projects_info, is_multi_operation=True)
 
         except Exception as e:
             err_msg = f"Unexpected error during Multi Send to Print: {e}"
             print(err_msg)
-            all_operation_stats.append({"project_name": "Multi Send Error", "copied": 0, "skipped": 0, "errors": [{"file": "Process Error", "error": err_msg}]})
-            operation_cancelled_globally = True
+            self.show_copy_summary("Multi Send to Print", [{"project_name": "Multi Send Error", "copied": 0, "skipped": 0, "errors": [{"file": "Process Error", "error": err_msg}]}],
+                                   self.target_folder_print, skipped_projects_info, operation_cancelled=True)
 
         finally:
-            print(f"[Send Print Multi] Finished processing {total_projects_to_process} projects.")
-            self.update_hotkey_ui_elements(); self.statusBar.clearMessage()
-            self.show_copy_summary("Multi Send to Print", all_operation_stats, self.target_folder_print, skipped_projects_info, archive_stats, operation_cancelled_globally)
+            self.update_hotkey_ui_elements()
             self.is_operation_running = False; self.update_button_state()
-            self.start_hotkey_listener(); self.start_file_watcher() # Re-enable hotkey action, restart watcher
+            self.start_hotkey_listener() # Re-enable hotkey action
 
 
     def open_folder_in_explorer(self, folder_path):
@@ -2983,7 +3677,7 @@ class MainWindow(QMainWindow):
         config_ok_for_cam_send = bool(self.target_folder_cam) # Target existence checked later
         config_ok_for_print_send = bool(self.target_folder_print) # Target existence checked later
 
-        can_scan = config_ok_for_scan and not self.is_operation_running
+        can_scan = config_ok_for_scan and (not self.is_operation_running or self._scan_in_progress()) # rescanning restarts a running scan
         can_send_cam = has_selection and config_ok_for_cam_send and not self.is_operation_running
         can_send_print = has_selection and config_ok_for_print_send and not self.is_operation_running
         can_open_settings = not self.is_operation_running
@@ -2993,7 +3687,8 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'scan_button'):
             self.scan_button.setEnabled(can_scan)
             tooltip = ""
-            if self.is_operation_running: tooltip = "Cannot Scan: Operation in progress."
+            if self._scan_in_progress(): tooltip = "Restart the scan (the running scan is cancelled)."
+            elif self.is_operation_running: tooltip = "Cannot Scan: Operation in progress."
             elif not config_ok_for_scan: tooltip = "Cannot Scan: Watch folder not configured correctly."
             else:
                 hotkey_upper = self.hotkey_combo.upper() if KEYBOARD_AVAILABLE else "N/A"
@@ -3270,11 +3965,24 @@ class MainWindow(QMainWindow):
                 enabled_features = []
                 if self.live_notify_enabled: enabled_features.append(f"Notifications({self.notify_debounce_secs}s)")
                 if self.auto_send_enabled: enabled_features.append("Auto-Send")
+                enabled_features.append(f"quiet time {self.watcher_quiet_secs}s")
+                use_polling = (self.watcher_mode == WATCHER_MODE_POLLING or
+                               (self.watcher_mode == WATCHER_MODE_AUTO and is_network_path(self.watch_folder)))
+                if use_polling: enabled_features.append(f"polling every {self.watcher_poll_secs}s")
+                elif self.watcher_mode == WATCHER_MODE_ACTIVE: enabled_features.append(f"folders active in {self.watcher_active_days} days")
+                else: enabled_features.append("native events")
                 print(f"[Watcher] Starting file system watcher ({', '.join(enabled_features)}): {self.watch_folder}")
 
-                self.fs_event_handler = WatcherEventHandler(self.watchdog_signal_emitter, self.watch_folder)
-                self.fs_observer = Observer()
-                self.fs_observer.schedule(self.fs_event_handler, self.watch_folder, recursive=True)
+                self.fs_event_handler = WatcherEventHandler(self.watchdog_signal_emitter, self.watch_folder, self.self_writes)
+                self.fs_observer = SnapshotPollingObserver(self.watcher_poll_secs) if use_polling else Observer()
+                if not use_polling and self.watcher_mode == WATCHER_MODE_ACTIVE:
+                    start_time = time.time()
+                    self.fs_event_handler.watch_set = AdaptiveWatchSet(self.fs_observer, self.fs_event_handler,
+                                                                       self.watch_folder, self.watcher_active_days)
+                    watch_count = self.fs_event_handler.watch_set.schedule_active()
+                    print(f"[Watcher] {watch_count} active folder watch(es) scheduled in {time.time() - start_time:.2f}s.")
+                else:
+                    self.fs_observer.schedule(self.fs_event_handler, self.watch_folder, recursive=True)
                 self.fs_observer.start()
                 if self.fs_observer.is_alive():
                      print("[Watcher] File system watcher started successfully.")
@@ -3287,6 +3995,11 @@ class MainWindow(QMainWindow):
             except Exception as e:
                  QMessageBox.critical(self, "Watcher Error", f"Failed to start file system watcher for '{self.watch_folder}':\n{e}")
                  print(f"Error starting file watcher: {e}")
+                 if self.fs_observer is not None: # emitters started before the failure keep their threads/inotify fds otherwise
+                     try:
+                         self.fs_observer.stop()
+                         if self.fs_observer.is_alive(): self.fs_observer.join(timeout=1.0)
+                     except Exception as stop_error: print(f"[Watcher] Error stopping failed file watcher: {stop_error}")
                  self.fs_observer = None; self.fs_event_handler = None
             finally:
                  self.update_status_bar() # Update status regardless of success/failure
@@ -3316,7 +4029,7 @@ class MainWindow(QMainWindow):
     # application exit handling
     def closeEvent(self, event):
         """Overrides the window close button (X) to hide to tray instead of quitting."""
-        if self.is_operation_running:
+        if self.is_operation_running or self.copy_engine.jobs(): # copy jobs run after is_operation_running is cleared
             QMessageBox.warning(self, "Operation in Progress", "Cannot close or hide while an operation (scan/copy) is running.")
             event.ignore() # Prevent closing
         else:
@@ -3344,7 +4057,7 @@ class MainWindow(QMainWindow):
     def quit_application(self):
         """Handles the actual application quit process (from menu, tray, or closeEvent fallback)."""
         print("Quit application requested...")
-        if self.is_operation_running:
+        if self.is_operation_running or self.watcher_busy or self.copy_engine.jobs():
             reply = QMessageBox.question(self, "Operation in Progress",
                                          "An operation (scan/copy) is currently running.\nAre you sure you want to quit?",
                                          QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
@@ -3354,7 +4067,10 @@ class MainWindow(QMainWindow):
                 return # Don't quit
 
         print("Proceeding with application quit.")
+        self._cancel_running_scan(wait_ms=2000)
+        shutdown_scan_process_pool() # queued partitions of the cancelled scan would hold up interpreter exit
         self.save_auto_send_status()
+        if self.parse_cache_persist: self.parse_cache.save(PARSE_CACHE_FILE)
         
         # Fully stop the hotkey listener thread
         if self.listener_thread and self.listener_thread.is_alive():
@@ -3364,6 +4080,20 @@ class MainWindow(QMainWindow):
         self.listener_thread = None
 
         self.stop_file_watcher()
+        self.watcher_worker.cancel_event.set() # the watcher worker stops between folders
+        self.copy_engine.shutdown(timeout=5.0) # running copies stop after their current chunk, .part files are removed
+        self.watcher_thread.quit()
+        # a QThread destroyed while it still runs aborts the process, so quit waits for the threads to stop;
+        # they are cancelled and only wait for a folder listing on a slow share to return
+        if not self.watcher_thread.wait(5000):
+            print("[Quit] Watcher worker still busy after 5 s (slow share), waiting for it to stop...")
+            self.watcher_thread.wait()
+        for thread, _ in list(self.retired_scans):
+            try:
+                if thread.isRunning():
+                    print("[Quit] Waiting for a cancelled scan to stop...")
+                    thread.wait()
+            except RuntimeError: pass # already finished and deleted
         if self.active_notification_dialog:
             try: print("Closing notification dialog on quit..."); self.active_notification_dialog.reject()
             except Exception as e: print(f"Error closing notification dialog on quit: {e}")
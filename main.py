@@ -6,13 +6,17 @@
 
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import Qt
-from gui import MainWindow, HotkeySignalEmitter, WatchdogSignalEmitter
-
-from core import APP_NAME, ORG_NAME, APP_VERSION, check_or_create_dummy_icon
+import multiprocessing
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support() # process pool scan mode in frozen (PyInstaller) builds
+    # imported here, not at module level: spawned scan worker processes re-run this module's
+    # top level and only need scanwalk, not the Qt/vtk stack
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import Qt
+    from gui import MainWindow, HotkeySignalEmitter, WatchdogSignalEmitter
+    from core import APP_NAME, ORG_NAME, APP_VERSION, check_or_create_dummy_icon
+
     if hasattr(Qt.ApplicationAttribute, 'AA_EnableHighDpiScaling'): QApplication.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
     if hasattr(Qt.ApplicationAttribute, 'AA_UseHighDpiPixmaps'): QApplication.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
 
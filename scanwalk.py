@@ -0,0 +1,237 @@
+# Project: dental_watcher_v3.17.0.py - Scan Walk
+# Author: zer0ltrnce (@zer0ltrnce, zerotlrnce@gmail.com)
+# GitHub: https://github.com/zer0ltrnce/exodbhealer
+# Original Author: David Kamarauli (smiledesigner.us)
+# Version: 3.17.0+
+
+# Folder listing and classification of the Watch Folder scan. Kept free of heavy imports
+# (vtk, lxml, watchdog, PyQt): scan worker processes import only this module, so on
+# Windows (spawn) a new worker starts without loading the GUI stack.
+
+import os
+
+
+# compact scan result records
+class _SlotRecord(object):
+    """
+    Base of the slotted scan records. Besides attribute access it answers the dict-style
+    reads the GUI has always used on scan results (record['key'], record.get('key')).
+    """
+    __slots__ = ()
+    _FIELDS = () # public keys, including derived properties
+
+    def __getitem__(self, key):
+        if key not in self._FIELDS: raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__: raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._FIELDS
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self._FIELDS else default
+
+    def keys(self):
+        return list(self._FIELDS)
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self._FIELDS]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if type(other) is not type(self): return NotImplemented
+        return all(getattr(self, key) == getattr(other, key) for key in self.__slots__)
+
+    __hash__ = None # mutable, like the dicts it replaces
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{key}={getattr(self, key)!r}' for key in self.__slots__)})"
+
+class FileRecord(_SlotRecord):
+    """A relevant project file found by the scanner (formerly a 10-key file_info dict)."""
+    KIND_PROJECT, KIND_INFO, KIND_CAD_STL, KIND_MODEL_STL, KIND_OTHER_STL = range(5)
+    __slots__ = ("path", "name", "mtime", "kind", "size")
+    _FIELDS = ("path", "name", "base", "is_project", "is_info", "is_stl",
+               "is_cad_stl", "is_model_stl", "is_other_stl", "mtime", "size")
+
+    def __init__(self, path, name, mtime, kind, size=None):
+        self.path = path
+        self.name = name
+        self.mtime = mtime
+        self.kind = kind
+        self.size = size
+
+    @property
+    def base(self): return os.path.splitext(self.name)[0]
+    @property
+    def is_project(self): return self.kind == FileRecord.KIND_PROJECT
+    @property
+    def is_info(self): return self.kind == FileRecord.KIND_INFO
+    @property
+    def is_stl(self): return self.kind >= FileRecord.KIND_CAD_STL
+    @property
+    def is_cad_stl(self): return self.kind == FileRecord.KIND_CAD_STL
+    @property
+    def is_model_stl(self): return self.kind == FileRecord.KIND_MODEL_STL
+    @property
+    def is_other_stl(self): return self.kind == FileRecord.KIND_OTHER_STL
+
+# scandir based directory walker
+SCAN_RELEVANT_EXTENSIONS = (".dentalproject", ".constructioninfo", ".stl")
+
+def _bump_stat(stats, key, amount=1):
+    """Increments a counter in a scan stats dict (no-op if stats is None)."""
+    if stats is not None:
+        stats[key] = stats.get(key, 0) + amount
+
+def _list_dir_entries(folder, stats=None):
+    """
+    Lists a folder once with os.scandir and splits it into (subdir_entries, file_entries).
+    DirEntry type checks are answered from the listing itself (d_type on POSIX,
+    FindNextFile data on Windows), so no extra isdir/isfile round trips are needed.
+    """
+    with os.scandir(folder) as it:
+        entries = list(it)
+    _bump_stat(stats, "dirs_listed")
+    _bump_stat(stats, "entries_seen", len(entries))
+
+    dir_entries = []
+    file_entries = []
+    for entry in entries:
+        try:
+            if entry.is_dir():
+                dir_entries.append(entry)
+            elif entry.is_file():
+                file_entries.append(entry)
+        except OSError: # broken symlink or entry vanished
+            continue
+    return dir_entries, file_entries
+
+def _is_likely_archive_path(folder_norm):
+    """True for YYYY/MM/DD archive folders (as created by the target folder archiver)."""
+    basename = os.path.basename(folder_norm)
+    parent_dir = os.path.dirname(folder_norm)
+    parent_basename = os.path.basename(parent_dir)
+    grandparent_basename = os.path.basename(os.path.dirname(parent_dir))
+
+    return (basename.isdigit() and len(basename) == 2 and # DD
+            parent_basename.isdigit() and len(parent_basename) == 2 and # MM
+            grandparent_basename.isdigit() and len(grandparent_basename) == 4) # YYYY
+
+def _classify_file_entry(entry, stats=None):
+    """
+    Builds the FileRecord for a relevant project file from a DirEntry.
+    Returns None for irrelevant file types without touching the filesystem;
+    mtime and size come from entry.stat(), which is cached on the DirEntry
+    (free on Windows, a single stat on POSIX).
+    """
+    filename = entry.name
+    filename_lower = filename.lower()
+    base_name_lower, ext_lower = os.path.splitext(filename_lower)
+    if ext_lower not in SCAN_RELEVANT_EXTENSIONS:
+        return None
+
+    entry_stat = entry.stat()
+    _bump_stat(stats, "entry_stats")
+
+    if ext_lower == ".dentalproject":
+        kind = FileRecord.KIND_PROJECT
+    elif ext_lower == ".constructioninfo":
+        kind = FileRecord.KIND_INFO
+    elif filename_lower.endswith("cad.stl"):
+        kind = FileRecord.KIND_CAD_STL
+    elif "model" in base_name_lower: # Covers *model*.stl, *models*.stl etc.
+        kind = FileRecord.KIND_MODEL_STL
+    else:
+        kind = FileRecord.KIND_OTHER_STL
+
+    return FileRecord(os.path.normpath(entry.path), filename, entry_stat.st_mtime, kind, entry_stat.st_size)
+
+def _classify_file_entries(file_entries, stats=None):
+    """Classifies a folder's file entries, returning the FileRecords of relevant files only."""
+    relevant_files = []
+    for entry in file_entries:
+        try:
+            file_info = _classify_file_entry(entry, stats)
+            if file_info is not None:
+                relevant_files.append(file_info)
+        except FileNotFoundError: # File might disappear during scan
+            continue
+        except Exception as e_file: # Catch other errors reading file properties
+            print(f"Error processing file '{entry.path}': {e_file}")
+            continue
+    return relevant_files
+
+def _list_folder(folder, depth, max_depth=0, want_mtimes=False):
+    """
+    Lists and classifies one folder (the unit of work of the walker, safe to run in a pool thread).
+    Returns (relevant_files, children, has_subdirs, local_stats); relevant_files is None if the
+    folder could not be listed. children are (path, mtime) tuples of subfolders to descend into
+    (empty below max_depth), mtime is only read when want_mtimes is set.
+    """
+    local_stats = {}
+    try:
+        dir_entries, file_entries = _list_dir_entries(folder, local_stats)
+    except FileNotFoundError: # folder removed during scan
+        return None, [], False, local_stats
+    except OSError as e:
+        print(f"Scan warning: Cannot list '{folder}': {e}")
+        _bump_stat(local_stats, "list_errors")
+        return None, [], False, local_stats
+
+    relevant_files = _classify_file_entries(file_entries, local_stats)
+
+    children = []
+    # depth counts levels below the watch folder; the limit has always
+    # allowed one level more than its value (root and its children were both depth 0)
+    if max_depth > 0 and depth > max_depth:
+        if dir_entries:
+            print(f"[Scan Depth] Reached depth limit ({max_depth}) at '{folder}'. Pruning {len(dir_entries)} dirs.")
+    else:
+        for entry in dir_entries:
+            try:
+                if entry.is_symlink(): continue
+                subdir_mtime = entry.stat().st_mtime if want_mtimes else None
+            except OSError:
+                continue
+            children.append((os.path.normpath(entry.path), subdir_mtime))
+    return relevant_files, children, bool(dir_entries), local_stats
+
+
+# process pool worker
+def _walk_partition(top, max_depth, stats, start_depth=1):
+    """Sequential top-down walk of one partition; yields (folder, relevant_files) for non-archive folders."""
+    stack = [(top, start_depth)]
+    while stack:
+        folder, depth = stack.pop()
+        if _is_likely_archive_path(folder):
+            print(f"[Scan Depth] Skipping likely archive path: {folder}")
+            continue
+        relevant_files, children, _, local_stats = _list_folder(folder, depth, max_depth)
+        for key, value in local_stats.items(): _bump_stat(stats, key, value)
+        if relevant_files is None:
+            continue
+        # push in reverse so folders are visited in listing order
+        for child_path, _ in reversed(children):
+            stack.append((child_path, depth + 1))
+        yield folder, relevant_files
+
+def _scan_partitions(tops, max_depth, scan_window):
+    """
+    Process pool worker: walks a chunk of top-level subfolders of the watch folder and returns
+    ([(folder, [(name, mtime, kind, size), ...]), ...], stats). Only folders with a relevant file
+    inside scan_window are returned, so little data crosses the process boundary.
+    """
+    window_start, window_end = scan_window
+    stats = {}
+    records = []
+    for top in tops:
+        for folder, relevant_files in _walk_partition(top, max_depth, stats):
+            if any(window_start <= f.mtime < window_end for f in relevant_files):
+                records.append((folder, [(f.name, f.mtime, f.kind, f.size) for f in relevant_files]))
+    return records, stats
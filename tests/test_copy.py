@@ -0,0 +1,94 @@
+"""Background copies: chunked copy with a temp name, CopyEngine jobs and cancelling them."""
+import os
+import threading
+
+import core
+from core import CopyEngine, CopyJob, copy_file_with_progress
+
+
+def _write_bytes(path, size, mtime=None):
+    with open(path, "wb") as f:
+        f.write(os.urandom(size))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+def _files_in(folder):
+    return sorted(os.listdir(folder))
+
+
+def test_copy_file_with_progress_renames_complete_copy(tmp_path):
+    source = _write_bytes(str(tmp_path / "upper_cad.stl"), 100000, mtime=1000)
+    dest = str(tmp_path / "out.stl")
+    progress = []
+    assert copy_file_with_progress(source, dest, lambda done, size: progress.append((done, size)), chunk_size=32768)
+    assert open(dest, "rb").read() == open(source, "rb").read()
+    assert os.stat(dest).st_mtime == 1000 # kept, the target folder archiver relies on it
+    assert progress[-1] == (100000, 100000) and len(progress) == 4
+    assert not os.path.exists(dest + core.COPY_TEMP_SUFFIX)
+
+def test_copy_file_with_progress_cancel_removes_part_file(tmp_path):
+    source = _write_bytes(str(tmp_path / "model.stl"), 100000)
+    dest = str(tmp_path / "target" / "model.stl")
+    os.makedirs(os.path.dirname(dest))
+    cancel_event = threading.Event()
+
+    def _progress(done, size):
+        assert os.path.exists(dest + core.COPY_TEMP_SUFFIX) # written under the temp name
+        cancel_event.set()
+
+    assert not copy_file_with_progress(source, dest, _progress, cancel_event, chunk_size=16384)
+    assert _files_in(os.path.dirname(dest)) == []
+
+def test_copy_engine_cancel_mid_file_leaves_no_part_file(tmp_path):
+    source_dir, target = tmp_path / "case", tmp_path / "CAM"
+    source_dir.mkdir(); target.mkdir()
+    big = _write_bytes(str(source_dir / "upper_cad.stl"), 3 * core.COPY_CHUNK_BYTES)
+    info = _write_bytes(str(source_dir / "case.constructionInfo"), 10)
+    engine = CopyEngine(workers=1, on_progress=lambda job: job.cancel())
+    stats = {"copied": 0, "skipped": 0, "errors": [], "cancelled": False}
+    job = engine.submit(CopyJob("Send CAM: case", str(target), [(stats, [big, info])]))
+
+    assert job.wait(10)
+    assert job.state == CopyJob.DONE
+    assert job.cancelled and not job.succeeded
+    assert stats["cancelled"] and stats["copied"] == 0
+    assert _files_in(target) == [] # neither the .part file nor the file after it
+    assert engine.jobs() == []
+    engine.shutdown()
+
+def test_copy_engine_runs_jobs_and_reports_results(tmp_path):
+    source_dir, target = tmp_path / "case", tmp_path / "Print"
+    source_dir.mkdir(); target.mkdir()
+    paths = [_write_bytes(str(source_dir / name), 5000) for name in ("model.stl", "upper_model.stl")]
+    _write_bytes(str(target / "model.stl"), 10) # a duplicate, skipped
+    finished = []
+    engine = CopyEngine(on_finished=finished.append)
+    stats = {"copied": 0, "skipped": 0, "errors": [], "cancelled": False}
+    job = engine.submit(CopyJob("Send Print: case", str(target), [(stats, paths)], duplicate_action="skip"))
+
+    assert job.wait(10)
+    assert job.succeeded and finished == [job]
+    assert (stats["copied"], stats["skipped"]) == (1, 1)
+    assert os.path.getsize(target / "model.stl") == 10
+    assert os.path.getsize(target / "upper_model.stl") == 5000
+    assert job.percent() == 100
+    engine.shutdown()
+
+def test_copy_engine_shutdown_cancels_queued_jobs(tmp_path):
+    source = _write_bytes(str(tmp_path / "model.stl"), 10)
+    target = tmp_path / "target"
+    target.mkdir()
+    started, release = threading.Event(), threading.Event()
+    engine = CopyEngine(workers=1, on_started=lambda job: (started.set(), release.wait(5)))
+    stats = [{"copied": 0, "skipped": 0, "errors": [], "cancelled": False} for _ in range(2)]
+    running = engine.submit(CopyJob("first", str(target), [(stats[0], [source])]))
+    queued = engine.submit(CopyJob("second", str(target), [(stats[1], [source])]))
+    assert started.wait(5) # the first job holds the only worker
+    threading.Timer(0.1, release.set).start()
+    engine.shutdown(timeout=5)
+
+    assert running.wait(5) and queued.wait(5)
+    assert running.cancelled and stats[0]["cancelled"]
+    assert queued.cancelled and stats[1]["copied"] == 0
+    assert not any(name.endswith(core.COPY_TEMP_SUFFIX) for name in _files_in(target))
@@ -0,0 +1,74 @@
+"""Every .dentalProject parser gives the ElementTree parser's result, on edge cases and on a generated corpus."""
+import os
+import random
+import time
+
+import pytest
+
+import bench
+import core
+
+REFERENCE = core._parse_dental_project_tree
+
+
+def _write_cases(folder):
+    paths = {}
+    for case_name, xml_text in bench.PARITY_CASES.items():
+        path = os.path.join(folder, f"{case_name}.dentalProject")
+        bench._write_file(path, xml_text, time.time())
+        paths[case_name] = path
+    return paths
+
+@pytest.fixture(scope="module")
+def case_files(tmp_path_factory):
+    return _write_cases(str(tmp_path_factory.mktemp("parity_cases")))
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    """A small generated tree: grouping folders, multi-tooth projects, archive folders."""
+    root = str(tmp_path_factory.mktemp("parity_corpus"))
+    bench.generate_tree(root, projects=40, depth=1, teeth_per_project=12, xml_kb=4, archive_days=2, seed=7)
+    return bench._project_files(root)
+
+def _assert_same_as_reference(parser, paths):
+    for path in paths:
+        assert parser(path) == REFERENCE(path), os.path.basename(path)
+
+
+@pytest.mark.parametrize("case_name", sorted(bench.PARITY_CASES))
+def test_streaming_parser_matches_tree_on_edge_cases(case_files, case_name):
+    _assert_same_as_reference(core._parse_dental_project_streaming, [case_files[case_name]])
+
+@pytest.mark.parametrize("case_name", sorted(bench.PARITY_CASES))
+def test_lxml_parser_matches_tree_on_edge_cases(case_files, case_name):
+    pytest.importorskip("lxml")
+    _assert_same_as_reference(core._parse_dental_project_lxml, [case_files[case_name]])
+
+def test_streaming_parser_matches_tree_on_corpus(corpus):
+    assert len(corpus) == 42
+    _assert_same_as_reference(core._parse_dental_project_streaming, corpus)
+
+def test_lxml_parser_matches_tree_on_corpus(corpus):
+    pytest.importorskip("lxml")
+    _assert_same_as_reference(core._parse_dental_project_lxml, corpus)
+
+def test_parse_dental_project_matches_tree_on_both_sides_of_the_streaming_threshold(tmp_path, corpus):
+    large = str(tmp_path / "large.dentalProject")
+    xml_kb = core.PARSE_STREAMING_MIN_BYTES // 1024 + 64
+    bench._write_file(large, bench._project_xml("Large_case", random.Random(3), 16, xml_kb), time.time())
+    assert os.path.getsize(large) >= core.PARSE_STREAMING_MIN_BYTES
+    _assert_same_as_reference(core.parse_dental_project, corpus[:5] + [large])
+
+def test_edge_cases_parse_like_the_reference(case_files):
+    # the malformed cases must fail the same way in every parser
+    assert REFERENCE(case_files["empty_file"]) is None
+    assert REFERENCE(case_files["unclosed"]) is None
+    assert REFERENCE(case_files["internal_entity"])["patient"] == "Ent"
+
+def test_check_parity_reports_no_mismatches(tmp_path):
+    tree = str(tmp_path / "tree")
+    bench.generate_tree(tree, projects=10, archive_days=1, seed=11)
+    summary = bench.check_parity(tree, str(tmp_path / "work"))
+    assert summary["files"] == 11 + len(bench.PARITY_CASES)
+    assert summary["parsers"][:2] == ["parse_tree", "parse_streaming"]
+    assert summary["mismatches"] == []
@@ -0,0 +1,242 @@
+"""Watch Folder scanning: scan index, scan window, result diffs and the scan/parse caches."""
+import datetime
+import os
+import shutil
+import time
+
+import pytest
+
+import core
+from core import ProjectParseCache, ScanIndex, ScanResultCache, diff_scan_results, scan_window_bounds
+
+
+def _project_xml(patient):
+    return (f"<DentalProject><Patient><PatientName>{patient}</PatientName><PatientFirstName>1001</PatientFirstName>"
+            f"</Patient><Teeth><Tooth><Number>11</Number><ReconstructionType>anatomic_crown</ReconstructionType>"
+            f"</Tooth></Teeth></DentalProject>")
+
+def _write(path, data, mtime):
+    with open(path, "w") as f:
+        f.write(data)
+    os.utime(path, (mtime, mtime))
+
+def _make_project(folder, name, mtime, patient="Doe, John"):
+    """A case folder without subfolders (so the scan index can serve it)."""
+    os.makedirs(folder, exist_ok=True)
+    _write(os.path.join(folder, f"{name}.dentalProject"), _project_xml(patient), mtime)
+    _write(os.path.join(folder, f"{name}.constructionInfo"), "<ConstructionInfo/>", mtime)
+    _write(os.path.join(folder, f"{name}_cad.stl"), "solid", mtime)
+    os.utime(folder, (mtime, mtime))
+    return folder
+
+def _window(now):
+    return now - 3600, now + 3600
+
+@pytest.fixture
+def tree(tmp_path):
+    now = time.time()
+    root = tmp_path / "CAD-DATA"
+    _make_project(str(root / "Dr A" / "case1"), "case1", now - 60)
+    _make_project(str(root / "Dr A" / "case2"), "case2", now - 30)
+    _make_project(str(root / "Dr B" / "old_case"), "old_case", now - 30 * 86400)
+    return str(root), now
+
+
+# scan index
+def test_scan_index_serves_unchanged_leaf_folders(tree, tmp_path):
+    root, now = tree
+    index_path = str(tmp_path / "index.db")
+    first_stats, second_stats = {}, {}
+    first = core.scan_directory(root, index_path=index_path, scan_window=_window(now), scan_stats=first_stats)
+    second = core.scan_directory(root, index_path=index_path, scan_window=_window(now), scan_stats=second_stats)
+
+    assert sorted(e["base_name"] for e in first) == ["case1", "case2"]
+    assert second == first
+    assert first_stats.get("index_hits", 0) == 0
+    assert second_stats["index_hits"] == 3 # the three case folders; grouping folders are always listed
+    assert second_stats["dirs_listed"] < first_stats["dirs_listed"]
+
+def test_scan_index_hit_sees_file_rewritten_in_place(tree, tmp_path):
+    root, now = tree
+    index_path = str(tmp_path / "index.db")
+    core.scan_directory(root, index_path=index_path, scan_window=_window(now))
+
+    case_folder = os.path.join(root, "Dr B", "old_case")
+    folder_mtime = os.stat(case_folder).st_mtime
+    _write(os.path.join(case_folder, "old_case.dentalProject"), _project_xml("Roe, Jane"), now - 10)
+    os.utime(case_folder, (folder_mtime, folder_mtime)) # an overwrite leaves the folder mtime alone
+
+    stats = {}
+    results = core.scan_directory(root, index_path=index_path, scan_window=_window(now), scan_stats=stats)
+    rewritten = [e for e in results if e["base_name"] == "old_case"]
+    assert stats["index_hits"] == 3
+    assert len(rewritten) == 1
+    assert rewritten[0]["patient"].startswith("Roe")
+    assert rewritten[0]["last_modified_timestamp"] == pytest.approx(now - 10)
+
+def test_scan_index_drops_removed_folders(tree, tmp_path):
+    root, now = tree
+    index_path = str(tmp_path / "index.db")
+    core.scan_directory(root, index_path=index_path, scan_window=_window(now))
+    removed = os.path.normpath(os.path.join(root, "Dr A", "case2"))
+    shutil.rmtree(removed)
+
+    results = core.scan_directory(root, index_path=index_path, scan_window=_window(now))
+    assert [e["base_name"] for e in results] == ["case1"]
+    index = ScanIndex(index_path)
+    try:
+        assert index.get(removed) is None
+        assert index.get(os.path.normpath(os.path.join(root, "Dr A", "case1"))) is not None
+    finally:
+        index.close()
+
+def test_scan_index_keeps_parse_only_for_same_file_version(tmp_path):
+    index = ScanIndex(str(tmp_path / "index.db"))
+    folder = str(tmp_path / "case")
+    record = core.FileRecord(os.path.join(folder, "a.dentalProject"), "a.dentalProject", 100.0,
+                             core.FileRecord.KIND_PROJECT, 10)
+    index.update(folder, 1.0, False, [record])
+    index.store_parse(folder, record, {"patient_name": "X"})
+    assert index.cached_parse(index.get(folder), record) == {"patient_name": "X"}
+
+    newer = core.FileRecord(record.path, record.name, 200.0, record.kind, 10)
+    assert index.cached_parse(index.get(folder), newer) is None
+    index.update(folder, 2.0, False, [newer]) # the parsed version is gone
+    assert index.get(folder)["parsed"] is None
+    index.close()
+
+
+# scan window
+def _local(*args):
+    return datetime.datetime(*args).timestamp()
+
+def test_scan_window_today_starts_at_local_midnight():
+    start, end = scan_window_bounds(core.SCAN_WINDOW_TODAY, now=_local(2026, 10, 19, 15, 30))
+    assert start == _local(2026, 10, 19)
+    assert end == _local(2026, 10, 20)
+
+def test_scan_window_today_at_midnight_edges():
+    # exactly midnight already belongs to the new day...
+    assert scan_window_bounds(now=_local(2026, 10, 19)) == (_local(2026, 10, 19), _local(2026, 10, 20))
+    # ...one second before it is still the previous one
+    assert scan_window_bounds(now=_local(2026, 10, 19) - 1) == (_local(2026, 10, 18), _local(2026, 10, 19))
+
+def test_scan_window_includes_start_and_excludes_end(tmp_path):
+    midnight = _local(2026, 10, 19)
+    window = scan_window_bounds(now=midnight + 3600)
+    _make_project(str(tmp_path / "at_midnight"), "at_midnight", midnight)
+    _make_project(str(tmp_path / "before_midnight"), "before_midnight", midnight - 1)
+    _make_project(str(tmp_path / "next_midnight"), "next_midnight", midnight + 86400)
+    results = core.scan_directory(str(tmp_path), scan_window=window)
+    assert [e["base_name"] for e in results] == ["at_midnight"]
+
+def test_scan_window_working_days_skip_the_weekend():
+    monday = _local(2026, 10, 19, 9, 0)
+    assert datetime.date.fromtimestamp(monday).weekday() == 0
+    assert scan_window_bounds(core.SCAN_WINDOW_WORKING_DAYS, 1, now=monday)[0] == _local(2026, 10, 19)
+    assert scan_window_bounds(core.SCAN_WINDOW_WORKING_DAYS, 2, now=monday)[0] == _local(2026, 10, 16) # Friday
+    saturday = _local(2026, 10, 17, 0, 0)
+    assert scan_window_bounds(core.SCAN_WINDOW_WORKING_DAYS, 1, now=saturday)[0] == _local(2026, 10, 16)
+
+def test_scan_window_hours_and_since():
+    now = _local(2026, 10, 19, 0, 30)
+    assert scan_window_bounds(core.SCAN_WINDOW_HOURS, "2", now=now) == (now - 7200, float("inf"))
+    assert scan_window_bounds(core.SCAN_WINDOW_SINCE, "2026-10-18 23:15")[0] == _local(2026, 10, 18, 23, 15)
+    assert scan_window_bounds(core.SCAN_WINDOW_SINCE, "2026-10-18")[0] == _local(2026, 10, 18)
+
+@pytest.mark.parametrize("mode, value", [(core.SCAN_WINDOW_HOURS, "0"), (core.SCAN_WINDOW_WORKING_DAYS, "0"),
+                                         (core.SCAN_WINDOW_SINCE, "yesterday"), ("fortnight", "")])
+def test_scan_window_rejects_bad_values(mode, value):
+    with pytest.raises(ValueError):
+        scan_window_bounds(mode, value)
+
+
+# result diff and scan result cache
+def test_diff_scan_results():
+    previous = [{"folder_path": "a", "v": 1}, {"folder_path": "b", "v": 1}, {"folder_path": "c", "v": 1}]
+    current = [{"folder_path": "a", "v": 1}, {"folder_path": "b", "v": 2}, {"folder_path": "d", "v": 1}]
+    diff = diff_scan_results(previous, current)
+    assert [e["folder_path"] for e in diff["added"]] == ["d"]
+    assert [e["folder_path"] for e in diff["changed"]] == ["b"]
+    assert diff["removed"] == ["c"]
+    assert diff["unchanged"] == 1
+    assert diff_scan_results(None, []) == {"added": [], "changed": [], "removed": [], "unchanged": 0}
+
+def test_scan_result_cache_expires_and_evicts():
+    cache = ScanResultCache(ttl_secs=60, max_entries=2)
+    keys = [ScanResultCache.make_key(f"/cad/{n}", 0) for n in "abc"]
+    cache.put(keys[0], [1], now=0)
+    assert cache.get(keys[0], now=30) == ([1], 30, False)
+    assert cache.get(keys[0], now=61) is None # expired and dropped
+    for key in keys:
+        cache.put(key, [key], now=100)
+    assert cache.get(keys[0], now=100) is None # least recently used went first
+    assert cache.stats["evictions"] == 1
+
+def test_scan_result_cache_key_normalizes_the_folder():
+    assert (ScanResultCache.make_key("/cad/data/", 2, ("hours", "3"))
+            == ScanResultCache.make_key("/cad/./data", "2", ["hours", "3"]))
+    assert ScanResultCache.make_key("/cad", 2) != ScanResultCache.make_key("/cad", 3)
+
+def test_scan_result_cache_partial_entries():
+    cache = ScanResultCache(ttl_secs=60)
+    key = ScanResultCache.make_key("/cad", 0)
+    cache.put(key, [1], now=0, partial=True)
+    assert cache.get(key, now=1) == ([1], 1, True)
+    cache.put(key, [1, 2], now=2)
+    cache.put(key, [9], now=3, partial=True) # never replaces a fresh complete result
+    assert cache.get(key, now=4) == ([1, 2], 2, False)
+
+def test_scan_result_cache_off_with_zero_ttl():
+    cache = ScanResultCache(ttl_secs=0)
+    key = ScanResultCache.make_key("/cad", 0)
+    cache.put(key, [1])
+    assert cache.get(key) is None
+
+
+# parse cache
+def test_project_parse_cache_reparses_changed_files(tmp_path):
+    path = str(tmp_path / "case.dentalProject")
+    _write(path, _project_xml("Doe, John"), 1000)
+    cache = ProjectParseCache()
+    st = os.stat(path)
+    first = cache.parse(path, st.st_mtime, st.st_size)
+    assert first["patient"] == "Doe (1001)"
+    assert cache.parse(path, st.st_mtime, st.st_size) is first
+    assert cache.stats["hits"] == 1
+
+    _write(path, _project_xml("Roe, Jane"), 2000)
+    st = os.stat(path)
+    assert cache.parse(path, st.st_mtime, st.st_size)["patient"] == "Roe (1001)"
+    assert len(cache) == 1 # the new version replaced the old one
+
+def test_project_parse_cache_does_not_cache_failed_parses(tmp_path):
+    path = str(tmp_path / "broken.dentalProject")
+    _write(path, "<DentalProject><Patient>", 1000)
+    cache = ProjectParseCache()
+    assert cache.parse(path, 1000, 24) is None
+    assert len(cache) == 0
+
+def test_project_parse_cache_evicts_least_recently_used():
+    cache = ProjectParseCache(max_entries=2)
+    cache.put("a", 1, 1, {"a": 1})
+    cache.put("b", 1, 1, {"b": 1})
+    assert cache.get("a", 1, 1) == {"a": 1}
+    cache.put("c", 1, 1, {"c": 1})
+    assert cache.get("b", 1, 1) is None
+    assert cache.get("a", 1, 1) == {"a": 1}
+    assert cache.stats["evictions"] == 1
+
+def test_project_parse_cache_save_and_load(tmp_path):
+    cache_file = str(tmp_path / "parse_cache.json")
+    cache = ProjectParseCache()
+    cache.put("/cad/a.dentalProject", 10.0, 5, {"patient_name": "A"})
+    assert cache.save(cache_file)
+    loaded = ProjectParseCache()
+    loaded.load(cache_file)
+    assert loaded.get("/cad/a.dentalProject", 10.0, 5) == {"patient_name": "A"}
+    assert loaded.get("/cad/a.dentalProject", 11.0, 5) is None
+
+    missing = ProjectParseCache()
+    missing.load(str(tmp_path / "missing.json")) # leaves the cache empty
+    assert len(missing) == 0
@@ -0,0 +1,240 @@
+"""File watching: debouncing, event coalescing, write-completion detection, polling and the adaptive watch set."""
+import os
+import shutil
+import time
+
+import core
+from core import AdaptiveWatchSet, DebounceMap, FileStabilityTracker, SnapshotPollingObserver, WatcherEventQueue
+
+
+def _write(path, data, mtime=None):
+    with open(path, "w") as f:
+        f.write(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+# debouncing
+def test_debounce_map_debounces_within_interval():
+    debounce = DebounceMap(ttl_secs=60)
+    assert debounce.debounce("a.stl", 1.0, now=100.0)
+    assert not debounce.debounce("a.stl", 1.0, now=100.5)
+    assert debounce.debounce("a.stl", 1.0, now=101.6) # 1.1 s after the last accepted event
+    assert debounce.debounce("b.stl", 1.0, now=101.6)
+    assert debounce.stats["debounced"] == 1
+
+def test_debounce_map_expires_and_bounds_entries():
+    debounce = DebounceMap(ttl_secs=10, max_entries=3)
+    for i, key in enumerate("abcd"):
+        debounce.touch(key, now=100.0 + i)
+    assert len(debounce) == 3
+    assert debounce.age("a", now=104.0) is None # evicted, oldest first
+    assert debounce.age("d", now=105.0) == 2.0
+    assert debounce.age("b", now=111.5) is None # older than ttl_secs
+    assert len(debounce) == 2
+
+
+# event coalescing
+def test_watcher_event_queue_coalesces_a_folder():
+    queue = WatcherEventQueue(quiet_secs=2, max_wait_secs=30)
+    for offset in (0.0, 0.5, 1.0):
+        queue.add("/cad/case1", now=100.0 + offset)
+    queue.add("/cad/case2", now=100.2)
+    assert queue.pop_due(now=102.5) == {"/cad/case2": 1} # case1 had an event 1.5 s ago
+    assert queue.seconds_until_due(now=102.5) == 0.5
+    assert queue.pop_due(now=103.0) == {"/cad/case1": 3}
+    assert len(queue) == 0
+    assert queue.seconds_until_due(now=103.0) is None
+    assert queue.stats["coalesced"] == 2
+
+def test_watcher_event_queue_flushes_busy_folder_after_max_wait():
+    queue = WatcherEventQueue(quiet_secs=2, max_wait_secs=5)
+    now = 100.0
+    while now < 106.0: # never quiet for 2 s
+        queue.add("/cad/busy", now=now)
+        now += 1.0
+    assert queue.pop_due(now=104.9) == {}
+    assert queue.pop_due(now=105.0) == {"/cad/busy": 6}
+
+def test_watcher_event_queue_discard():
+    queue = WatcherEventQueue(quiet_secs=1)
+    queue.add("/cad/case1", now=0)
+    queue.discard("/cad/case1")
+    assert queue.pop_due(now=10) == {}
+
+
+# write-completion detection
+def test_file_stability_tracker_waits_for_files_to_settle(tmp_path):
+    path = str(tmp_path / "upper_cad.stl")
+    _write(path, "solid a", 1000)
+    tracker = FileStabilityTracker(stable_secs=3, min_poll_secs=0.5, max_poll_secs=8)
+    folder = str(tmp_path)
+
+    assert not tracker.check(folder, [path], now=0.0)
+    assert tracker.seconds_until_poll(now=0.0) == 0.5
+    assert tracker.poll(now=0.5) == []
+    _write(path, "solid ab", 1001) # still being written: the wait starts again
+    assert tracker.poll(now=1.5) == []
+    assert tracker.poll(now=3.0) == []
+    assert tracker.poll(now=4.5) == [folder] # unchanged since 1.5
+    assert len(tracker) == 0
+    assert tracker.check(folder, [path], now=4.6)
+    assert not tracker.check(folder, [path], now=4.7) # the release is used up
+
+def test_file_stability_tracker_rejects_release_after_change(tmp_path):
+    path = str(tmp_path / "model.stl")
+    _write(path, "solid", 1000)
+    tracker = FileStabilityTracker(stable_secs=1, min_poll_secs=0.5)
+    folder = str(tmp_path)
+    tracker.check(folder, [path], now=0.0)
+    assert tracker.poll(now=1.0) == [folder]
+    _write(path, "solid, rewritten", 1002)
+    assert not tracker.check(folder, [path], now=1.1)
+    assert len(tracker) == 1
+
+def test_file_stability_tracker_off():
+    tracker = FileStabilityTracker(stable_secs=0)
+    assert tracker.check("/cad/case", ["/cad/case/missing.stl"])
+    assert len(tracker) == 0
+
+
+# polling observer
+class _RecordingHandler(object):
+    def __init__(self):
+        self.events = []
+
+    def on_created(self, event):
+        self.events.append(("created", os.path.basename(event.src_path)))
+
+    def on_modified(self, event):
+        self.events.append(("modified", os.path.basename(event.src_path)))
+
+def _polling_observer(root):
+    handler = _RecordingHandler()
+    observer = SnapshotPollingObserver(poll_secs=1)
+    observer.schedule(handler, str(root))
+    observer._add_tree(observer._root, emit=False) # the initial snapshot run() takes
+    return observer, handler
+
+def test_polling_observer_reports_created_files(tmp_path):
+    case = tmp_path / "Dr A" / "case1"
+    case.mkdir(parents=True)
+    observer, handler = _polling_observer(tmp_path)
+
+    _write(str(case / "case1.constructionInfo"), "<ConstructionInfo/>")
+    _write(str(case / "case1.log"), "not watched")
+    new_case = tmp_path / "Dr A" / "case2"
+    new_case.mkdir()
+    _write(str(new_case / "upper_cad.stl"), "solid")
+    assert observer.poll() == 2
+    assert sorted(handler.events) == [("created", "case1.constructionInfo"), ("created", "upper_cad.stl")]
+
+def test_polling_observer_reports_files_overwritten_in_place(tmp_path):
+    case = tmp_path / "case1"
+    case.mkdir()
+    _write(str(case / "model.stl"), "solid")
+    observer, handler = _polling_observer(tmp_path)
+    folder_mtime = os.stat(case).st_mtime
+
+    _write(str(case / "model.stl"), "solid, larger")
+    os.utime(case, (folder_mtime, folder_mtime))
+    assert observer.poll() == 1
+    assert handler.events == [("modified", "model.stl")]
+    assert observer.poll() == 0 # reported once
+
+def test_polling_observer_checks_cold_folders_on_their_turn(tmp_path):
+    old = time.time() - 3 * 86400
+    case = tmp_path / "old_case"
+    case.mkdir()
+    _write(str(case / "model.stl"), "solid", old)
+    os.utime(case, (old, old)); os.utime(tmp_path, (old, old))
+    observer, handler = _polling_observer(tmp_path)
+
+    _write(str(case / "model.stl"), "solid, re-exported", old + 60)
+    os.utime(case, (old, old))
+    for _ in range(core.POLL_COLD_EVERY):
+        observer.poll()
+    assert handler.events == [("modified", "model.stl")]
+
+def test_polling_observer_forgets_deleted_files_and_folders(tmp_path):
+    case = tmp_path / "case1"
+    case.mkdir()
+    _write(str(case / "upper_cad.stl"), "solid")
+    observer, handler = _polling_observer(tmp_path)
+    assert len(observer) == 2
+
+    os.remove(case / "upper_cad.stl")
+    assert observer.poll() == 0 # deletions are not reported
+    _write(str(case / "upper_cad.stl"), "solid")
+    assert observer.poll() == 1
+    assert handler.events == [("created", "upper_cad.stl")] # the snapshot had dropped the deleted file
+
+    shutil.rmtree(case)
+    observer.poll()
+    assert len(observer) == 1
+
+
+# adaptive watch set
+class _RecordingObserver(object):
+    """Observer.schedule/unschedule as AdaptiveWatchSet uses them."""
+    def __init__(self):
+        self.watches = {}
+
+    def schedule(self, event_handler, path, recursive=False):
+        watch = (path, recursive)
+        self.watches[watch] = event_handler
+        return watch
+
+    def unschedule(self, watch):
+        del self.watches[watch]
+
+def _project(folder, mtime):
+    os.makedirs(folder)
+    _write(os.path.join(folder, "case.dentalProject"), "<DentalProject/>", mtime)
+    _write(os.path.join(folder, "upper_cad.stl"), "solid", mtime)
+    os.utime(folder, (mtime, mtime))
+
+def test_adaptive_watch_set_watches_active_projects_and_grouping_folders(tmp_path):
+    now = time.time()
+    root = str(tmp_path)
+    _project(os.path.join(root, "Dr A", "active"), now - 3600)
+    _project(os.path.join(root, "Dr A", "quiet"), now - 30 * 86400)
+    os.makedirs(os.path.join(root, "Dr B"))
+    observer = _RecordingObserver()
+
+    watch_set = AdaptiveWatchSet(observer, object(), root, active_days=7)
+    assert watch_set.schedule_active(now=now) == 4
+    assert set(observer.watches) == {(root, False), (os.path.join(root, "Dr A"), False),
+                                     (os.path.join(root, "Dr B"), False),
+                                     (os.path.join(root, "Dr A", "active"), True)}
+
+def test_adaptive_watch_set_promotes_new_folders(tmp_path):
+    now = time.time()
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, "Dr A"))
+    observer = _RecordingObserver()
+    watch_set = AdaptiveWatchSet(observer, object(), root)
+    watch_set.schedule_active(now=now)
+
+    new_case = os.path.join(root, "Dr A", "new_case")
+    _project(new_case, now)
+    present = watch_set.promote(new_case)
+    assert present == [os.path.join(new_case, "upper_cad.stl")] # written before the watch existed
+    assert (new_case, True) in observer.watches
+    assert watch_set.promote(os.path.join(new_case, "Scans")) == [] # covered by the recursive watch
+
+def test_adaptive_watch_set_merges_watches_beyond_max_schedules(tmp_path):
+    now = time.time()
+    root = str(tmp_path)
+    for doctor in ("Dr A", "Dr B"):
+        for i in range(4):
+            _project(os.path.join(root, doctor, f"case{i}"), now)
+    observer = _RecordingObserver()
+    watch_set = AdaptiveWatchSet(observer, object(), root, max_schedules=4)
+
+    assert watch_set.schedule_active(now=now) <= 4
+    assert len(observer.watches) == len(watch_set)
+    for i in range(4): # every active project is still covered
+        for doctor in ("Dr A", "Dr B"):
+            assert watch_set._is_covered(os.path.join(root, doctor, f"case{i}"))
+    assert watch_set.stats["merged"] >= 1